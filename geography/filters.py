@@ -0,0 +1,125 @@
+import math
+
+import django_filters as filters
+from wagtail.api.v2.utils import BadRequestError
+
+from geography.models import GPS
+
+
+def parse_numbers(value, count, param):
+    """Parses a comma-separated list of numbers from a query parameter.
+
+    Args:
+        value (str): The parameter's value.
+        count (int): The number of numbers expected.
+        param (str): The name of the parameter, for the error message.
+
+    Raises:
+        BadRequestError: If the value isn't the expected number of comma-separated numbers.
+
+    Returns:
+        A list of floats.
+    """
+
+    try:
+        numbers = [float(number) for number in value.split(",")]
+    except ValueError:
+        numbers = []
+
+    if len(numbers) != count or not all(map(math.isfinite, numbers)):
+        raise BadRequestError(f"{param} must be {count} comma-separated numbers")
+
+    return numbers
+
+
+class CoordinateFilterSet(filters.FilterSet):
+    """A base filter set that adds spatial filters on GPS coordinates.
+
+    The 'bbox' filter takes a bounding box in the form <west>,<south>,<east>,<north> (in decimal
+    degrees, as in GeoJSON), and returns the objects whose coordinates are within it. A box whose
+    west edge is greater than its east edge crosses the antimeridian.
+
+    The 'near' filter takes a point in the form <latitude>,<longitude>, and returns the objects
+    whose coordinates are within 'radius' kilometers of it (measured along the Earth's surface).
+
+    Both filters use the GPS model's latitude_degrees and longitude_degrees columns and their
+    index, and skip any objects without coordinates.
+
+    Example query parameters:
+        - ?bbox=-85.5,38.5,-84.5,39.5
+        - ?near=38.8495,-84.8663&radius=20
+
+    Attributes:
+        coordinates_prefix (str): The lookup from the filtered model to the GPS model (such as \
+                                  "gps__"), or an empty string when filtering GPS objects.
+    """
+
+    coordinates_prefix = ""
+
+    bbox = filters.CharFilter(method="filter_bbox")
+    near = filters.CharFilter(method="filter_near")
+    radius = filters.CharFilter(method="filter_radius")
+
+    def filter_bbox(self, queryset, name, value):
+        """Filters objects to those with coordinates within a bounding box.
+
+        Raises:
+            BadRequestError: If the value isn't a valid bounding box.
+        """
+
+        west, south, east, north = parse_numbers(value, 4, name)
+
+        if not (-180 <= west <= 180 and -180 <= east <= 180):
+            raise BadRequestError("bbox longitudes must be between -180 and 180")
+        if not -90 <= south <= north <= 90:
+            raise BadRequestError(
+                "bbox latitudes must be between -90 and 90, with south before north"
+            )
+
+        return GPS.filter_bounding_box(
+            queryset, west, south, east, north, self.coordinates_prefix
+        )
+
+    def filter_near(self, queryset, name, value):
+        """Filters objects to those with coordinates within 'radius' kilometers of a point.
+
+        Raises:
+            BadRequestError: If the point isn't valid, or the radius is missing or invalid.
+        """
+
+        latitude, longitude = parse_numbers(value, 2, name)
+
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise BadRequestError("near must be a valid <latitude>,<longitude>")
+
+        if not self.data.get("radius"):
+            raise BadRequestError("radius is required with near")
+
+        (radius,) = parse_numbers(self.data["radius"], 1, "radius")
+
+        if radius <= 0:
+            raise BadRequestError("radius must be greater than 0")
+
+        return GPS.filter_radius(
+            queryset, latitude, longitude, radius, self.coordinates_prefix
+        )
+
+    def filter_radius(self, queryset, name, value):
+        """Leaves the queryset as it is, since the radius is applied by the 'near' filter.
+
+        Raises:
+            BadRequestError: If the radius is given without a point.
+        """
+
+        if not self.data.get("near"):
+            raise BadRequestError("near is required with radius")
+
+        return queryset
+
+
+class GPSFilter(CoordinateFilterSet):
+    """A filter set for the GPS model, with the spatial filters from CoordinateFilterSet."""
+
+    class Meta:
+        model = GPS
+        fields = ["bbox", "near", "radius"]
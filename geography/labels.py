@@ -0,0 +1,131 @@
+from django.utils import timezone
+
+from mixins.signals import invalidate_responses
+
+
+def format_county_abbr(name, state_name):
+    """Works out a county's abbreviation ('Co.', 'Par.', or 'Boro.').
+
+    Most states in the US are broken up into smaller units called counties, but some states call
+    their smaller divisions parishes (Louisiana) or boroughs (Alaska).
+
+    For the purposes of this application, all of the smaller units, regardless of state, are
+    classified as County objects. If a county belongs to either Louisiana or Alaska, then the
+    correct abbreviation ('Par.' or 'Boro.') is used instead of the default 'Co.'.
+
+    Note: Some Alaskan areas are subdivided into census areas instead of boroughs. For those units,
+    no abbreviation is generated.
+
+    Args:
+        name (str): The county's name.
+        state_name (str): The name of the county's state.
+
+    Returns:
+        The abbreviation, or an empty string if the county doesn't have one.
+    """
+
+    if state_name == "Alaska" and "Census" not in name:
+        return "Boro."
+    elif state_name == "Alaska" and "Census" in name:
+        return ""
+    elif state_name == "Louisiana":
+        return "Par."
+    else:
+        return "Co."
+
+
+def format_county_full_name(name, state_name):
+    """Works out a county's full name.
+
+    It is formatted as the county's name, abbreviation (if it has one), and the word "line" (if
+    there are two counties listed in the name).
+
+    Args:
+        name (str): The county's name.
+        state_name (str): The name of the county's state.
+
+    Returns:
+        The full name, such as "Switzerland Co." or "Ohio/Switzerland Co. line".
+    """
+
+    abbr = format_county_abbr(name, state_name)
+    abbr = " " + abbr if abbr else ""
+    line = " line" if "/" in name else ""
+
+    return "{}{}{}".format(name, abbr, line)
+
+
+def format_locality_label(name, range, town, region):
+    """Works out a locality's label.
+
+    Args:
+        name (str): The locality's name, if it has one.
+        range (str): The distance and direction of the locality from the nearest town, if known.
+        town (str): The nearest town, if known.
+        region (str): The full name of the locality's county, or the abbreviation of its state or
+                      country (whichever it belongs to).
+
+    Returns:
+        The label, such as "Boone Robinson Rd, 4 km NW Patriot, Switzerland Co.".
+    """
+
+    name = name + ", " if name else ""
+    range = range + " " if range else ""
+    town = town + ", " if town else ""
+
+    return "{}{}{}{}".format(name, range, town, region)
+
+
+def format_gps_label(latitude, longitude, elevation, locality):
+    """Works out the label of a set of GPS coordinates.
+
+    Args:
+        latitude (str): The latitude, if known.
+        longitude (str): The longitude, if known.
+        elevation (str): The elevation in meters.
+        locality (str): The label of the coordinates' locality.
+
+    Returns:
+        The label, such as "38.849500 -84.866328 252m, Boone Robinson Rd, ...".
+    """
+
+    latitude = f"{latitude} " if latitude else ""
+    longitude = f"{longitude} " if longitude else ""
+
+    return "{}{}{}m, {}".format(latitude, longitude, elevation, locality)
+
+
+def update_stored_labels(queryset, fields):
+    """Recomputes the stored labels of some objects and saves the ones that changed.
+
+    Each object's set_labels() method is called to recompute its labels from its related objects,
+    so the queryset should select those related objects. The changed objects are saved with a
+    single bulk update (along with a new date_modified, so the API's ETags change too), and the
+    cached API responses built from the model are invalidated.
+
+    Args:
+        queryset (QuerySet): The objects to refresh.
+        fields (list): The names of the stored label fields.
+
+    Returns:
+        A list of the objects whose labels changed.
+    """
+
+    changed = []
+    now = timezone.now()
+
+    for obj in queryset:
+        old_labels = [getattr(obj, field) for field in fields]
+        obj.set_labels()
+
+        if [getattr(obj, field) for field in fields] != old_labels:
+            obj.date_modified = now
+            changed.append(obj)
+
+    if changed:
+        queryset.model.objects.bulk_update(
+            changed, [*fields, "date_modified"], batch_size=1000
+        )
+        invalidate_responses(queryset.model)
+
+    return changed
@@ -0,0 +1,107 @@
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from geography.models import GPS, Locality
+from utils.benchmarks import (
+    create_synthetic_collection,
+    make_gps_points,
+    rolled_back,
+    time_call,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark radius and bounding box queries over a synthetic set of GPS coordinates, "
+        "comparing sequential scans with the index on their decimal coordinates. All synthetic "
+        "data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--points",
+            type=int,
+            default=1_000_000,
+            help="The number of synthetic GPS points to create (default: 1,000,000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="The number of timed runs per query (default: 5)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="The number of points inserted per query (default: 10,000)",
+        )
+
+    def handle(self, *args, **options):
+        points, batch_size = options["points"], options["batch_size"]
+        rng = random.Random(0)
+
+        with rolled_back():
+            create_synthetic_collection(0, log=self.stdout.write)
+            localities = list(Locality.objects.all()[:5000])
+
+            self.stdout.write(f"Creating {points:,} GPS points...")
+            for start in range(0, points, batch_size):
+                count = min(batch_size, points - start)
+                # Spread over the contiguous United States, like the synthetic collection's points
+                GPS.objects.bulk_create(
+                    make_gps_points(localities, count, rng, (25, 49), (-124, -67))
+                )
+                self.stdout.write(f"  {start + count:,} / {points:,}")
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            queries = [
+                ("Radius 5 km", lambda qs: GPS.filter_radius(qs, 38.85, -84.87, 5)),
+                ("Radius 20 km", lambda qs: GPS.filter_radius(qs, 38.85, -84.87, 20)),
+                ("Radius 100 km", lambda qs: GPS.filter_radius(qs, 38.85, -84.87, 100)),
+                (
+                    "Bounding box 1° x 1°",
+                    lambda qs: GPS.filter_bounding_box(qs, -85.5, 38.5, -84.5, 39.5),
+                ),
+            ]
+
+            self.stdout.write(
+                f"\n{'Query':<24}{'Matches':>10}{'Seq scan':>12}{'Indexed':>12}{'Speedup':>10}"
+            )
+
+            for label, build in queries:
+                matches = build(GPS.objects.all()).count()
+                without_index = self.time_query(build, options["repeat"], False)
+                with_index = self.time_query(build, options["repeat"], True)
+
+                self.stdout.write(
+                    f"{label:<24}{matches:>10,}{without_index:>9.1f} ms{with_index:>9.1f} ms"
+                    f"{without_index / with_index:>9.1f}x"
+                )
+
+    def time_query(self, build, repeat, use_index):
+        """Times fetching every matching point's coordinates.
+
+        Turning off index and bitmap scans for the transaction gives the timings from before the
+        decimal coordinates were indexed.
+        """
+
+        setting = "on" if use_index else "off"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL enable_indexscan = {setting}")
+            cursor.execute(f"SET LOCAL enable_bitmapscan = {setting}")
+            cursor.execute(f"SET LOCAL enable_indexonlyscan = {setting}")
+
+        def run():
+            list(
+                build(GPS.objects.all()).values_list(
+                    "latitude_degrees", "longitude_degrees"
+                )
+            )
+
+        return time_call(run, repeat)
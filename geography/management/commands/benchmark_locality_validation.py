@@ -0,0 +1,133 @@
+import random
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from geography.models import County, Locality
+from utils.benchmarks import (
+    create_synthetic_collection,
+    make_words,
+    rolled_back,
+    time_call,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the duplicate check run when a locality is saved in the admin, and validating "
+        "a batch of new localities, comparing sequential scans with the unique constraint's "
+        "index. All synthetic data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--localities",
+            type=int,
+            default=200_000,
+            help="The number of synthetic localities to create (default: 200,000)",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=5000,
+            help="The number of new localities validated as a batch (default: 5,000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="The number of timed runs per benchmark (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        count, repeat = options["localities"], options["repeat"]
+        rng = random.Random(0)
+        words = make_words(2000, rng)
+
+        def make_localities(start, count):
+            return [
+                Locality(
+                    county=rng.choice(counties),
+                    name=f"{rng.choice(words).title()} {rng.choice(['Park', 'Road'])} {i}",
+                    range=f"{rng.randint(1, 20)} km {rng.choice(['N', 'S', 'E', 'W'])}",
+                    town=rng.choice(words).title(),
+                )
+                for i in range(start, start + count)
+            ]
+
+        with rolled_back():
+            create_synthetic_collection(0, log=self.stdout.write)
+            counties = list(County.objects.all())
+
+            self.stdout.write(f"Creating {count:,} localities...")
+            for start in range(0, count, 10000):
+                Locality.objects.bulk_create(
+                    make_localities(start, min(10000, count - start))
+                )
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            # Half of the batch repeats existing localities (in a different case)
+            existing = list(Locality.objects.order_by("?")[: options["batch"] // 2])
+            batch = make_localities(count, options["batch"] - len(existing))
+            batch += [
+                Locality(
+                    county_id=locality.county_id,
+                    name=locality.name.upper(),
+                    range=locality.range,
+                    town=locality.town,
+                )
+                for locality in existing
+            ]
+            probes = batch[:100]
+
+            def probe():
+                for locality in probes:
+                    locality.is_duplicate()
+
+            without_index = self.time_with_index(probe, repeat, False) / len(probes)
+            with_index = self.time_with_index(probe, repeat, True) / len(probes)
+
+            self.stdout.write(
+                f"\n{'Duplicate check':<28}{'Seq scan':>12}{'Indexed':>12}"
+            )
+            self.stdout.write(
+                f"{'One locality':<28}{without_index:>9.2f} ms{with_index:>9.2f} ms"
+            )
+
+            def probe_each():
+                for locality in batch:
+                    locality.is_duplicate()
+
+            def validate_batch():
+                try:
+                    Locality.validate_new(batch)
+                except ValidationError:
+                    pass
+
+            self.stdout.write(f"\nValidating a batch of {len(batch):,} new localities")
+            self.stdout.write(f"{'Method':<28}{'Time':>12}")
+            for label, func in [
+                ("One query per locality", probe_each),
+                ("validate_new()", validate_batch),
+            ]:
+                self.stdout.write(
+                    f"{label:<28}{self.time_with_index(func, repeat, True):>9.1f} ms"
+                )
+
+    def time_with_index(self, func, repeat, use_index):
+        """Times a function with index scans turned on or off for the transaction.
+
+        Turning them off gives the timings of a table without the unique constraint's index.
+        """
+
+        setting = "on" if use_index else "off"
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL enable_indexscan = {setting}")
+            cursor.execute(f"SET LOCAL enable_bitmapscan = {setting}")
+            cursor.execute(f"SET LOCAL enable_indexonlyscan = {setting}")
+
+        return time_call(func, repeat)
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:13
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0012_alter_county_state_alter_gps_locality_and_more"),
+        ("taxonomy", "0017_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="collectingtrip",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="geography_trip_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="country",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="geography_country_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="county",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="geography_county_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locality",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="geography_locality_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="locality",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("town"), name="gin_trgm_ops"
+                ),
+                name="geography_locality_town_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="state",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="geography_state_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:57
+
+import re
+from decimal import Decimal
+
+from django.db import migrations, models
+
+COORDINATE_PATTERN = re.compile(
+    r"""^(?P<prefix>[NSEW])?\s*
+    (?P<sign>[-+])?\s*
+    (?P<degrees>\d+(?:\.\d+)?)\s*°?\s*
+    (?:(?P<minutes>\d+(?:\.\d+)?)\s*['′]?\s*)?
+    (?:(?P<seconds>\d+(?:\.\d+)?)\s*(?:"|″|'')?\s*)?
+    (?P<suffix>[NSEW])?$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def parse_coordinate(value, axis):
+    """A frozen copy of utils.helpers.parse_coordinate(), as it was when this migration was
+    written, so later changes to the helper don't change what this migration does."""
+
+    if value is None or not str(value).strip():
+        return None
+
+    limit, hemispheres = {"latitude": (90, "NS"), "longitude": (180, "EW")}[axis]
+    match = COORDINATE_PATTERN.match(str(value).strip())
+
+    if not match:
+        raise ValueError(f"'{value}' is not a valid {axis}")
+
+    hemisphere = (match["prefix"] or match["suffix"] or "").upper()
+
+    if (match["prefix"] and match["suffix"]) or (hemisphere and match["sign"]):
+        raise ValueError(f"'{value}' is not a valid {axis}")
+    if hemisphere and hemisphere not in hemispheres:
+        raise ValueError(f"'{value}' is not a valid {axis}")
+
+    degrees = Decimal(match["degrees"])
+
+    for part, divisor in [("minutes", 60), ("seconds", 3600)]:
+        if match[part] is not None:
+            if "." in match["degrees"] or Decimal(match[part]) >= 60:
+                raise ValueError(f"'{value}' is not a valid {axis}")
+            degrees += Decimal(match[part]) / divisor
+
+    if match["sign"] == "-" or hemisphere in ("S", "W"):
+        degrees = -degrees
+
+    if abs(degrees) > limit:
+        raise ValueError(f"'{value}' is outside the range of a {axis}")
+
+    return degrees.quantize(Decimal("0.000001"))
+
+
+def backfill_degrees(apps, schema_editor):
+    GPS = apps.get_model("geography", "GPS")
+
+    points = list(GPS.objects.only("latitude", "longitude"))
+    for point in points:
+        for axis in ("latitude", "longitude"):
+            try:
+                degrees = parse_coordinate(getattr(point, axis), axis)
+            except ValueError:
+                degrees = None
+            setattr(point, f"{axis}_degrees", degrees)
+    GPS.objects.bulk_update(
+        points, ["latitude_degrees", "longitude_degrees"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0013_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gps",
+            name="latitude_degrees",
+            field=models.DecimalField(
+                decimal_places=6,
+                editable=False,
+                help_text="The latitude in decimal degrees (set automatically)",
+                max_digits=9,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="gps",
+            name="longitude_degrees",
+            field=models.DecimalField(
+                decimal_places=6,
+                editable=False,
+                help_text="The longitude in decimal degrees (set automatically)",
+                max_digits=9,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_degrees, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="gps",
+            index=models.Index(
+                fields=["latitude_degrees", "longitude_degrees"],
+                name="geography_gps_degrees_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:11
+
+from django.db import migrations, models
+
+
+def format_county_abbr(name, state_name):
+    """A frozen copy of geography.labels.format_county_abbr(), as it was when this migration was
+    written, so later changes to the helper don't change what this migration does."""
+
+    if state_name == "Alaska" and "Census" not in name:
+        return "Boro."
+    elif state_name == "Alaska" and "Census" in name:
+        return ""
+    elif state_name == "Louisiana":
+        return "Par."
+    else:
+        return "Co."
+
+
+def format_county_full_name(name, state_name):
+    """A frozen copy of geography.labels.format_county_full_name()."""
+
+    abbr = format_county_abbr(name, state_name)
+    abbr = " " + abbr if abbr else ""
+    line = " line" if "/" in name else ""
+
+    return "{}{}{}".format(name, abbr, line)
+
+
+def format_locality_label(name, range, town, region):
+    """A frozen copy of geography.labels.format_locality_label()."""
+
+    name = name + ", " if name else ""
+    range = range + " " if range else ""
+    town = town + ", " if town else ""
+
+    return "{}{}{}{}".format(name, range, town, region)
+
+
+def format_gps_label(latitude, longitude, elevation, locality):
+    """A frozen copy of geography.labels.format_gps_label()."""
+
+    latitude = f"{latitude} " if latitude else ""
+    longitude = f"{longitude} " if longitude else ""
+
+    return "{}{}{}m, {}".format(latitude, longitude, elevation, locality)
+
+
+def backfill_labels(apps, schema_editor):
+    County = apps.get_model("geography", "County")
+    Locality = apps.get_model("geography", "Locality")
+    GPS = apps.get_model("geography", "GPS")
+
+    counties = list(County.objects.select_related("state"))
+    for county in counties:
+        county.abbr = format_county_abbr(county.name, county.state.name)
+        county.full_name = format_county_full_name(county.name, county.state.name)
+        county.label = f"{county.full_name}, {county.state.abbr}"
+    County.objects.bulk_update(
+        counties, ["abbr", "full_name", "label"], batch_size=1000
+    )
+
+    localities = list(Locality.objects.select_related("county", "state", "country"))
+    for locality in localities:
+        if locality.county:
+            region = locality.county.full_name
+        elif locality.state:
+            region = locality.state.abbr
+        else:
+            region = locality.country.abbr
+        locality.label = format_locality_label(
+            locality.name, locality.range, locality.town, region
+        )
+    Locality.objects.bulk_update(localities, ["label"], batch_size=1000)
+
+    points = list(GPS.objects.select_related("locality"))
+    for point in points:
+        point.label = format_gps_label(
+            point.latitude, point.longitude, point.elevation, point.locality.label
+        )
+    GPS.objects.bulk_update(points, ["label"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0014_gps_degrees"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="county",
+            name="abbr",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The county's abbreviation (set automatically)",
+                max_length=5,
+            ),
+        ),
+        migrations.AddField(
+            model_name="county",
+            name="full_name",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The county's full name (set automatically)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="county",
+            name="label",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The county's label (set automatically)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="gps",
+            name="label",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The coordinates' label (set automatically)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="locality",
+            name="label",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The locality's label (set automatically)",
+            ),
+        ),
+        migrations.RunPython(backfill_labels, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:16
+
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Coalesce, Trim, Upper
+
+# A frozen copy of geography.models.LOCALITY_KEY, the normalized values compared by the constraint
+LOCALITY_KEY = {
+    "key_name": Upper(Trim(Coalesce("name", Value("")))),
+    "key_range": Upper(Trim(Coalesce("range", Value("")))),
+    "key_town": Upper(Trim(Coalesce("town", Value("")))),
+    "key_county": Coalesce("county", Value(0)),
+    "key_state": Coalesce("state", Value(0)),
+    "key_country": Coalesce("country", Value(0)),
+}
+
+
+def check_duplicates(apps, schema_editor):
+    """Stops the migration if any localities would break the unique constraint.
+
+    The localities are grouped by the same normalized values as the constraint (computed by the
+    database, so they match it exactly). Duplicates aren't merged automatically, as specimen
+    records, GPS coordinates, and images can all refer to them, so they are listed for the user to
+    merge before running the migration again.
+    """
+
+    Locality = apps.get_model("geography", "Locality")
+
+    groups = (
+        Locality.objects.order_by()
+        .annotate(**LOCALITY_KEY)
+        .values(*LOCALITY_KEY)
+        .annotate(ids=ArrayAgg("pk", ordering="pk"), count=Count("pk"))
+        .filter(count__gt=1)
+        .values_list("ids", flat=True)
+    )
+    groups = sorted(groups)
+
+    if groups:
+        labels = dict(
+            Locality.objects.filter(pk__in=[group[0] for group in groups]).values_list(
+                "pk", "label"
+            )
+        )
+        duplicates = "\n".join(
+            f"  IDs {', '.join(map(str, group))}: {labels[group[0]]}"
+            for group in groups
+        )
+        raise ValueError(
+            "These localities are duplicates (the same name, range, town, and region, ignoring "
+            "case and surrounding spaces). Merge each group into one locality, moving anything "
+            f"that refers to the others, then run the migration again:\n{duplicates}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0015_stored_labels"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="locality",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.text.Upper(
+                    django.db.models.functions.text.Trim(
+                        django.db.models.functions.comparison.Coalesce(
+                            "name", models.Value("")
+                        )
+                    )
+                ),
+                django.db.models.functions.text.Upper(
+                    django.db.models.functions.text.Trim(
+                        django.db.models.functions.comparison.Coalesce(
+                            "range", models.Value("")
+                        )
+                    )
+                ),
+                django.db.models.functions.text.Upper(
+                    django.db.models.functions.text.Trim(
+                        django.db.models.functions.comparison.Coalesce(
+                            "town", models.Value("")
+                        )
+                    )
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "county", models.Value(0)
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "state", models.Value(0)
+                ),
+                django.db.models.functions.comparison.Coalesce(
+                    "country", models.Value(0)
+                ),
+                name="geography_locality_unique",
+                violation_error_message="This locality already exists",
+            ),
+        ),
+    ]
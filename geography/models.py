@@ -1,9 +1,34 @@
+import math
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connection, models
+from django.db.models import Q, Value
+from django.db.models.functions import (
+    ASin,
+    Cast,
+    Coalesce,
+    Cos,
+    Least,
+    Power,
+    Radians,
+    Sin,
+    Sqrt,
+    Trim,
+    Upper,
+)
 from django.template.defaultfilters import slugify
 from wagtail.fields import RichTextField
 
+from geography.labels import (
+    format_county_abbr,
+    format_county_full_name,
+    format_gps_label,
+    format_locality_label,
+    update_stored_labels,
+)
 from mixins.models import TimeStampMixin
+from utils.helpers import parse_coordinate
 
 
 class Country(TimeStampMixin):
@@ -25,6 +50,12 @@ class Country(TimeStampMixin):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="geography_country_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Countries"
 
     def __str__(self):
@@ -35,6 +66,14 @@ class Country(TimeStampMixin):
         """
         return f"{self.name}"
 
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to refresh the stored labels of the
+        localities that belong directly to the country (which include its abbreviation).
+        """
+
+        super().save(*args, **kwargs)
+        Locality.refresh_labels(Locality.objects.filter(country=self))
+
 
 class State(TimeStampMixin):
     """A model that represents a State object.
@@ -65,6 +104,12 @@ class State(TimeStampMixin):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="geography_state_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of a State object instance.
@@ -74,6 +119,15 @@ class State(TimeStampMixin):
         """
         return f"{self.name}"
 
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to refresh the stored labels of the state's
+        counties and of the localities that belong directly to it, since the labels include the
+        state's name or abbreviation."""
+
+        super().save(*args, **kwargs)
+        County.refresh_labels(County.objects.filter(state=self))
+        Locality.refresh_labels(Locality.objects.filter(state=self))
+
 
 class County(TimeStampMixin):
     """A model that represents a County object.
@@ -81,6 +135,12 @@ class County(TimeStampMixin):
     Attributes:
         state (State): The state to which the county belongs.
         name (str): The full name of the county.
+        abbr (str): The county's abbreviation ('Co.', 'Par.', or 'Boro.'), based on its state. Set \
+            automatically when the object instance is saved.
+        full_name (str): The county's name, abbreviation, and the word "line" (if two counties are \
+            listed in the name). Set automatically when the object instance is saved.
+        label (str): The county's string representation. Set automatically when the object \
+            instance is saved.
         date_created (datetime): The date when the object instance was created. Inherited from \
             TimeStampMixin.
         date_modified (datetime): The date when the object instance was last modified. Inherited \
@@ -96,52 +156,87 @@ class County(TimeStampMixin):
     name = models.CharField(
         max_length=50, help_text="Enter the name of the county (or parish)"
     )
+    abbr = models.CharField(
+        max_length=5,
+        default="",
+        editable=False,
+        help_text="The county's abbreviation (set automatically)",
+    )
+    full_name = models.CharField(
+        default="",
+        editable=False,
+        help_text="The county's full name (set automatically)",
+    )
+    label = models.CharField(
+        default="",
+        editable=False,
+        help_text="The county's label (set automatically)",
+    )
+
+    LABEL_FIELDS = ["abbr", "full_name", "label"]
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="geography_county_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Counties"
 
     def __str__(self):
         """Returns a string representation of a County object instance.
 
-        It uses both a property of the County object (full_name) as well as the state abbreviation
-        to which this County object instance belongs (state.abbr). For example, if the county is
-        Switzerland and the state is Indiana, __str__() will return "Switzerland Co., IN".
+        It uses both the county's full name and the abbreviation of the state to which it belongs.
+        For example, if the county is Switzerland and the state is Indiana, __str__() will return
+        "Switzerland Co., IN". The string is stored in the label field when the county is saved, so
+        listing counties doesn't have to look up their states.
 
         Returns:
             A string that refers to a County object instance.
         """
-        return f"{self.full_name}, {self.state.abbr}"
+        if self.label:
+            return self.label
+        return (
+            f"{format_county_full_name(self.name, self.state.name)}, {self.state.abbr}"
+        )
 
-    @property
-    def abbr(self):
-        """The county's abbreviation ('Co.', 'Par.', or 'Boro.').
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to keep the stored labels in sync with the
+        county's name and state, and to refresh the labels of the county's localities.
+        """
+
+        self.set_labels()
+        super().save(*args, **kwargs)
+        Locality.refresh_labels(Locality.objects.filter(county=self))
+
+    def set_labels(self):
+        """Sets the abbr, full_name, and label fields from the county's name and state."""
 
-        Most states in the US are broken up into smaller units called counties, but some states
-        call their smaller divisions parishes (Louisiana) or boroughs (Alaska).
+        self.abbr = format_county_abbr(self.name, self.state.name)
+        self.full_name = format_county_full_name(self.name, self.state.name)
+        self.label = f"{self.full_name}, {self.state.abbr}"
 
-        For the purposes of this application, all of the smaller units, regardless of state, will be
-        classified as County objects. If the instance of a County object belongs to either the state
-        of Louisiana or Alaska, then the correct abbreviation ('Par.' or 'Boro.') will be used
-        instead of the default 'Co.'.
+    @classmethod
+    def refresh_labels(cls, queryset):
+        """Recomputes the stored labels of some counties, along with those of their localities.
 
-        Note: Some Alaskan areas are subdivided into census areas instead of boroughs. For those
-        units, no abbreviation will be generated.
+        Args:
+            queryset (QuerySet): The counties to refresh.
+
+        Returns:
+            The number of counties whose labels changed.
         """
 
-        county_abbr = ""
+        changed = update_stored_labels(
+            queryset.select_related("state"), cls.LABEL_FIELDS
+        )
 
-        # Check to see what abbreviation is needed (based on state)
-        if self.state.name == "Alaska" and "Census" not in self.name:
-            county_abbr = "Boro."
-        elif self.state.name == "Alaska" and "Census" in self.name:
-            county_abbr = ""
-        elif self.state.name == "Louisiana":
-            county_abbr = "Par."
-        else:
-            county_abbr = "Co."
+        if changed:
+            Locality.refresh_labels(Locality.objects.filter(county__in=changed))
 
-        return county_abbr
+        return len(changed)
 
     @property
     def county_line(self):
@@ -158,18 +253,44 @@ class County(TimeStampMixin):
         else:
             return ""
 
-    @property
-    def full_name(self):
-        """A county's full name.
 
-        It is formatted as the county's name, abbreviation (if it has one), and the word "line" (if
-        there are two counties listed in the name).
-        """
+# The normalized values that identify a locality: its name, range, and town (ignoring case and
+# surrounding spaces, with null treated as blank), along with the region to which it belongs
+LOCALITY_KEY = {
+    "key_name": Upper(Trim(Coalesce("name", Value("")))),
+    "key_range": Upper(Trim(Coalesce("range", Value("")))),
+    "key_town": Upper(Trim(Coalesce("town", Value("")))),
+    "key_county": Coalesce("county", Value(0)),
+    "key_state": Coalesce("state", Value(0)),
+    "key_country": Coalesce("country", Value(0)),
+}
+
+
+def normalize_locality_text(values):
+    """Normalizes some locality names, ranges, or towns in the database, as in LOCALITY_KEY.
 
-        abbr = " " + self.abbr if self.abbr else ""
-        line = " " + self.county_line if self.county_line else ""
+    The values are normalized by the database's UPPER() and TRIM() (in a single query), because
+    Python's str.upper() doesn't always agree with it (for example, it turns "ß" into "SS"), and
+    the keys have to match the ones compared by the unique constraint.
+
+    Args:
+        values (iterable): The names, ranges, or towns (some of which can be None).
+
+    Returns:
+        A dict mapping each value to its normalized value.
+    """
 
-        return "{}{}{}".format(self.name, abbr, line)
+    values = list(set(values))
+
+    if not values:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT value, UPPER(TRIM(COALESCE(value, ''))) FROM unnest(%s::text[]) AS value",
+            [values],
+        )
+        return dict(cursor.fetchall())
 
 
 class Locality(TimeStampMixin):
@@ -184,6 +305,10 @@ class Locality(TimeStampMixin):
     county is unknown) but not to both a state and a country (because the state already belongs to
     a country).
 
+    A locality must also be unique: no two localities can have the same name, range, town, and
+    region (ignoring case and surrounding spaces). This is enforced by a unique constraint on the
+    normalized values in LOCALITY_KEY.
+
     Note: All of the fields are optional, as every location will not make use of every field
     available.
 
@@ -194,6 +319,8 @@ class Locality(TimeStampMixin):
         name (str): The name of the locality.
         range (str): The distance and direction of the locality from the nearest town.
         town (str): The nearest town to the locality.
+        label (str): The locality's string representation. Set automatically when the object \
+            instance is saved.
         date_created (datetime): The date when the object instance was created. Inherited from \
             TimeStampMixin.
         date_modified (datetime): The date when the object instance was last modified. Inherited \
@@ -228,9 +355,33 @@ class Locality(TimeStampMixin):
         blank=True,
         help_text="Enter the nearest town, if known",
     )
+    label = models.CharField(
+        default="",
+        editable=False,
+        help_text="The locality's label (set automatically)",
+    )
+
+    LABEL_FIELDS = ["label"]
 
     class Meta:
         ordering = ["name", "town"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="geography_locality_name_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("town"), name="gin_trgm_ops"),
+                name="geography_locality_town_trgm",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                *LOCALITY_KEY.values(),
+                name="geography_locality_unique",
+                violation_error_message="This locality already exists",
+            ),
+        ]
         verbose_name_plural = "Localities"
 
     def __str__(self):
@@ -245,24 +396,67 @@ class Locality(TimeStampMixin):
         localities. I want to be able to see the main fields (name, range, and town) if they are
         not null, and I'd also like to see to which county, state, or country the locality belongs.
 
+        The string is stored in the label field when the locality is saved, so listing localities
+        doesn't have to look up their regions.
+
         Returns:
             A string that refers to a Locality object instance.
         """
 
-        name = self.name + ", " if self.name else ""
-        range = self.range + " " if self.range else ""
-        town = self.town + ", " if self.town else ""
+        return self.label or self.build_label()
+
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to keep the stored label in sync with the
+        locality's fields and region, and to refresh the labels of the locality's GPS
+        coordinates."""
+
+        self.set_labels()
+        super().save(*args, **kwargs)
+        GPS.refresh_labels(GPS.objects.filter(locality=self))
+
+    def build_label(self):
+        """Builds the locality's label from its fields and the region to which it belongs.
 
-        region = ""
+        Returns:
+            A string, such as "Boone Robinson Rd, 4 km NW Patriot, Switzerland Co.".
+        """
 
         if self.county:
-            region = self.county.full_name
+            region = self.county.full_name or format_county_full_name(
+                self.county.name, self.county.state.name
+            )
         elif self.state:
             region = self.state.abbr
         else:
             region = self.country.abbr
 
-        return "{}{}{}{}".format(name, range, town, region)
+        return format_locality_label(self.name, self.range, self.town, region)
+
+    def set_labels(self):
+        """Sets the label field from the locality's fields and region."""
+
+        self.label = self.build_label()
+
+    @classmethod
+    def refresh_labels(cls, queryset):
+        """Recomputes the stored labels of some localities, along with those of their GPS
+        coordinates.
+
+        Args:
+            queryset (QuerySet): The localities to refresh.
+
+        Returns:
+            The number of localities whose labels changed.
+        """
+
+        changed = update_stored_labels(
+            queryset.select_related("county", "state", "country"), cls.LABEL_FIELDS
+        )
+
+        if changed:
+            GPS.refresh_labels(GPS.objects.filter(locality__in=changed))
+
+        return len(changed)
 
     def clean(self):
         """Modifies the default Django clean() method to include some custom validation.
@@ -271,8 +465,12 @@ class Locality(TimeStampMixin):
         state, or country), a ValidationError will be raised if two or more regions are selected
         for a given Locality object instance.
 
+        It also checks that the locality doesn't already exist (see the unique constraint), with a
+        single query that uses the constraint's index.
+
         Raises:
-            Either 2 or 3 validation errors for the county, state, and country fields.
+            Either 2 or 3 validation errors for the county, state, and country fields, or a
+            validation error for the name field if the locality already exists.
         """
 
         super().clean()
@@ -296,9 +494,150 @@ class Locality(TimeStampMixin):
             error_text = "You cannot select both a state and a country"
             errors["state"] = error_text
             errors["country"] = error_text
+        elif self.is_duplicate():
+            errors["name"] = (
+                "A locality with this name, range, town, and region already exists"
+            )
 
         raise ValidationError(errors)
 
+    def validate_constraints(self, exclude=None):
+        """Modifies the default Django validate_constraints() method to skip the unique
+        constraint, since clean() has already checked it with the same query."""
+
+        super().validate_constraints(exclude={*(exclude or ()), "name"})
+
+    def unique_key(self):
+        """Works out the normalized values that identify the locality.
+
+        Returns:
+            The locality's unique key, as returned by unique_keys().
+        """
+
+        return Locality.unique_keys([self])[0]
+
+    @classmethod
+    def unique_keys(cls, localities):
+        """Works out the normalized values that identify some localities, in a single query.
+
+        The values match the ones in LOCALITY_KEY, which are compared by the unique constraint.
+        The names, ranges, and towns are normalized by the database (see normalize_locality_text()).
+
+        Args:
+            localities (iterable): The Locality object instances.
+
+        Returns:
+            A list with a tuple for each locality: its name, range, and town (in uppercase, without
+            surrounding spaces), followed by the IDs of its county, state, and country (or 0).
+        """
+
+        localities = list(localities)
+        text = normalize_locality_text(
+            value
+            for locality in localities
+            for value in (locality.name, locality.range, locality.town)
+        )
+
+        return [
+            (
+                text[locality.name],
+                text[locality.range],
+                text[locality.town],
+                locality.county_id or 0,
+                locality.state_id or 0,
+                locality.country_id or 0,
+            )
+            for locality in localities
+        ]
+
+    def is_duplicate(self):
+        """Checks whether another locality has the same unique key, using the unique constraint's
+        index.
+
+        The locality's own values are normalized in the same query, by the same expressions.
+
+        Returns:
+            True if the locality already exists, or False if it doesn't.
+        """
+
+        values = {
+            "key_name": Upper(Trim(Coalesce(Value(self.name), Value("")))),
+            "key_range": Upper(Trim(Coalesce(Value(self.range), Value("")))),
+            "key_town": Upper(Trim(Coalesce(Value(self.town), Value("")))),
+            "key_county": self.county_id or 0,
+            "key_state": self.state_id or 0,
+            "key_country": self.country_id or 0,
+        }
+        duplicates = Locality.objects.alias(**LOCALITY_KEY).filter(**values)
+
+        if self.pk:
+            duplicates = duplicates.exclude(pk=self.pk)
+
+        return duplicates.exists()
+
+    @classmethod
+    def find_existing(cls, keys):
+        """Looks up the localities matching some unique keys in a single query.
+
+        The query filters each normalized value by the set of values in the keys (which the unique
+        constraint's index can use), and the rows it returns are then matched against the keys.
+
+        Args:
+            keys (iterable): Unique keys, as returned by unique_keys().
+
+        Returns:
+            A dict mapping each key that matches a locality to the locality's ID.
+        """
+
+        keys = set(keys)
+
+        if not keys:
+            return {}
+
+        filters = {
+            f"{name}__in": {key[index] for key in keys}
+            for index, name in enumerate(LOCALITY_KEY)
+        }
+        rows = (
+            cls.objects.order_by()
+            .annotate(**LOCALITY_KEY)
+            .filter(**filters)
+            .values_list(*LOCALITY_KEY, "pk")
+        )
+
+        return {row[:-1]: row[-1] for row in rows if row[:-1] in keys}
+
+    @classmethod
+    def validate_new(cls, localities):
+        """Checks that none of some new localities already exist or repeat each other.
+
+        This validates a whole batch (such as an import) with two queries (one to normalize their
+        keys and one to find them), instead of a query per locality.
+
+        Args:
+            localities (list): The unsaved Locality object instances.
+
+        Raises:
+            ValidationError: A list of the localities that already exist or are repeated, with
+                             their positions in the list (counted from 1).
+        """
+
+        keys = cls.unique_keys(localities)
+        existing = cls.find_existing(keys)
+        seen = {}
+        errors = []
+
+        for number, (locality, key) in enumerate(zip(localities, keys), start=1):
+            if key in existing:
+                errors.append(f"Locality {number} already exists (ID {existing[key]})")
+            elif key in seen:
+                errors.append(f"Locality {number} repeats locality {seen[key]}")
+            else:
+                seen[key] = number
+
+        if errors:
+            raise ValidationError(errors)
+
 
 class GPS(TimeStampMixin):
     """A model that represents a GPS object.
@@ -316,6 +655,12 @@ class GPS(TimeStampMixin):
             serialized.
         elevation (str): The elevation of the GPS coordinates. It is a string rather than an \
             integer because there are some cases where a range of elevations are provided.
+        latitude_degrees (Decimal): The latitude parsed into decimal degrees, for spatial \
+            queries. Set automatically when the object instance is saved.
+        longitude_degrees (Decimal): The longitude parsed into decimal degrees, for spatial \
+            queries. Set automatically when the object instance is saved.
+        label (str): The string representation of the GPS coordinates. Set automatically when \
+            the object instance is saved.
         date_created (datetime): The date when the object instance was created. Inherited from \
             TimeStampMixin.
         date_modified (datetime): The date when the object instance was last modified. Inherited \
@@ -341,9 +686,40 @@ class GPS(TimeStampMixin):
     elevation = models.CharField(
         max_length=15, help_text="Enter the elevation in meters"
     )
+    latitude_degrees = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        editable=False,
+        help_text="The latitude in decimal degrees (set automatically)",
+    )
+    longitude_degrees = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        editable=False,
+        help_text="The longitude in decimal degrees (set automatically)",
+    )
+    label = models.CharField(
+        default="",
+        editable=False,
+        help_text="The coordinates' label (set automatically)",
+    )
+
+    LABEL_FIELDS = ["label"]
+
+    # The mean radius of the Earth, and the length of one degree of latitude, in kilometers
+    EARTH_RADIUS_KM = 6371.0088
+    KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
 
     class Meta:
         ordering = ["latitude", "longitude"]
+        indexes = [
+            models.Index(
+                fields=["latitude_degrees", "longitude_degrees"],
+                name="geography_gps_degrees_idx",
+            ),
+        ]
         verbose_name_plural = "GPS coordinates"
 
     def __str__(self):
@@ -354,17 +730,203 @@ class GPS(TimeStampMixin):
         string is returned in the empty field's place.
 
         Also included are the GPS object instance's elevation and its locality for easier selection
-        in the Wagtail admin.
+        in the Wagtail admin. The string is stored in the label field when the object instance is
+        saved, so choosing coordinates doesn't have to look up their localities.
 
         Returns:
             A string that refers to a GPS object instance.
         """
 
-        latitude = f"{self.latitude} " if self.latitude else ""
-        longitude = f"{self.longitude} " if self.longitude else ""
+        return self.label or self.build_label()
+
+    def clean(self):
+        """Checks that the latitude and longitude can be read as coordinates.
+
+        Raises:
+            ValidationError: If either coordinate isn't valid.
+        """
+
+        errors = {}
+
+        for axis in ("latitude", "longitude"):
+            try:
+                parse_coordinate(getattr(self, axis), axis)
+            except ValueError as e:
+                errors[axis] = str(e)
+
+        if errors:
+            raise ValidationError(errors)
+
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to keep latitude_degrees, longitude_degrees,
+        and the stored label in sync with the rest of the fields."""
+
+        self.latitude_degrees, self.longitude_degrees = self.parse_coordinates(
+            self.latitude, self.longitude
+        )
+        self.set_labels()
+        super().save(*args, **kwargs)
+
+    def build_label(self):
+        """Builds the label of the GPS coordinates from their fields and locality.
+
+        Returns:
+            A string, such as "38.849500 -84.866328 252m, Boone Robinson Rd, ...".
+        """
+
+        return format_gps_label(
+            self.latitude, self.longitude, self.elevation, str(self.locality)
+        )
+
+    def set_labels(self):
+        """Sets the label field from the coordinates' fields and locality."""
+
+        self.label = self.build_label()
+
+    @classmethod
+    def refresh_labels(cls, queryset):
+        """Recomputes the stored labels of some GPS coordinates.
+
+        Args:
+            queryset (QuerySet): The GPS coordinates to refresh.
+
+        Returns:
+            The number of GPS coordinates whose labels changed.
+        """
+
+        return len(
+            update_stored_labels(queryset.select_related("locality"), cls.LABEL_FIELDS)
+        )
+
+    @staticmethod
+    def parse_coordinates(latitude, longitude):
+        """Parses a latitude and longitude into decimal degrees, for the *_degrees fields.
+
+        Args:
+            latitude (str): The latitude, as entered.
+            longitude (str): The longitude, as entered.
+
+        Returns:
+            A tuple of the latitude and longitude in decimal degrees (Decimal). Each is None if it
+            is missing or can't be parsed.
+        """
+
+        coordinates = []
+
+        for value, axis in [(latitude, "latitude"), (longitude, "longitude")]:
+            try:
+                coordinates.append(parse_coordinate(value, axis))
+            except ValueError:
+                coordinates.append(None)
+
+        return tuple(coordinates)
+
+    @classmethod
+    def filter_bounding_box(cls, queryset, west, south, east, north, prefix=""):
+        """Filters a queryset to the GPS coordinates within a bounding box.
+
+        Both bounds are inclusive, and the box may cross the antimeridian (when west is greater
+        than east). The latitude range is answered by the index on latitude_degrees and
+        longitude_degrees, and the longitude range is checked within the same index scan.
+
+        Args:
+            queryset (QuerySet): The queryset to filter.
+            west (float): The western edge of the box, in degrees of longitude.
+            south (float): The southern edge of the box, in degrees of latitude.
+            east (float): The eastern edge of the box, in degrees of longitude.
+            north (float): The northern edge of the box, in degrees of latitude.
+            prefix (str): The lookup from the queryset's model to the GPS model (such as "gps__"),
+                          or an empty string for a queryset of GPS objects.
+
+        Returns:
+            The filtered queryset.
+        """
+
+        latitude = f"{prefix}latitude_degrees"
+        longitude = f"{prefix}longitude_degrees"
+        query = Q(**{f"{latitude}__range": (south, north)})
+
+        if west <= east:
+            query &= Q(**{f"{longitude}__range": (west, east)})
+        else:
+            query &= Q(**{f"{longitude}__gte": west}) | Q(**{f"{longitude}__lte": east})
+
+        return queryset.filter(query)
+
+    @classmethod
+    def filter_radius(cls, queryset, latitude, longitude, radius, prefix=""):
+        """Filters a queryset to the GPS coordinates within a distance of a point.
+
+        The coordinates are first narrowed down to the bounding box around the circle (which is
+        answered by the index), and then the great-circle distance (using the haversine formula)
+        is checked for the coordinates within it.
+
+        Args:
+            queryset (QuerySet): The queryset to filter.
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            radius (float): The distance from the point, in kilometers.
+            prefix (str): The lookup from the queryset's model to the GPS model (such as "gps__"),
+                          or an empty string for a queryset of GPS objects.
+
+        Returns:
+            The filtered queryset.
+        """
+
+        latitude_delta = radius / cls.KM_PER_DEGREE
+        south, north = latitude - latitude_delta, latitude + latitude_delta
+
+        # Lines of longitude meet at the poles, so the box widens the further it is from the
+        # equator, and covers every longitude if it reaches a pole
+        if south <= -90 or north >= 90:
+            west, east = -180, 180
+        else:
+            widest = math.radians(max(abs(south), abs(north)))
+            longitude_delta = latitude_delta / math.cos(widest)
+
+            if longitude_delta >= 180:
+                west, east = -180, 180
+            else:
+                west = (longitude - longitude_delta + 180) % 360 - 180
+                east = (longitude + longitude_delta + 180) % 360 - 180
+
+        queryset = cls.filter_bounding_box(
+            queryset, west, max(south, -90), east, min(north, 90), prefix
+        )
+
+        return queryset.alias(
+            distance=cls.distance_to(latitude, longitude, prefix)
+        ).filter(distance__lte=radius)
+
+    @classmethod
+    def distance_to(cls, latitude, longitude, prefix=""):
+        """Builds an expression for the great-circle distance from each GPS object to a point.
+
+        Args:
+            latitude (float): The latitude of the point, in degrees.
+            longitude (float): The longitude of the point, in degrees.
+            prefix (str): The lookup from the queryset's model to the GPS model (such as "gps__"),
+                          or an empty string for a queryset of GPS objects.
+
+        Returns:
+            An expression for the distance in kilometers, using the haversine formula.
+        """
+
+        def radians(field):
+            return Radians(Cast(f"{prefix}{field}", models.FloatField()))
+
+        latitude_radians = math.radians(latitude)
+        half_chord = Power(
+            Sin((radians("latitude_degrees") - Value(latitude_radians)) / 2), 2
+        ) + Value(math.cos(latitude_radians)) * Cos(
+            radians("latitude_degrees")
+        ) * Power(
+            Sin((radians("longitude_degrees") - Value(math.radians(longitude))) / 2), 2
+        )
 
-        return "{}{}{}, {}".format(
-            latitude, longitude, self.elevation_meters, self.locality
+        # Rounding can push the chord just past 1 for antipodal points, which ASIN rejects
+        return Value(2 * cls.EARTH_RADIUS_KM) * ASin(
+            Least(Sqrt(half_chord), Value(1.0))
         )
 
     @property
@@ -408,6 +970,12 @@ class CollectingTrip(TimeStampMixin):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="geography_trip_name_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of a CollectingTrip object instance.
@@ -31,8 +31,6 @@ class CountySerializer(serializers.ModelSerializer):
     It serializes all of the fields on the County model, including those inherited from the
     TimeStampMixin."""
 
-    full_name = serializers.CharField()
-
     class Meta:
         model = County
         fields = (
@@ -40,6 +38,7 @@ class CountySerializer(serializers.ModelSerializer):
             "name",
             "abbr",
             "full_name",
+            "label",
             "date_created",
             "date_modified",
             "state",
@@ -59,6 +58,7 @@ class LocalitySerializer(serializers.ModelSerializer):
             "name",
             "range",
             "town",
+            "label",
             "date_created",
             "date_modified",
             "country",
@@ -84,6 +84,7 @@ class GPSSerializer(serializers.ModelSerializer):
             "longitude",
             "elevation",
             "elevation_meters",
+            "label",
             "date_created",
             "date_modified",
             "locality",
@@ -1,4 +1,7 @@
+from decimal import Decimal
+
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 from geography.models import CollectingTrip, County, Country, GPS, Locality, State
@@ -197,6 +200,97 @@ class LocalityTestCase(TestCase):
             errors_with_three_regions,
         )
 
+    def test_duplicate(self):
+        """Ensures a locality can't repeat another one's name, range, town, and region, ignoring
+        case and surrounding spaces."""
+
+        existing = Locality.objects.get(name="Big Oaks NWR", town="Madison")
+        duplicate = Locality(
+            name=" big oaks nwr", town="MADISON ", county=existing.county
+        )
+
+        with self.assertNumQueries(1):
+            self.assertTrue(duplicate.is_duplicate())
+
+        with self.assertRaises(ValidationError) as context:
+            duplicate.full_clean()
+        self.assertEqual(
+            context.exception.message_dict,
+            {
+                "name": [
+                    "A locality with this name, range, town, and region already exists"
+                ]
+            },
+        )
+
+        # The same name and town in another region isn't a duplicate, nor is the locality itself
+        other_region = Locality(
+            name="Big Oaks NWR",
+            town="Madison",
+            county=County.objects.get(name="Switzerland"),
+        )
+        other_region.full_clean()
+        existing.full_clean()
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            duplicate.save()
+
+    def test_validate_new(self):
+        """Ensures a batch of new localities is checked against the existing ones and each other
+        in two queries."""
+
+        county = County.objects.get(name="Jefferson")
+        localities = [
+            Locality(name="New Trail", town="Madison", county=county),
+            Locality(name="Big Oaks NWR", town="madison", county=county),
+            Locality(name="new trail ", town="Madison", county=county),
+        ]
+
+        with self.assertNumQueries(2), self.assertRaises(ValidationError) as context:
+            Locality.validate_new(localities)
+
+        existing = Locality.objects.get(name="Big Oaks NWR")
+        self.assertEqual(
+            context.exception.messages,
+            [
+                f"Locality 2 already exists (ID {existing.pk})",
+                "Locality 3 repeats locality 1",
+            ],
+        )
+
+        Locality.validate_new(localities[:1])
+        self.assertEqual(
+            Locality.find_existing([localities[1].unique_key()]),
+            {localities[1].unique_key(): existing.pk},
+        )
+
+    def test_database_normalization(self):
+        """Ensures the unique keys are normalized by the database, like the unique constraint,
+        rather than by Python (which uppercases "ß" as "SS")."""
+
+        county = County.objects.get(name="Jefferson")
+        existing = Locality.objects.create(name="Straße", county=county)
+        self.assertEqual(
+            Locality.find_existing([existing.unique_key()]),
+            {existing.unique_key(): existing.pk},
+        )
+
+        # Whether "strasse" is a duplicate depends on the database's locale, but the check must
+        # agree with the constraint either way
+        similar = Locality(name="strasse", county=county)
+        is_duplicate = similar.is_duplicate()
+        self.assertEqual(
+            Locality.find_existing([similar.unique_key()]) != {}, is_duplicate
+        )
+
+        try:
+            with transaction.atomic():
+                similar.save()
+        except IntegrityError:
+            self.assertTrue(is_duplicate)
+        else:
+            self.assertFalse(is_duplicate)
+
 
 class GPSTestCase(TestCase):
     """A test case for the GPS model."""
@@ -224,12 +318,159 @@ class GPSTestCase(TestCase):
             "3157-3402m, William's Lake Trail, Carson NF, Taos Ski Valley, Taos Co.",
         )
 
+    def test_stored_labels(self):
+        """Ensures the stored labels match the ones built from the related objects, and that
+        reading them doesn't look up the related objects."""
+
+        for county in County.objects.all():
+            self.assertEqual(
+                county.label, f"{county.full_name}, {county.state.abbr}", county.name
+            )
+        for locality in Locality.objects.all():
+            self.assertEqual(locality.label, locality.build_label())
+        for gps in GPS.objects.all():
+            self.assertEqual(gps.label, gps.build_label())
+
+        with self.assertNumQueries(1):
+            labels = [str(gps) for gps in GPS.objects.all()]
+
+        self.assertIn(
+            "38.849500 -84.866328 252m, Boone Robinson Rd, 4 km NW Patriot, Switzerland Co.",
+            labels,
+        )
+
+    def test_label_cascade(self):
+        """Ensures renaming a state or county refreshes the stored labels of the objects below it,
+        along with their date_modified fields."""
+
+        gps = GPS.objects.get(latitude="38.849500")
+        date_modified = gps.date_modified
+
+        county = County.objects.get(name="Switzerland")
+        county.name = "Ohio/Switzerland"
+        county.save()
+
+        gps.refresh_from_db()
+        self.assertEqual(
+            gps.label,
+            "38.849500 -84.866328 252m, Boone Robinson Rd, 4 km NW Patriot, "
+            "Ohio/Switzerland Co. line",
+        )
+        self.assertGreater(gps.date_modified, date_modified)
+
+        state = State.objects.get(abbr="IN")
+        state.name = "Louisiana"
+        state.save()
+
+        county.refresh_from_db()
+        gps.refresh_from_db()
+        self.assertEqual(county.label, "Ohio/Switzerland Par. line, IN")
+        self.assertTrue(
+            gps.label.endswith("4 km NW Patriot, Ohio/Switzerland Par. line")
+        )
+
+        # Saving a state without changing its name doesn't touch its counties
+        date_modified = county.date_modified
+        state.save()
+        county.refresh_from_db()
+        self.assertEqual(county.date_modified, date_modified)
+
     def test_elevation_meters(self):
         """Ensures an "m" is appended to the elevation."""
 
         no_gps_coordinates = GPS.objects.get(elevation="3157-3402")
         self.assertEqual(no_gps_coordinates.elevation_meters, "3157-3402m")
 
+    def test_degrees(self):
+        """Ensures saving parses the latitude and longitude into decimal degrees."""
+
+        gps = GPS.objects.get(elevation="252")
+        gps.latitude = "38°50'58.2\"N"
+        gps.longitude = "84 51 58.8 W"
+        gps.save()
+        gps.refresh_from_db()
+
+        self.assertEqual(gps.latitude_degrees, Decimal("38.849500"))
+        self.assertEqual(gps.longitude_degrees, Decimal("-84.866333"))
+
+        gps.latitude = "somewhere"
+        gps.save()
+        gps.refresh_from_db()
+
+        self.assertIsNone(gps.latitude_degrees)
+        self.assertEqual(gps.longitude_degrees, Decimal("-84.866333"))
+
+    def test_clean(self):
+        """Ensures a ValidationError is raised for coordinates that can't be parsed."""
+
+        gps = GPS.objects.get(elevation="252")
+        gps.clean()
+
+        gps.latitude = "91"
+        gps.longitude = "84.5 N"
+
+        with self.assertRaises(ValidationError) as context:
+            gps.clean()
+
+        self.assertEqual(
+            context.exception.message_dict,
+            {
+                "latitude": ["'91' is outside the range of a latitude"],
+                "longitude": ["'84.5 N' is not a valid longitude"],
+            },
+        )
+
+    def test_filter_radius(self):
+        """Ensures only the coordinates within the radius (along the Earth's surface) match."""
+
+        locality = GPS.objects.get(elevation="252").locality
+        # One degree of latitude is about 111.2 km, and one degree of longitude at 60° is half that
+        for latitude, longitude in [("60", "10"), ("60.5", "10"), ("60", "10.5")]:
+            GPS.objects.create(
+                locality=locality, latitude=latitude, longitude=longitude, elevation="0"
+            )
+
+        def matches(radius):
+            queryset = GPS.filter_radius(GPS.objects.all(), 60, 10, radius)
+            return sorted(
+                (str(gps.latitude_degrees), str(gps.longitude_degrees))
+                for gps in queryset
+            )
+
+        self.assertEqual(matches(1), [("60.000000", "10.000000")])
+        self.assertEqual(
+            matches(30), [("60.000000", "10.000000"), ("60.000000", "10.500000")]
+        )
+        self.assertEqual(len(matches(60)), 3)
+
+    def test_filter_bounding_box(self):
+        """Ensures a bounding box that crosses the antimeridian wraps around it."""
+
+        locality = GPS.objects.get(elevation="252").locality
+        for longitude in ["179.5", "-179.5", "0"]:
+            GPS.objects.create(
+                locality=locality, latitude="0", longitude=longitude, elevation="0"
+            )
+
+        queryset = GPS.filter_bounding_box(GPS.objects.all(), 179, -1, -179, 1)
+
+        self.assertEqual(
+            sorted(str(gps.longitude_degrees) for gps in queryset),
+            ["-179.500000", "179.500000"],
+        )
+
+    def test_radius_near_antimeridian(self):
+        """Ensures a radius that reaches across the antimeridian matches points on both sides."""
+
+        locality = GPS.objects.get(elevation="252").locality
+        for longitude in ["179.9", "-179.9"]:
+            GPS.objects.create(
+                locality=locality, latitude="0", longitude=longitude, elevation="0"
+            )
+
+        queryset = GPS.filter_radius(GPS.objects.all(), 0, 180, 20)
+        self.assertEqual(queryset.count(), 2)
+
 
 class CollectingTripTestCase(TestCase):
     """A test case for the CollectingTrip model."""
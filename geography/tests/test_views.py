@@ -0,0 +1,32 @@
+from django.test import TestCase
+
+GEOGRAPHY_FIXTURES = [
+    "countries.json",
+    "states.json",
+    "counties.json",
+    "localities.json",
+    "gps_coordinates.json",
+]
+
+
+class GPSAPIViewSetTestCase(TestCase):
+    """A test case for the GPS coordinates endpoints."""
+
+    fixtures = GEOGRAPHY_FIXTURES
+
+    def test_coordinate_filters(self):
+        """Ensures both GPS endpoints accept the bbox and near filters."""
+
+        for endpoint in ["gps-coordinates", "nested-gps-coordinates"]:
+
+            def ids(query):
+                data = self.client.get(f"/api/v2/{endpoint}/?{query}").json()
+                return [item["id"] for item in data["items"]]
+
+            self.assertEqual(ids(""), [1, 2])
+            self.assertEqual(ids("bbox=-85,38.5,-84.5,39"), [1])
+            self.assertEqual(ids("near=38.95,-84.87&radius=20"), [1])
+            self.assertEqual(ids("near=0,0&radius=20"), [])
+
+            response = self.client.get(f"/api/v2/{endpoint}/?bbox=-85,39,-84.5,38.5")
+            self.assertEqual(response.status_code, 400)
@@ -1,5 +1,6 @@
 from wagtail.api.v2.views import BaseAPIViewSet
 
+from geography.filters import GPSFilter
 from geography.models import CollectingTrip, County, Country, GPS, Locality, State
 from geography.serializers import (
     CollectingTripSerializer,
@@ -13,10 +14,35 @@ from geography.serializers import (
     NestedStateSerializer,
     StateSerializer,
 )
+from mixins.views import ConditionalGetMixin, SerializerClassCacheMixin
 from utils.helpers import get_fields
 
 
-class CountriesAPIViewSet(BaseAPIViewSet):
+class CoordinateFilterMixin:
+    """A mixin for the GPS API view sets that adds `bbox`, `near`, and `radius` filters.
+
+    The filters come from GPSFilter (see CoordinateFilterSet for their formats), so
+    /api/v2/gps-coordinates/?near=38.8495,-84.8663&radius=20 returns every set of GPS coordinates
+    within 20 km of the point, using the index on their decimal coordinates.
+    """
+
+    known_query_parameters = BaseAPIViewSet.known_query_parameters.union(
+        GPSFilter.base_filters
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        filterset = GPSFilter(self.request.GET, queryset=queryset, request=self.request)
+
+        if filterset.is_valid():
+            return filterset.qs
+
+        return queryset
+
+
+class CountriesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the Country model using the CountrySerializer."""
 
     base_serializer_class = CountrySerializer
@@ -26,7 +52,7 @@ class CountriesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(CountrySerializer)
 
 
-class StatesAPIViewSet(BaseAPIViewSet):
+class StatesAPIViewSet(ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet):
     """A custom API view set for the State model using the StateSerializer."""
 
     base_serializer_class = StateSerializer
@@ -36,7 +62,9 @@ class StatesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(StateSerializer)
 
 
-class CountiesAPIViewSet(BaseAPIViewSet):
+class CountiesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the County model using the CountySerializer."""
 
     base_serializer_class = CountySerializer
@@ -46,7 +74,9 @@ class CountiesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(CountySerializer)
 
 
-class LocalitiesAPIViewSet(BaseAPIViewSet):
+class LocalitiesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the Locality model using the LocalitySerializer."""
 
     base_serializer_class = LocalitySerializer
@@ -61,7 +91,12 @@ class LocalitiesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(LocalitySerializer)
 
 
-class GPSAPIViewSet(BaseAPIViewSet):
+class GPSAPIViewSet(
+    ConditionalGetMixin,
+    CoordinateFilterMixin,
+    SerializerClassCacheMixin,
+    BaseAPIViewSet,
+):
     """A custom API view set for the GPS model using the GPSSerializer."""
 
     base_serializer_class = GPSSerializer
@@ -77,7 +112,9 @@ class GPSAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(GPSSerializer)
 
 
-class CollectingTripsAPIViewSet(BaseAPIViewSet):
+class CollectingTripsAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the CollectingTrip model using the CollectingTripSerializer."""
 
     base_serializer_class = CollectingTripSerializer
@@ -87,7 +124,9 @@ class CollectingTripsAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(CollectingTripSerializer)
 
 
-class NestedStatesAPIViewSet(BaseAPIViewSet):
+class NestedStatesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the State model using the NestedStateSerializer."""
 
     base_serializer_class = NestedStateSerializer
@@ -97,7 +136,9 @@ class NestedStatesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(NestedStateSerializer)
 
 
-class NestedCountiesAPIViewSet(BaseAPIViewSet):
+class NestedCountiesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the County model using the NestedCountySerializer."""
 
     base_serializer_class = NestedCountySerializer
@@ -107,7 +148,9 @@ class NestedCountiesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(NestedCountySerializer)
 
 
-class NestedLocalitiesAPIViewSet(BaseAPIViewSet):
+class NestedLocalitiesAPIViewSet(
+    ConditionalGetMixin, SerializerClassCacheMixin, BaseAPIViewSet
+):
     """A custom API view set for the Locality model using the NestedLocalitySerializer."""
 
     base_serializer_class = NestedLocalitySerializer
@@ -122,7 +165,12 @@ class NestedLocalitiesAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(NestedLocalitySerializer)
 
 
-class NestedGPSAPIViewSet(BaseAPIViewSet):
+class NestedGPSAPIViewSet(
+    ConditionalGetMixin,
+    CoordinateFilterMixin,
+    SerializerClassCacheMixin,
+    BaseAPIViewSet,
+):
     """A custom API view set for the GPS model using the NestedGPSSerializer."""
 
     base_serializer_class = NestedGPSSerializer
@@ -38,6 +38,11 @@ class CountySnippet(SnippetViewSet):
     list_filter = ["name", "state"]
     list_per_page = 100
 
+    def get_queryset(self, request):
+        """Selects each county's state, which is listed alongside it."""
+
+        return County.objects.select_related("state")
+
 
 class LocalitySnippet(SnippetViewSet):
     """A snippet for the Locality model.
@@ -62,6 +67,11 @@ class LocalitySnippet(SnippetViewSet):
     list_filter = ["name", "town", "county"]
     list_per_page = 100
 
+    def get_queryset(self, request):
+        """Selects each locality's county, state, and country, which are listed alongside it."""
+
+        return Locality.objects.select_related("county", "state", "country")
+
     panels = [
         FieldPanel("name"),
         FieldPanel("range"),
@@ -96,6 +106,11 @@ class GPSSnippet(SnippetViewSet):
     list_filter = ["latitude", "longitude", "locality"]
     list_per_page = 100
 
+    def get_queryset(self, request):
+        """Selects each set of coordinates' locality and county, which are listed alongside it."""
+
+        return GPS.objects.select_related("locality__county")
+
 
 class CollectingTripSnippet(SnippetViewSet):
     """A snippet for the CollectingTrip model."""
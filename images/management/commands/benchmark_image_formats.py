@@ -0,0 +1,81 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.images.models import Filter
+
+from images.models import CustomImage
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the size of every API rendition of the images in the library in each modern "
+        "format, compared with the original format. The renditions are encoded in memory, so "
+        "nothing is saved."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--images",
+            type=int,
+            default=20,
+            help="The number of images to benchmark (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        images = list(CustomImage.objects.order_by("pk")[: options["images"]])
+
+        if not images:
+            raise CommandError("There are no images to benchmark.")
+
+        formats = [None, *CustomImage.RENDITION_FORMATS]
+        # The total bytes and encoding time of each size in each format
+        sizes = {
+            (name, image_format): [0, 0.0]
+            for name in CustomImage.RENDITION_FILTER_SPECS
+            for image_format in formats
+        }
+
+        for number, image in enumerate(images, start=1):
+            self.stdout.write(f"Encoding image {number} / {len(images)}...")
+
+            for name, spec in CustomImage.RENDITION_FILTER_SPECS.items():
+                for image_format in formats:
+                    suffix = f"|format-{image_format}" if image_format else ""
+                    start = time.perf_counter()
+                    file = image.generate_rendition_file(Filter(f"{spec}{suffix}"))
+                    sizes[name, image_format][0] += file.size
+                    sizes[name, image_format][1] += time.perf_counter() - start
+
+        header = f"\n{'Size':<12}{'Original':>12}"
+        for image_format in CustomImage.RENDITION_FORMATS:
+            header += f"{image_format.upper():>12}{'Saved':>8}"
+        self.stdout.write(header)
+
+        totals = {image_format: [0, 0.0] for image_format in formats}
+
+        for name in CustomImage.RENDITION_FILTER_SPECS:
+            for image_format in formats:
+                totals[image_format][0] += sizes[name, image_format][0]
+                totals[image_format][1] += sizes[name, image_format][1]
+            self.write_row(name, {f: sizes[name, f][0] for f in formats})
+
+        self.write_row("Total", {f: totals[f][0] for f in formats})
+        self.stdout.write(
+            "Encoding time: "
+            + ", ".join(
+                f"{(image_format or 'original').upper()} {seconds:.1f} s"
+                for image_format, (_, seconds) in totals.items()
+            )
+        )
+
+    def write_row(self, label, sizes):
+        """Writes a row of the table, with the bytes saved by each format as a percentage."""
+
+        original = sizes[None]
+        row = f"{label:<12}{original / 1e6:>9.2f} MB"
+
+        for image_format in CustomImage.RENDITION_FORMATS:
+            saved = 1 - sizes[image_format] / original
+            row += f"{sizes[image_format] / 1e6:>9.2f} MB{saved:>8.0%}"
+
+        self.stdout.write(row)
@@ -0,0 +1,73 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from images.models import CustomImage
+from images.renditions import RENDITION_CHUNK_SIZE, create_placeholders, process_images
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the placeholder (a tiny, blurry version shown while the image loads) of every "
+        "image that doesn't have one. Images are processed in parallel by a pool of worker "
+        "processes, and each placeholder is saved as soon as it's created, so an interrupted run "
+        "can simply be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of worker processes (default: the number of CPUs)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=RENDITION_CHUNK_SIZE,
+            help=f"The number of images processed by a worker at a time (default: "
+            f"{RENDITION_CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        total = CustomImage.objects.count()
+        image_ids = list(
+            CustomImage.get_missing_placeholders()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        self.stdout.write(
+            f"{len(image_ids):,} of {total:,} images are missing placeholders "
+            f"({total - len(image_ids):,} skipped)."
+        )
+
+        if not image_ids:
+            return
+
+        def log(images, placeholders):
+            self.stdout.write(
+                f"Processed {images:,} / {len(image_ids):,} images ({placeholders:,} placeholders)"
+            )
+
+        result = process_images(
+            create_placeholders,
+            image_ids,
+            workers=max(options["workers"], 1),
+            chunk_size=options["chunk_size"],
+            log=log if options["verbosity"] > 1 else None,
+        )
+
+        for image_id, error in result["errors"]:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"Couldn't create a placeholder for image {image_id}: {error}"
+                )
+            )
+
+        seconds = result["seconds"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']:,} placeholders in {seconds:.1f} s "
+                f"({result['created'] / seconds:,.1f} images/s)."
+            )
+        )
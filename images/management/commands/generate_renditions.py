@@ -0,0 +1,81 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from images.models import CustomImage
+from images.renditions import RENDITION_CHUNK_SIZE, process_images, render_images
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the renditions served by the API for every image that is missing any of them, so "
+        "API requests never have to resize an image. Images are rendered in parallel by a pool of "
+        "worker processes, and renditions that already exist are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="The number of worker processes (default: the number of CPUs)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=RENDITION_CHUNK_SIZE,
+            help=f"The number of images rendered by a worker at a time (default: "
+            f"{RENDITION_CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            "--images",
+            type=int,
+            nargs="+",
+            metavar="ID",
+            help="Only render the images with these IDs (as uploads do in the background)",
+        )
+
+    def handle(self, *args, **options):
+        images = CustomImage.objects.all()
+        missing = CustomImage.get_missing_renditions()
+
+        if options["images"]:
+            images = images.filter(pk__in=options["images"])
+            missing = missing.filter(pk__in=options["images"])
+
+        total = images.count()
+        image_ids = list(missing.order_by("pk").values_list("pk", flat=True))
+        self.stdout.write(
+            f"{len(image_ids):,} of {total:,} images are missing renditions "
+            f"({total - len(image_ids):,} skipped)."
+        )
+
+        if not image_ids:
+            return
+
+        def log(images, renditions):
+            self.stdout.write(
+                f"Rendered {images:,} / {len(image_ids):,} images ({renditions:,} renditions)"
+            )
+
+        result = process_images(
+            render_images,
+            image_ids,
+            workers=max(options["workers"], 1),
+            chunk_size=options["chunk_size"],
+            log=log if options["verbosity"] > 1 else None,
+        )
+
+        for image_id, error in result["errors"]:
+            self.stderr.write(
+                self.style.ERROR(f"Couldn't render image {image_id}: {error}")
+            )
+
+        seconds = result["seconds"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result['created']:,} renditions for {result['images']:,} images "
+                f"in {seconds:.1f} s ({result['images'] / seconds:,.1f} images/s, "
+                f"{result['created'] / seconds:,.1f} renditions/s)."
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("images", "0008_alter_baseliveimage_collecting_trip_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customimage",
+            name="placeholder",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
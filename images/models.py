@@ -1,6 +1,8 @@
+import base64
+
 from django.db import models
 from wagtail.fields import RichTextField
-from wagtail.images.models import AbstractImage, AbstractRendition, Image
+from wagtail.images.models import AbstractImage, AbstractRendition, Filter, Image
 
 from geography.models import CollectingTrip, Country, County, GPS, Locality, State
 from mixins.models import TimeStampMixin
@@ -21,53 +23,195 @@ class CustomImage(AbstractImage, TimeStampMixin):
         alt_text (str): The alternative text of the image.
         date (date): The date the image was taken.
         notes (str): Any additional notes that may be included with the image.
+        placeholder (str): A tiny, blurry version of the image as a data URI, which can be shown \
+                           while the image loads. It's created along with the renditions.
     """
 
     alt_text = models.CharField(max_length=255, blank=True)
     date = models.DateField(help_text="Enter the date the image was taken")
     notes = RichTextField(blank=True)
+    placeholder = models.TextField(blank=True, editable=False)
 
     admin_form_fields = Image.admin_form_fields + ("alt_text", "date", "notes")
 
+    # The sizes of each image that are served by the API, by the name of the property that returns
+    # them. The original version of the image is already taken into account in the default image
+    # fields above.
+    RENDITION_FILTER_SPECS = {
+        "x_large": "max-2000x2000",
+        "large": "max-1500x1500",
+        "medium": "max-1200x1200",
+        "small": "max-900x900",
+        "x_small": "max-600x600",
+        "thumbnail": "max-300x300",
+    }
+
+    # The placeholder is a WebP image that fits in 16x16 pixels, which is a few hundred bytes once
+    # encoded as a data URI. Browsers scale it up (and blur it) to the size of the image.
+    PLACEHOLDER_FILTER_SPEC = "max-16x16|format-webp|webpquality-50"
+
+    # The modern formats each rendition is also created in, from the most to the least compact.
+    # Browsers that support them are sent these instead of the original format.
+    RENDITION_FORMATS = ("avif", "webp")
+
     # The properties below are for creating image renditions (different sizes of the same image)
-    # The original version of the image is already taken into account in the default image fields
-    # above
 
     @property
     def x_large(self):
         """The largest version of an image (either a max of 2000px wide or 2000px tall)."""
 
-        return self.get_rendition("max-2000x2000")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["x_large"])
 
     @property
     def large(self):
         """A large version of an image (either a max of 1500px wide or 1500px tall)."""
 
-        return self.get_rendition("max-1500x1500")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["large"])
 
     @property
     def medium(self):
         """A medium version of an image (either a max of 1200px wide or 1200px tall)."""
 
-        return self.get_rendition("max-1200x1200")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["medium"])
 
     @property
     def small(self):
         """A small version of an image (either a max of 900px wide or 900px tall)."""
 
-        return self.get_rendition("max-900x900")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["small"])
 
     @property
     def x_small(self):
         """An extra small version of an image (either a max of 600px wide or 600px tall)."""
 
-        return self.get_rendition("max-600x600")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["x_small"])
 
     @property
     def thumbnail(self):
         """A thumbnail version of an image (either a max of 300px wide or 300px tall)."""
 
-        return self.get_rendition("max-300x300")
+        return self.get_rendition(self.RENDITION_FILTER_SPECS["thumbnail"])
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the name of the image's file when it's loaded, so save() can tell whether the
+        file has been replaced."""
+
+        image = super().from_db(db, field_names, values)
+        image._loaded_file_name = image.file.name if "file" in field_names else None
+
+        return image
+
+    def save(self, *args, **kwargs):
+        """Modifies the default save() method to clear the image's placeholder when its file is
+        replaced, so the upload hook creates a new one that matches the new file."""
+
+        loaded_file_name = getattr(self, "_loaded_file_name", None)
+
+        if loaded_file_name is not None and self.file.name != loaded_file_name:
+            self.placeholder = ""
+
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "placeholder"}
+
+        super().save(*args, **kwargs)
+        self._loaded_file_name = self.file.name
+
+    @classmethod
+    def get_rendition_specs(cls, image_format=None):
+        """Returns the filter specs of every API rendition size in a format.
+
+        Args:
+            image_format (str): One of RENDITION_FORMATS, or None for the original image's format.
+
+        Returns:
+            A list of filter specs, such as "max-300x300|format-webp", from the largest size to the
+            smallest.
+        """
+
+        suffix = f"|format-{image_format}" if image_format else ""
+
+        return [f"{spec}{suffix}" for spec in cls.RENDITION_FILTER_SPECS.values()]
+
+    @classmethod
+    def get_all_rendition_specs(cls):
+        """Returns the filter specs of every API rendition, in every format."""
+
+        return [
+            spec
+            for image_format in (None, *cls.RENDITION_FORMATS)
+            for spec in cls.get_rendition_specs(image_format)
+        ]
+
+    @classmethod
+    def get_missing_placeholders(cls):
+        """Returns the images that don't have a placeholder yet."""
+
+        return cls.objects.filter(placeholder="")
+
+    @classmethod
+    def get_missing_renditions(cls):
+        """Returns the images that are missing at least one of their API renditions."""
+
+        specs = cls.get_all_rendition_specs()
+
+        return cls.objects.annotate(
+            rendition_count=models.Count(
+                "renditions",
+                filter=models.Q(renditions__filter_spec__in=specs),
+            )
+        ).filter(rendition_count__lt=len(specs))
+
+    def generate_placeholder(self):
+        """Creates the image's placeholder and saves it.
+
+        The placeholder is saved with an update query rather than save(), so it doesn't send the
+        post_save signal that schedules the image's renditions.
+
+        Returns:
+            The placeholder, as a data URI.
+        """
+
+        file = self.generate_rendition_file(Filter(self.PLACEHOLDER_FILTER_SPEC))
+        file.seek(0)
+        self.placeholder = (
+            f"data:image/webp;base64,{base64.b64encode(file.read()).decode()}"
+        )
+        CustomImage.objects.filter(pk=self.pk).update(placeholder=self.placeholder)
+
+        return self.placeholder
+
+    def generate_renditions(self, specs=None):
+        """Creates each of the image's API renditions that doesn't exist yet.
+
+        The original image is only read and decoded once for all of the missing renditions. If the
+        image's renditions were prefetched, the new ones are added to them.
+
+        Args:
+            specs (list): The filter specs of the renditions to create. Defaults to every API
+                          rendition, in every format.
+
+        Returns:
+            The number of renditions created.
+        """
+
+        if specs is None:
+            specs = self.get_all_rendition_specs()
+
+        filters = [Filter(spec) for spec in specs]
+        existing = self.find_existing_renditions(*filters)
+        missing = [filter for filter in filters if filter not in existing]
+
+        if missing:
+            self.create_renditions(*missing)
+
+            # Renditions created together are inserted with bulk_create(ignore_conflicts=True),
+            # which doesn't set their primary keys, so they're read back from the database
+            prefetched = getattr(self, "_prefetched_objects_cache", {})
+            if prefetched.pop("renditions", None) is not None:
+                models.prefetch_related_objects([self], "renditions")
+
+        return len(missing)
 
 
 class CustomRendition(AbstractRendition, TimeStampMixin):
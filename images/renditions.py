@@ -0,0 +1,246 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+
+from images.models import CustomImage, CustomRendition
+from utils.response_cache import bump_generations
+
+# The number of images processed by a worker process per task
+RENDITION_CHUNK_SIZE = 10
+
+
+def render_images(image_ids):
+    """Creates the missing API renditions of some images.
+
+    This (like the other tasks below) is run by the worker processes, so it only takes and returns
+    simple values. An image that can't be rendered (because its file is missing or isn't a valid
+    image) is skipped and reported, so it doesn't stop the others from being rendered. Wagtail
+    creates renditions with bulk_create(), which doesn't send signals, so the API response cache is
+    invalidated here instead.
+
+    Args:
+        image_ids (list): The primary keys of the images.
+
+    Returns:
+        A tuple of the number of renditions created (int) and a list of tuples of the primary key
+        and error message of each image that couldn't be rendered.
+    """
+
+    created = 0
+    errors = []
+
+    for image in CustomImage.objects.filter(pk__in=image_ids).order_by("pk"):
+        try:
+            created += image.generate_renditions()
+        except Exception as e:
+            errors.append((image.pk, f"{type(e).__name__}: {e}"))
+
+    if created:
+        bump_generations(CustomRendition)
+
+    return created, errors
+
+
+def create_placeholders(image_ids):
+    """Creates the placeholders of the images that don't have one yet.
+
+    Each placeholder is saved as soon as it's created, so an interrupted run can pick up where it
+    left off. Placeholders are saved without sending signals, so the API response cache is
+    invalidated here instead.
+
+    Args:
+        image_ids (list): The primary keys of the images.
+
+    Returns:
+        A tuple of the number of placeholders created (int) and a list of tuples of the primary key
+        and error message of each image that failed.
+    """
+
+    created = 0
+    errors = []
+
+    for image in (
+        CustomImage.get_missing_placeholders().filter(pk__in=image_ids).order_by("pk")
+    ):
+        try:
+            image.generate_placeholder()
+            created += 1
+        except Exception as e:
+            errors.append((image.pk, f"{type(e).__name__}: {e}"))
+
+    if created:
+        bump_generations(
+            *[
+                model
+                for model in apps.get_app_config("images").get_models()
+                if issubclass(model, CustomImage)
+            ]
+        )
+
+    return created, errors
+
+
+def start_rendering(image_ids):
+    """Starts rendering some newly uploaded images' API renditions in the background.
+
+    Rendering every size in every format takes several seconds per photo, far too long for the
+    upload's request, so it's handed to the generate_renditions command in a new process (at a low
+    priority, so the web server stays responsive), and this returns without waiting for it. The
+    process is started with fork and exec rather than a plain fork, which is safe from a web
+    server's (possibly threaded) workers.
+
+    Nothing is started if the RENDER_UPLOADED_IMAGES setting is False (as in the tests), which
+    leaves the renditions to the next run of generate_renditions. Until an image's renditions
+    exist, the API returns null for them.
+
+    Args:
+        image_ids (list): The primary keys of the images.
+
+    Returns:
+        The subprocess.Popen object of the process, or None if none was started.
+    """
+
+    if not getattr(settings, "RENDER_UPLOADED_IMAGES", True):
+        return None
+
+    return subprocess.Popen(
+        [
+            "nice",
+            sys.executable,
+            os.path.join(settings.BASE_DIR, "manage.py"),
+            "generate_renditions",
+            "--workers=1",
+            "--images",
+            *map(str, image_ids),
+        ],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def prepare_images(image_ids):
+    """Creates the missing placeholders of some newly uploaded images, and starts rendering their
+    API renditions in the background.
+
+    This is run by the upload hook once the upload has been saved (see
+    images.signals.render_uploaded_image()). Only the placeholder (a tiny thumbnail) is created
+    during the request.
+
+    Returns:
+        A tuple of the number of placeholders created (int) and a list of the errors, as in
+        create_placeholders().
+    """
+
+    result = create_placeholders(image_ids)
+    start_rendering(image_ids)
+
+    return result
+
+
+def start_pool(workers):
+    """Starts a pool of worker processes for processing images.
+
+    Workers are forked from the current process, so Django is already set up in them. Database
+    connections can't be shared between processes, so the current process's connections are
+    closed first, and each worker opens its own. Forking is only safe in a single-threaded process,
+    so this is only used by the management commands, never by a web server's workers.
+
+    Args:
+        workers (int): The number of worker processes.
+
+    Returns:
+        A ProcessPoolExecutor.
+    """
+
+    connections.close_all()
+
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")
+    )
+
+
+def process_images(
+    task, image_ids, workers=1, chunk_size=RENDITION_CHUNK_SIZE, log=None
+):
+    """Runs a task (such as render_images()) over some images, optionally in a pool of processes.
+
+    Resizing is CPU bound, so the images are split into chunks that are processed in parallel by
+    separate processes rather than threads.
+
+    Args:
+        task (callable): The task, which takes a list of image IDs and returns a tuple of the
+                         number of objects created and a list of errors.
+        image_ids (list): The primary keys of the images.
+        workers (int): The number of worker processes. With 1, the images are processed in the
+                       current process.
+        chunk_size (int): The number of images processed by a worker per task.
+        log (callable): An optional function called with the running totals (the number of images
+                        processed and objects created) after each chunk.
+
+    Returns:
+        A dict with the number of images processed ("images"), the number of objects created
+        ("created"), the errors from the task ("errors"), and the time taken in seconds
+        ("seconds").
+    """
+
+    chunks = [
+        image_ids[start : start + chunk_size]
+        for start in range(0, len(image_ids), chunk_size)
+    ]
+    totals = {"images": 0, "created": 0, "errors": []}
+    start = time.perf_counter()
+
+    def add(chunk, result):
+        created, errors = result
+        totals["images"] += len(chunk)
+        totals["created"] += created
+        totals["errors"] += errors
+        if log:
+            log(totals["images"], totals["created"])
+
+    if workers > 1:
+        with start_pool(workers) as pool:
+            futures = {pool.submit(task, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                add(futures[future], future.result())
+    else:
+        for chunk in chunks:
+            add(chunk, task(chunk))
+
+    totals["seconds"] = time.perf_counter() - start
+
+    return totals
+
+
+def negotiate_image_format(request):
+    """Picks the most compact image format that a request's Accept header explicitly allows.
+
+    Wildcards (such as */* and image/*) don't count, since browsers send them without knowing
+    whether they can display every format.
+
+    Args:
+        request (HttpRequest): The request being answered.
+
+    Returns:
+        One of CustomImage.RENDITION_FORMATS, or None if the original format should be used.
+    """
+
+    accepted = {
+        media_type.sub_type
+        for media_type in request.accepted_types
+        if media_type.main_type == "image" and media_type.quality > 0
+    }
+
+    for image_format in CustomImage.RENDITION_FORMATS:
+        if image_format in accepted:
+            return image_format
+
+    return None
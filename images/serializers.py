@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from wagtail.images.models import Filter
 
 from images.models import (
     CustomImage,
@@ -28,20 +29,93 @@ class RenditionsSerializer(serializers.ModelSerializer):
         )
 
 
-class CustomImageSerializer(serializers.ModelSerializer):
-    """A serializer for the CustomImage model."""
+class ExistingRenditionSerializer(RenditionsSerializer):
+    """A serializer for one of an image's API renditions, named by the field.
+
+    Only a rendition that already exists is serialized (looked up in the image's prefetched
+    `renditions` when there are any), and a missing one is serialized as null. Renditions are
+    created when an image is uploaded (or by the generate_renditions command), never during a
+    request.
+    """
+
+    def get_attribute(self, instance):
+        filter = Filter(CustomImage.RENDITION_FILTER_SPECS[self.field_name])
 
-    x_large = RenditionsSerializer()
-    large = RenditionsSerializer()
-    medium = RenditionsSerializer()
-    small = RenditionsSerializer()
-    x_small = RenditionsSerializer()
-    thumbnail = RenditionsSerializer()
+        return instance.find_existing_renditions(filter).get(filter)
+
+
+class CustomImageSerializer(serializers.ModelSerializer):
+    """A serializer for the CustomImage model.
+
+    Each size is serialized by ExistingRenditionSerializer, so it's null if the image's rendition
+    hasn't been created yet, and `srcset` and `sources` only list the renditions that exist.
+
+    Along with the individual renditions, `srcset` lists every size in the format picked for the
+    request (see ImageFormatNegotiationMixin), and `sources` lists every size in each modern format,
+    for the <source> elements of a <picture> element.
+    """
+
+    x_large = ExistingRenditionSerializer(allow_null=True)
+    large = ExistingRenditionSerializer(allow_null=True)
+    medium = ExistingRenditionSerializer(allow_null=True)
+    small = ExistingRenditionSerializer(allow_null=True)
+    x_small = ExistingRenditionSerializer(allow_null=True)
+    thumbnail = ExistingRenditionSerializer(allow_null=True)
+    srcset = serializers.SerializerMethodField()
+    sources = serializers.SerializerMethodField()
+
+    related_lookups = {
+        name: ("renditions",)
+        for name in [*CustomImage.RENDITION_FILTER_SPECS, "srcset", "sources"]
+    }
 
     class Meta:
         model = CustomImage
         fields = "__all__"
 
+    def build_srcset(self, image, image_format=None):
+        """Builds a srcset attribute value listing an image's renditions in a format.
+
+        Only the renditions that already exist are listed, so no image is resized during a
+        request. Sizes that come out the same width (because the original image is smaller than
+        them) are only listed once.
+
+        Args:
+            image (CustomImage): The image.
+            image_format (str): One of CustomImage.RENDITION_FORMATS, or None for the original
+                                image's format.
+
+        Returns:
+            A string such as "https://example.com/media/images/moth.max-300x300.webp 300w, ...",
+            from the narrowest rendition to the widest, or an empty string if none exist yet.
+        """
+
+        request = self.context.get("request")
+        renditions = image.find_existing_renditions(
+            *[Filter(spec) for spec in image.get_rendition_specs(image_format)]
+        )
+        urls = {}
+
+        for rendition in renditions.values():
+            url = rendition.url
+            if request is not None:
+                url = request.build_absolute_uri(url)
+            urls.setdefault(rendition.width, url)
+
+        return ", ".join(f"{url} {width}w" for width, url in sorted(urls.items()))
+
+    def get_srcset(self, obj):
+        return self.build_srcset(obj, self.context.get("image_format"))
+
+    def get_sources(self, obj):
+        return [
+            {
+                "type": f"image/{image_format}",
+                "srcset": self.build_srcset(obj, image_format),
+            }
+            for image_format in CustomImage.RENDITION_FORMATS
+        ]
+
 
 class SpecimenRecordImageSerializer(CustomImageSerializer):
     """A serializer for the SpecimenRecordImage model."""
@@ -58,6 +132,12 @@ class InsectImageSerializer(CustomImageSerializer):
     family = serializers.ReadOnlyField()
     species_binomial = serializers.ReadOnlyField()
 
+    related_lookups = {
+        **CustomImageSerializer.related_lookups,
+        "family": ("species__genus__tribe__subfamily__family",),
+        "species_binomial": ("species__genus",),
+    }
+
     class Meta:
         model = InsectImage
         fields = "__all__"
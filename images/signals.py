@@ -0,0 +1,36 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from images.models import (
+    BaseLiveImage,
+    CustomImage,
+    HabitatImage,
+    InsectImage,
+    PlantImage,
+    SpecimenRecordImage,
+)
+from images.renditions import prepare_images
+
+
+@receiver(post_save, sender=CustomImage)
+@receiver(post_save, sender=BaseLiveImage)
+@receiver(post_save, sender=SpecimenRecordImage)
+@receiver(post_save, sender=InsectImage)
+@receiver(post_save, sender=PlantImage)
+@receiver(post_save, sender=HabitatImage)
+def render_uploaded_image(sender, instance, raw, update_fields, **kwargs):
+    """Creates an uploaded image's placeholder once it has been saved, and starts rendering its
+    API renditions in the background, so API requests never have to resize it.
+
+    Only the placeholder is created during the request (once the transaction commits), since
+    rendering every size in every format takes several seconds. Saves that only update other fields
+    (such as the file hash Wagtail fills in later) are ignored.
+    """
+
+    if raw or (update_fields is not None and "file" not in update_fields):
+        return
+
+    transaction.on_commit(partial(prepare_images, [instance.pk]))
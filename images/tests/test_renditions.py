@@ -0,0 +1,192 @@
+import base64
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from wagtail.images.tests.utils import get_test_image_file
+
+from images.models import CustomImage, CustomRendition
+
+
+class TemporaryMediaTestCase(TestCase):
+    """A base test case that stores uploaded images (and their renditions) in a temporary
+    directory."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        shutil.rmtree(self.media_root)
+
+
+class RenditionTestCase(TemporaryMediaTestCase):
+    """A test case for pre-generating the API renditions of images."""
+
+    def create_image(self, title="Test"):
+        """Uploads an image and renders it, as the background process started by the upload
+        would."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = CustomImage.objects.create(
+                title=title,
+                file=get_test_image_file(size=(2400, 1600)),
+                date="2024-06-01",
+            )
+
+        image.generate_renditions()
+
+        return image
+
+    def get_specs(self, image):
+        """Returns the filter specs of an image's renditions."""
+
+        return set(image.renditions.values_list("filter_spec", flat=True))
+
+    def test_upload(self):
+        """Ensures only an uploaded image's placeholder is created during the request."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = CustomImage.objects.create(
+                title="Test", file=get_test_image_file(), date="2024-06-01"
+            )
+
+        image.refresh_from_db()
+        self.assertTrue(image.placeholder)
+        self.assertFalse(image.renditions.exists())
+
+    def test_renditions(self):
+        """Ensures every API rendition is created, in every format."""
+
+        image = self.create_image()
+
+        self.assertEqual(
+            self.get_specs(image), set(CustomImage.get_all_rendition_specs())
+        )
+        self.assertEqual((image.large.width, image.large.height), (1500, 1000))
+
+        avif = image.get_rendition("max-300x300|format-avif")
+        webp = image.get_rendition("max-300x300|format-webp")
+        self.assertTrue(avif.file.name.endswith(".avif"))
+        self.assertTrue(webp.file.name.endswith(".webp"))
+        self.assertEqual((avif.width, webp.width), (300, 300))
+
+    def test_generate_renditions(self):
+        """Ensures only the missing renditions are created."""
+
+        image = self.create_image()
+        image.renditions.filter(filter_spec__in=["max-300x300", "max-900x900"]).delete()
+        image = CustomImage.objects.get(pk=image.pk)
+
+        self.assertEqual(image.generate_renditions(), 2)
+        self.assertEqual(len(self.get_specs(image)), 18)
+        self.assertEqual(image.generate_renditions(), 0)
+
+    def test_command(self):
+        """Ensures the command renders the images that are missing renditions, and skips the
+        rest."""
+
+        first = self.create_image("First")
+        second = self.create_image("Second")
+        second.renditions.all().delete()
+        output = StringIO()
+
+        call_command("generate_renditions", "--workers=1", stdout=output)
+
+        self.assertIn(
+            "1 of 2 images are missing renditions (1 skipped)", output.getvalue()
+        )
+        self.assertIn("Created 18 renditions for 1 images", output.getvalue())
+        self.assertEqual(self.get_specs(first), self.get_specs(second))
+        self.assertEqual(CustomRendition.objects.count(), 36)
+
+    def test_command_images(self):
+        """Ensures the command can render only some images, as uploads do in the background."""
+
+        first = self.create_image("First")
+        second = self.create_image("Second")
+        CustomRendition.objects.all().delete()
+        output = StringIO()
+
+        call_command(
+            "generate_renditions", "--workers=1", f"--images={first.pk}", stdout=output
+        )
+
+        self.assertIn(
+            "1 of 1 images are missing renditions (0 skipped)", output.getvalue()
+        )
+        self.assertEqual(len(self.get_specs(first)), 18)
+        self.assertFalse(second.renditions.exists())
+
+
+class PlaceholderTestCase(TemporaryMediaTestCase):
+    """A test case for image placeholders."""
+
+    def create_image(self, title="Test"):
+        """Uploads an image without creating its placeholder or renditions."""
+
+        return CustomImage.objects.create(
+            title=title, file=get_test_image_file(), date="2024-06-01"
+        )
+
+    def test_upload(self):
+        """Ensures an image's placeholder is created when it's uploaded."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = self.create_image()
+
+        image.refresh_from_db()
+        data = base64.b64decode(image.placeholder.split(",", 1)[1])
+
+        self.assertTrue(image.placeholder.startswith("data:image/webp;base64,"))
+        self.assertLess(len(image.placeholder), 500)
+        self.assertEqual(data[8:12], b"WEBP")
+
+    def test_replace_file(self):
+        """Ensures an image's placeholder is created again when its file is replaced."""
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = self.create_image()
+
+        image = CustomImage.objects.get(pk=image.pk)
+        placeholder = image.placeholder
+        image.title = "Renamed"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+
+        image.refresh_from_db()
+        self.assertEqual(image.placeholder, placeholder)
+
+        image.file = get_test_image_file(colour="black")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+
+        image.refresh_from_db()
+        self.assertTrue(image.placeholder.startswith("data:image/webp;base64,"))
+        self.assertNotEqual(image.placeholder, placeholder)
+
+    def test_command(self):
+        """Ensures the command only creates the placeholders that are missing."""
+
+        first = self.create_image("First")
+        second = self.create_image("Second")
+        first.generate_placeholder()
+        placeholder = first.placeholder
+        output = StringIO()
+
+        call_command("generate_placeholders", "--workers=1", stdout=output)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertIn(
+            "1 of 2 images are missing placeholders (1 skipped)", output.getvalue()
+        )
+        self.assertEqual(first.placeholder, placeholder)
+        self.assertTrue(second.placeholder.startswith("data:image/webp;base64,"))
+        self.assertFalse(CustomRendition.objects.exists())
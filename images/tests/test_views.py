@@ -0,0 +1,182 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from wagtail.images.tests.utils import get_test_image_file
+
+from images.models import (
+    CustomRendition,
+    HabitatImage,
+    InsectImage,
+    PlantImage,
+    SpecimenRecordImage,
+)
+from images.renditions import render_images
+from images.tests.test_renditions import TemporaryMediaTestCase
+from specimens.models import SpecimenRecord
+from specimens.tests.test_views import SPECIMEN_FIXTURES
+from taxonomy.models import Species
+from utils.response_cache import get_cache
+
+
+class ImagesAPIViewSetTestCase(TemporaryMediaTestCase):
+    """A test case for the query counts of the image endpoints."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def create_images(self, model, count, render=True, **kwargs):
+        """Uploads some images, creating their renditions unless render is False."""
+
+        for number in range(count):
+            image = model.objects.create(
+                title=f"Image {number}",
+                file=get_test_image_file(),
+                date="2024-06-01",
+                **kwargs,
+            )
+
+            if render:
+                image.generate_renditions()
+
+    def count_queries(self, url):
+        """Requests a URL and returns the number of queries it ran."""
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_listing_query_count(self):
+        """Ensures each image endpoint's listing reads every image's renditions in one query."""
+
+        specimen = SpecimenRecord.objects.first()
+        species = Species.objects.get(name="polyxenes")
+
+        for endpoint, model, kwargs in [
+            ("specimen-record-images", SpecimenRecordImage, {"usi": specimen}),
+            ("insect-images", InsectImage, {"species": species}),
+            ("plant-images", PlantImage, {}),
+            ("habitat-images", HabitatImage, {}),
+        ]:
+            with self.subTest(endpoint=endpoint):
+                url = f"/api/v2/{endpoint}/?limit=100"
+                self.create_images(model, 1, **kwargs)
+                before = self.count_queries(url)
+
+                self.create_images(model, 3, **kwargs)
+
+                # One query for the ETag, one count query, one query for the images (joined to
+                # any related objects they need), and one or two prefetch queries for the
+                # renditions (and plant and habitat images' species pages)
+                self.assertEqual(self.count_queries(url), before)
+                self.assertLessEqual(before, 5)
+
+    def test_missing_renditions(self):
+        """Ensures only existing renditions are listed, and missing ones aren't created during the
+        request."""
+
+        self.create_images(HabitatImage, 1, render=False)
+        url = "/api/v2/habitat-images/?fields=_,thumbnail,x_large,srcset,sources"
+
+        item = self.client.get(url).json()["items"][0]
+
+        self.assertIsNone(item["thumbnail"])
+        self.assertEqual(item["srcset"], "")
+        self.assertEqual([source["srcset"] for source in item["sources"]], ["", ""])
+        self.assertFalse(CustomRendition.objects.exists())
+
+        HabitatImage.objects.get().generate_renditions()
+        item = self.client.get(url).json()["items"][0]
+
+        self.assertEqual(item["thumbnail"]["filter_spec"], "max-300x300")
+        self.assertEqual(
+            item["x_large"]["id"],
+            CustomRendition.objects.get(filter_spec="max-2000x2000").id,
+        )
+
+    @override_settings(
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "api": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "image-tests",
+            },
+        }
+    )
+    def test_render_invalidates_cache(self):
+        """Ensures rendering an image's missing renditions invalidates the cached responses that
+        listed them as null."""
+
+        get_cache().clear()
+        self.create_images(HabitatImage, 1, render=False)
+        url = "/api/v2/habitat-images/?fields=_,id,thumbnail"
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIsNone(response.json()["items"][0]["thumbnail"])
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+
+        created, errors = render_images([HabitatImage.objects.get().pk])
+        self.assertEqual((created, errors), (18, []))
+
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(
+            response.json()["items"][0]["thumbnail"]["filter_spec"], "max-300x300"
+        )
+
+    def test_placeholder(self):
+        """Ensures each image is listed with its placeholder."""
+
+        self.create_images(HabitatImage, 1, render=False)
+        image = HabitatImage.objects.get()
+        image.generate_placeholder()
+
+        item = self.client.get("/api/v2/habitat-images/").json()["items"][0]
+
+        self.assertEqual(item["placeholder"], image.placeholder)
+
+    def test_srcset(self):
+        """Ensures the srcset lists each distinct width once, from the narrowest to the widest,
+        and the sources list each modern format."""
+
+        self.create_images(HabitatImage, 1)
+
+        item = self.client.get("/api/v2/habitat-images/").json()["items"][0]
+        entries = [entry.split(" ") for entry in item["srcset"].split(", ")]
+
+        # The test image is 640x480, so only the two smallest sizes are smaller than the original
+        self.assertEqual([width for _, width in entries], ["300w", "600w", "640w"])
+        self.assertTrue(entries[0][0].startswith("http://testserver/"))
+        self.assertTrue(entries[0][0].endswith(".png"))
+        self.assertEqual(
+            [
+                (source["type"], source["srcset"].split(" ")[0][-5:])
+                for source in item["sources"]
+            ],
+            [("image/avif", ".avif"), ("image/webp", ".webp")],
+        )
+
+    def test_accept_negotiation(self):
+        """Ensures the srcset is in the most compact format the client explicitly accepts."""
+
+        self.create_images(HabitatImage, 1)
+        url = "/api/v2/habitat-images/"
+        etags = set()
+
+        for accept, extension in [
+            ("*/*", ".png"),
+            ("application/json, image/*", ".png"),
+            ("image/webp,*/*", ".webp"),
+            ("image/avif,image/webp,*/*", ".avif"),
+            ("image/avif;q=0,image/webp,*/*", ".webp"),
+        ]:
+            with self.subTest(accept=accept):
+                response = self.client.get(url, headers={"Accept": accept})
+                srcset = response.json()["items"][0]["srcset"]
+
+                self.assertTrue(srcset.split(" ")[0].endswith(extension))
+                self.assertIn("Accept", response["Vary"])
+                etags.add(response["ETag"])
+
+        self.assertEqual(len(etags), 3)
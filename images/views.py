@@ -1,51 +1,104 @@
+from django.utils.cache import patch_vary_headers
 from wagtail.api.v2.views import BaseAPIViewSet
 
-from images.models import HabitatImage, InsectImage, PlantImage, SpecimenRecordImage
+from images.models import (
+    CustomRendition,
+    HabitatImage,
+    InsectImage,
+    PlantImage,
+    SpecimenRecordImage,
+)
+from images.renditions import negotiate_image_format
 from images.serializers import (
     HabitatImageSerializer,
     InsectImageSerializer,
     PlantImageSerializer,
     SpecimenRecordImageSerializer,
 )
+from mixins.views import ConditionalGetMixin, EagerLoadingMixin
+from taxonomy.models import Family, Genus, Species, Subfamily, Tribe
+from utils.caching import make_etag
 from utils.helpers import get_fields
 
 
-class SpecimenRecordImagesAPIViewSet(BaseAPIViewSet):
+class ImageFormatNegotiationMixin:
+    """A mixin for the image view sets that picks the format of each image's `srcset` from the
+    request's Accept header.
+
+    Clients that list image/avif or image/webp get those renditions, and everyone else gets the
+    original format. Responses vary on the Accept header, and the format is part of the listing's
+    ETag, so caches never mix them up.
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["image_format"] = negotiate_image_format(self.request)
+
+        return context
+
+    def get_etag(self, request):
+        return make_etag(super().get_etag(request), negotiate_image_format(request))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ["Accept"])
+
+        return response
+
+
+class SpecimenRecordImagesAPIViewSet(
+    ImageFormatNegotiationMixin, ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet
+):
     """A custom API view set for the SpecimenRecordImage model using the \
        SpecimenRecordImageSerializer."""
 
     base_serializer_class = SpecimenRecordImageSerializer
     model = SpecimenRecordImage
+    # The renditions are read through properties, so the response cache can't find them
+    cache_dependencies = [CustomRendition]
     queryset = SpecimenRecordImage.objects.all()
     body_fields = get_fields(SpecimenRecordImageSerializer)
     listing_default_fields = get_fields(SpecimenRecordImageSerializer)
 
 
-class InsectImagesAPIViewSet(BaseAPIViewSet):
+class InsectImagesAPIViewSet(
+    ImageFormatNegotiationMixin, ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet
+):
     """A custom API view set for the InsectImage model using the InsectImageSerializer."""
 
     base_serializer_class = InsectImageSerializer
     model = InsectImage
+    # The renditions, family, and binomial are read through properties, so the response cache
+    # can't find them
+    cache_dependencies = [CustomRendition, Family, Subfamily, Tribe, Genus, Species]
     queryset = InsectImage.objects.all()
     body_fields = get_fields(InsectImageSerializer)
     listing_default_fields = get_fields(InsectImageSerializer)
 
 
-class PlantImagesAPIViewSet(BaseAPIViewSet):
+class PlantImagesAPIViewSet(
+    ImageFormatNegotiationMixin, ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet
+):
     """A custom API view set for the PlantImage model using the PlantImageSerializer."""
 
     base_serializer_class = PlantImageSerializer
     model = PlantImage
+    # The renditions are read through properties, so the response cache can't find them
+    cache_dependencies = [CustomRendition]
     queryset = PlantImage.objects.all()
     body_fields = get_fields(PlantImageSerializer)
     listing_default_fields = get_fields(PlantImageSerializer)
 
 
-class HabitatImagesAPIViewSet(BaseAPIViewSet):
+class HabitatImagesAPIViewSet(
+    ImageFormatNegotiationMixin, ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet
+):
     """A custom API view set for the HabitatImage model using the HabitatImageSerializer."""
 
     base_serializer_class = HabitatImageSerializer
     model = HabitatImage
+    # The renditions are read through properties, so the response cache can't find them
+    cache_dependencies = [CustomRendition]
     queryset = HabitatImage.objects.all()
     body_fields = get_fields(HabitatImageSerializer)
     listing_default_fields = get_fields(HabitatImageSerializer)
@@ -1,5 +1,4 @@
 from wagtail.api.v2.views import PagesAPIViewSet
-from wagtail.api.v2.router import WagtailAPIRouter
 from wagtail.images.api.v2.views import ImagesAPIViewSet
 from wagtail.documents.api.v2.views import DocumentsAPIViewSet
 
@@ -36,11 +35,14 @@ from taxonomy.views import (
     SpeciesAPIViewSet,
     SubfamiliesAPIViewSet,
     SubspeciesAPIViewSet,
+    TaxonomyTreeAPIViewSet,
     TribesAPIViewSet,
 )
+from utils.response_cache import CachedAPIRouter
 
-# Create the router. "wagtailapi" is the URL namespace
-api_router = WagtailAPIRouter("wagtailapi")
+# Create the router. "wagtailapi" is the URL namespace. Every endpoint's responses are cached
+# until the data they're built from changes (see utils/response_cache.py)
+api_router = CachedAPIRouter("wagtailapi")
 
 # Add the three endpoints using the "register_endpoint" method.
 # The first parameter is the name of the endpoint (such as pages, images). This
@@ -89,3 +91,4 @@ api_router.register_endpoint("species", SpeciesAPIViewSet)
 api_router.register_endpoint("nested-species", NestedSpeciesAPIViewSet)
 api_router.register_endpoint("subspecies", SubspeciesAPIViewSet)
 api_router.register_endpoint("nested-subspecies", NestedSubspeciesAPIViewSet)
+api_router.register_endpoint("taxonomy-tree", TaxonomyTreeAPIViewSet)
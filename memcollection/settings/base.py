@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "geography",
     "home",
     "images",
+    "mixins",
     "pages",
     "search",
     "specimens",
@@ -102,6 +103,35 @@ TEMPLATES = [
 WSGI_APPLICATION = "memcollection.wsgi.application"
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# API responses are cached in the "api" cache (see utils/response_cache.py). It has to be shared by
+# every worker process, so it uses Redis (or any Redis-compatible server) when REDIS_URL is set,
+# and files on the local disk otherwise.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+            "TIMEOUT": 60 * 60 * 24,
+        }
+        if os.getenv("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv(
+                "API_CACHE_DIR", os.path.join(BASE_DIR, "cache", "api")
+            ),
+            "TIMEOUT": 60 * 60 * 24,
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    ),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -173,6 +203,20 @@ WAGTAIL_SITE_NAME = "memcollection"
 WAGTAILAPI_LIMIT_MAX = None
 WAGTAILIMAGES_IMAGE_MODEL = "images.CustomImage"
 
+# The quality of the AVIF and WebP renditions. AVIF looks about as good as a JPEG of quality 85 at a
+# much lower setting.
+WAGTAILIMAGES_AVIF_QUALITY = 60
+WAGTAILIMAGES_WEBP_QUALITY = 75
+
+# Whether an uploaded image's API renditions are rendered by a generate_renditions process started
+# in the background (see images.renditions.start_rendering()). When False, they're left to the
+# next run of generate_renditions.
+RENDER_UPLOADED_IMAGES = True
+
+# The most rows a file uploaded to the admin's specimen import can have. The admin imports the file
+# during the request, so larger files are imported with the import_specimens command instead.
+SPECIMEN_IMPORT_ADMIN_MAX_ROWS = 5000
+
 # Search
 # https://docs.wagtail.org/en/stable/topics/search/backends.html
 WAGTAILSEARCH_BACKENDS = {
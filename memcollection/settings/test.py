@@ -26,3 +26,22 @@ DATABASES = {
         "PORT": 5432,
     }
 }
+
+# Responses aren't cached by default in tests, since the database is rolled back after each test
+# without the cache noticing. Tests of the response cache turn it on with override_settings().
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "api": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    },
+}
+
+# Static files aren't collected for tests, so the admin's pages can't look them up in a manifest
+STORAGES["staticfiles"] = {  # noqa: F405
+    "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+}
+
+# A background process couldn't see the test database, so tests render images themselves
+RENDER_UPLOADED_IMAGES = False
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MixinsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "mixins"
+
+    def ready(self):
+        import mixins.signals  # noqa: F401
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from utils.response_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Show the number of API response cache hits and misses since the counters were reset."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0
+
+        self.stdout.write(
+            f"Hits: {stats['hits']:,}\nMisses: {stats['misses']:,}\nHit rate: {hit_rate:.1%}"
+        )
+
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Reset the counters."))
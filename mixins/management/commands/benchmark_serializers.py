@@ -0,0 +1,135 @@
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.serializers import ModelSerializer
+from wagtail.api.v2.utils import parse_fields_parameter
+
+from memcollection.api import api_router
+from mixins.views import SerializerClassCacheMixin, build_serializer_class
+from utils.benchmarks import create_synthetic_collection, rolled_back, time_call
+from utils.helpers import get_field_names, get_fields
+from utils.query_planner import get_related_lookups
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the serializer introspection done when the API is loaded and on every listing "
+        "request, with and without the cached field names and serializer classes. A synthetic "
+        "collection is created for the listings and rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=1000,
+            help="The number of synthetic specimen records to create (default: 1,000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="The number of timed runs of each benchmark (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        endpoints = [
+            (name, view_class)
+            for name, view_class in api_router._endpoints.items()
+            if issubclass(view_class, SerializerClassCacheMixin)
+        ]
+
+        self.benchmark_startup(endpoints, options["repeat"])
+
+        with rolled_back():
+            create_synthetic_collection(options["records"], log=self.stdout.write)
+            self.benchmark_requests(endpoints, options["repeat"])
+
+    def benchmark_startup(self, endpoints, repeat):
+        """Times listing the fields of every endpoint's serializer, as the view sets do on import.
+
+        Each view set lists its serializer's fields twice (for its body fields and its listing
+        default fields).
+        """
+
+        serializers = [
+            view_class.base_serializer_class
+            for name, view_class in endpoints
+            if issubclass(view_class.base_serializer_class, ModelSerializer)
+        ]
+
+        def instantiate():
+            for serializer in serializers:
+                for _ in range(2):
+                    list(serializer().fields)
+
+        def introspect():
+            get_field_names.cache_clear()
+            for serializer in serializers:
+                for _ in range(2):
+                    get_fields(serializer)
+
+        self.stdout.write(f"\nListing the fields of {len(serializers)} serializers")
+        self.stdout.write(f"{'Method':<28}{'Time':>12}")
+        self.stdout.write(
+            f"{'Instantiated serializers':<28}{time_call(instantiate, repeat):>9.2f} ms"
+        )
+        self.stdout.write(
+            f"{'Class introspection':<28}{time_call(introspect, repeat):>9.2f} ms"
+        )
+
+    def benchmark_requests(self, endpoints, repeat):
+        """Times the serializer setup of a listing request to every endpoint, with and without the
+        cached classes, alongside the time taken by the whole request.
+
+        The setup is what a view set does before it runs any queries: it builds its serializer
+        class twice (once to plan the queryset and once to serialize it) and plans the queryset's
+        related lookups. The requests call the view sets directly (skipping the URL resolver,
+        middleware, and the API router's response cache).
+        """
+
+        factory = RequestFactory()
+        urls = [(name, f"/api/v2/{name}/") for name, view_class in endpoints]
+        urls.append(
+            (
+                "specimen-records (fields)",
+                "/api/v2/specimen-records/?fields=_,usi,species",
+            )
+        )
+
+        self.stdout.write(f"\nListing each endpoint ({repeat:,} runs, median time)")
+        self.stdout.write(
+            f"{'Endpoint':<28}{'Uncached setup':>16}{'Cached setup':>16}{'Request':>12}"
+        )
+
+        for label, url in urls:
+            view_class = api_router._endpoints[url.split("/")[3]]
+            view = view_class.as_view({"get": "listing_view"})
+            query = url.partition("?")[2]
+            fields_config = (
+                parse_fields_parameter(query.partition("=")[2]) if query else []
+            )
+
+            def setup():
+                for _ in range(2):
+                    serializer_class = view_class._get_serializer_class(
+                        api_router, view_class.model, fields_config
+                    )
+                get_related_lookups(serializer_class)
+
+            def uncached_setup():
+                build_serializer_class.cache_clear()
+                get_related_lookups.cache_clear()
+                setup()
+
+            def request():
+                request = factory.get(url)
+                request.wagtailapi_router = api_router
+                view(request).render()
+
+            uncached = time_call(uncached_setup, repeat)
+            cached = time_call(setup, repeat)
+            total = time_call(request, repeat)
+
+            self.stdout.write(
+                f"{label:<28}{uncached:>13.2f} ms{cached:>13.2f} ms{total:>9.2f} ms"
+            )
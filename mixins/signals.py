@@ -0,0 +1,37 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from utils.response_cache import bump_generations, is_cached_model
+
+
+def invalidate_responses(*models):
+    """Invalidates the cached API responses built from some models, once the change is committed.
+
+    Bumping the generations before the commit would let a request that runs in the meantime cache
+    the old data under the new generation, where it would never be invalidated.
+    """
+
+    models = [model for model in models if is_cached_model(model)]
+
+    if models:
+        transaction.on_commit(partial(bump_generations, *models))
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_model_responses(sender, **kwargs):
+    """Invalidates the cached API responses built from a model when one of its objects changes."""
+
+    invalidate_responses(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_relation_responses(sender, instance, action, model, **kwargs):
+    """Invalidates the cached API responses built from either side of a changed many-to-many
+    relation."""
+
+    if action.startswith("post_"):
+        invalidate_responses(type(instance), model)
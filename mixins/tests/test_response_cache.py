@@ -0,0 +1,170 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from specimens.models import Person, SpecimenRecord
+from specimens.tests.test_views import SPECIMEN_FIXTURES
+from taxonomy.models import Species
+from utils.response_cache import get_cache, get_stats
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "api": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "api-tests",
+        },
+    }
+)
+class ResponseCacheTestCase(TestCase):
+    """A test case for the API router's response cache."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def setUp(self):
+        get_cache().clear()
+
+    def get(self, url, **headers):
+        """Requests a URL and checks whether the response was served from the cache."""
+
+        response = self.client.get(url, **headers)
+        self.assertIn(response["X-Cache"], ["HIT", "MISS"])
+        return response
+
+    def test_hit(self):
+        """Ensures a repeated request is served from the cache without any queries."""
+
+        url = "/api/v2/specimen-records/?family=Papilionidae"
+        first = self.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.get(url)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(get_stats(), {"hits": 1, "misses": 1})
+
+    def test_tile(self):
+        """Ensures map tiles are cached until a specimen record or its coordinates change."""
+
+        url = "/api/v2/specimen-records/tiles/2/1/1/"
+        first = self.get(url)
+
+        with self.assertNumQueries(0):
+            second = self.get(url)
+
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            gps = SpecimenRecord.objects.get(usi="MEM-000001").gps
+            gps.latitude = "38.85"
+            gps.save()
+
+        response = self.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["clusters"][0]["latitude"], 38.85)
+
+    def test_conditional_hit(self):
+        """Ensures a cached response answers a matching If-None-Match header with a 304."""
+
+        url = "/api/v2/people/"
+        etag = self.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_query_parameters(self):
+        """Ensures the key covers the query parameters, but not their order."""
+
+        self.get("/api/v2/specimen-records/?family=Papilionidae&limit=2")
+
+        self.assertEqual(
+            self.get("/api/v2/specimen-records/?limit=2&family=Papilionidae")[
+                "X-Cache"
+            ],
+            "HIT",
+        )
+        self.assertEqual(
+            self.get("/api/v2/specimen-records/?family=Parnassiidae&limit=2")[
+                "X-Cache"
+            ],
+            "MISS",
+        )
+
+    def test_errors_not_cached(self):
+        """Ensures error responses aren't cached."""
+
+        url = "/api/v2/specimen-records/?cursor=not-a-cursor"
+
+        self.assertEqual(self.get(url).status_code, 400)
+        self.assertEqual(self.get(url)["X-Cache"], "MISS")
+
+    def test_invalidated_on_save(self):
+        """Ensures saving an object invalidates the responses of every endpoint built from it."""
+
+        self.get("/api/v2/specimen-records/")
+        self.get("/api/v2/species/")
+        self.get("/api/v2/people/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            species = Species.objects.get(name="polyxenes")
+            species.common_name = "Eastern Black Swallowtail"
+            species.save()
+
+        response = self.get("/api/v2/specimen-records/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertIn(
+            "Eastern Black Swallowtail",
+            [
+                item["species"]["common_name"]
+                for item in response.json()["items"]
+                if item["species"]
+            ],
+        )
+        self.assertEqual(self.get("/api/v2/species/")["X-Cache"], "MISS")
+        self.assertEqual(self.get("/api/v2/people/")["X-Cache"], "HIT")
+
+    def test_invalidated_on_delete(self):
+        """Ensures deleting an object invalidates the responses built from it."""
+
+        self.get("/api/v2/specimen-records/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SpecimenRecord.objects.get(usi="MEM-000001").delete()
+
+        response = self.get("/api/v2/specimen-records/")
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["meta"]["total_count"], 3)
+
+    def test_invalidated_on_m2m_change(self):
+        """Ensures changing a many-to-many relation invalidates the responses built from it."""
+
+        self.get("/api/v2/specimen-records/")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SpecimenRecord.objects.get(usi="MEM-000001").collector.set(
+                Person.objects.filter(last_name="Smith")
+            )
+
+        self.assertEqual(self.get("/api/v2/specimen-records/")["X-Cache"], "MISS")
+
+    def test_stats_command(self):
+        """Ensures the api_cache_stats command reports and resets the counters."""
+
+        self.get("/api/v2/people/")
+        self.get("/api/v2/people/")
+        output = StringIO()
+
+        call_command("api_cache_stats", "--reset", stdout=output)
+
+        self.assertIn("Hits: 1", output.getvalue())
+        self.assertIn("Hit rate: 50.0%", output.getvalue())
+        self.assertEqual(get_stats(), {"hits": 0, "misses": 0})
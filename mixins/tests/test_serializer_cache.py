@@ -0,0 +1,94 @@
+from django.test import TestCase, override_settings
+
+from geography.serializers import LocalitySerializer
+from memcollection.api import api_router
+from mixins.views import build_serializer_class, freeze_fields_config
+from specimens.models import SpecimenRecord
+from specimens.serializers import SpecimenRecordSerializer
+from specimens.tests.test_views import SPECIMEN_FIXTURES
+from specimens.views import SpecimenRecordAPIViewSet
+from utils.helpers import get_fields
+from utils.query_planner import get_related_lookups
+
+
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "api": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+)
+class SerializerClassCacheTestCase(TestCase):
+    """A test case for the cached field introspection and serializer classes of the API."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def get_serializer_class(self, fields_config, show_details=False):
+        """Gets the specimen records endpoint's serializer class for a `fields` parameter."""
+
+        return SpecimenRecordAPIViewSet._get_serializer_class(
+            api_router, SpecimenRecord, fields_config, show_details=show_details
+        )
+
+    def test_get_fields(self):
+        """Ensures the field names match the ones the serializers build, in the same order."""
+
+        for serializer in [SpecimenRecordSerializer, LocalitySerializer]:
+            self.assertEqual(get_fields(serializer), list(serializer().fields))
+
+        # Each call returns a new list, so view sets can't change each other's fields
+        self.assertIsNot(
+            get_fields(SpecimenRecordSerializer), get_fields(SpecimenRecordSerializer)
+        )
+
+    def test_freeze_fields_config(self):
+        """Ensures a parsed fields parameter (including its sub-fields) becomes hashable."""
+
+        fields_config = [
+            ("_", False, None),
+            ("species", False, [("name", False, None)]),
+        ]
+
+        self.assertEqual(
+            freeze_fields_config(fields_config),
+            (("_", False, None), ("species", False, (("name", False, None),))),
+        )
+
+    def test_class_reused(self):
+        """Ensures the same fields parameter gets the same serializer class every time."""
+
+        fields_config = [("_", False, None), ("usi", False, None)]
+        serializer_class = self.get_serializer_class(fields_config)
+
+        self.assertIs(self.get_serializer_class(list(fields_config)), serializer_class)
+        self.assertEqual(serializer_class.Meta.fields, ["usi"])
+        self.assertIsNot(self.get_serializer_class([]), serializer_class)
+        self.assertIsNot(
+            self.get_serializer_class(fields_config, show_details=True),
+            serializer_class,
+        )
+
+    def test_listing(self):
+        """Ensures repeated listings reuse the serializer class and are serialized the same way."""
+
+        url = "/api/v2/specimen-records/?fields=_,usi,species"
+        first = self.client.get(url)
+        hits = build_serializer_class.cache_info().hits
+        lookup_hits = get_related_lookups.cache_info().hits
+        second = self.client.get(url)
+
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(
+            [list(item) for item in second.json()["items"]][0], ["usi", "species"]
+        )
+        self.assertGreater(build_serializer_class.cache_info().hits, hits)
+        self.assertGreater(get_related_lookups.cache_info().hits, lookup_hits)
+
+    def test_unknown_field(self):
+        """Ensures an unknown field is still rejected after a valid request for the same view."""
+
+        self.client.get("/api/v2/specimen-records/?fields=_,usi")
+
+        for _ in range(2):
+            response = self.client.get("/api/v2/specimen-records/?fields=_,usi,nope")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"message": "unknown fields: nope"})
@@ -0,0 +1,201 @@
+from functools import lru_cache
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from wagtail.api.v2.utils import BadRequestError, parse_fields_parameter
+
+from utils.caching import make_etag
+from utils.query_planner import plan_queryset
+
+
+class ConditionalGetMixin:
+    """A mixin for Wagtail API view sets that supports conditional GET requests on listings.
+
+    Before anything is serialized, it runs one aggregate query over the filtered queryset for the
+    latest modification date and the row count. These (along with the request's path and query
+    string) make up the response's ETag. If the request's If-None-Match header shows the client
+    already has the current data, a 304 response is returned straight away.
+
+    No Last-Modified header is sent: the latest modification date alone doesn't change when a
+    listed object is deleted, so If-Modified-Since requests could be answered with a stale 304. The
+    ETag also includes the row count, which does.
+
+    Note that the ETag only covers the listed objects themselves. Changes to related objects that
+    are serialized along with them (such as a renamed taxon within a specimen record) don't update
+    their date_modified.
+
+    Attributes:
+        last_modified_field (str): The field holding each object's modification date.
+        cache_control (dict): The Cache-Control directives for the endpoint's responses, as \
+                              keyword arguments to patch_cache_control(). By default, clients may \
+                              cache responses but must revalidate them on every request.
+    """
+
+    last_modified_field = "date_modified"
+    cache_control = {"public": True, "max_age": 0, "must_revalidate": True}
+
+    def listing_view(self, request):
+        etag = self.get_etag(request)
+
+        response = get_conditional_response(request, etag=etag)
+
+        if response is None:
+            response = self.get_listing_response(request)
+
+        response["ETag"] = etag
+        patch_cache_control(response, **self.cache_control)
+
+        return response
+
+    def get_listing_response(self, request):
+        """Builds the full listing response, when the client's copy is missing or out of date."""
+
+        return super().listing_view(request)
+
+    def get_etag(self, request):
+        """Computes the ETag for a listing request in one query.
+
+        Args:
+            request (Request): The request being answered.
+
+        Returns:
+            The ETag (str).
+        """
+
+        validators = (
+            self.get_queryset()
+            .order_by()
+            .aggregate(
+                last_modified=Max(self.last_modified_field),
+                count=Count("pk"),
+            )
+        )
+        last_modified = validators["last_modified"]
+
+        return make_etag(
+            request.get_full_path(),
+            last_modified.isoformat() if last_modified else "",
+            validators["count"],
+        )
+
+
+# The most serializer classes kept by SerializerClassCacheMixin. Each distinct `fields` parameter
+# (per view set and action) needs its own class, and the parameter comes from the client.
+SERIALIZER_CLASS_CACHE_SIZE = 256
+
+
+def freeze_fields_config(fields_config):
+    """Converts a parsed `fields` parameter into nested tuples, so it can be used as a cache key.
+
+    Args:
+        fields_config (list): The output of parse_fields_parameter(), a list of (name, negated,
+                              sub-fields) tuples where the sub-fields are parsed the same way.
+
+    Returns:
+        The same configuration as a tuple of tuples.
+    """
+
+    return tuple(
+        (name, negated, freeze_fields_config(sub_fields) if sub_fields else None)
+        for name, negated, sub_fields in fields_config
+    )
+
+
+@lru_cache(maxsize=SERIALIZER_CLASS_CACHE_SIZE)
+def build_serializer_class(
+    view_class, router, model, fields_config, show_details, nested
+):
+    """Builds a view set's serializer class, using Wagtail's own (uncached) implementation.
+
+    Args:
+        view_class (BaseAPIViewSet): The view set class (which uses SerializerClassCacheMixin).
+        router (WagtailAPIRouter): The API router, used to find serializers for nested models.
+        model (Model): The model being serialized.
+        fields_config (tuple): The frozen `fields` parameter (see freeze_fields_config()).
+        show_details (bool): Whether detail-only fields are allowed.
+        nested (bool): Whether the serializer is for a nested object.
+
+    Returns:
+        The serializer class.
+    """
+
+    return super(SerializerClassCacheMixin, view_class)._get_serializer_class(
+        router, model, fields_config, show_details=show_details, nested=nested
+    )
+
+
+class SerializerClassCacheMixin:
+    """A mixin for Wagtail API view sets that reuses serializer classes between requests.
+
+    Wagtail builds a new serializer class (along with one for every nested model) each time it
+    serializes a response, and it does so twice per request. Since a new class has no cached state,
+    the field introspection that depends on it (such as the queryset planning done by
+    EagerLoadingMixin) has to be repeated too. This keeps the classes in a least recently used cache
+    keyed by the view set, model, action, and the request's `fields` parameter, so each variation is
+    only built once per process.
+
+    Invalid `fields` parameters raise a BadRequestError as usual, and aren't cached.
+    """
+
+    @classmethod
+    def _get_serializer_class(
+        cls, router, model, fields_config, show_details=False, nested=False
+    ):
+        return build_serializer_class(
+            cls,
+            router,
+            model,
+            freeze_fields_config(fields_config),
+            show_details,
+            nested,
+        )
+
+
+class EagerLoadingMixin(SerializerClassCacheMixin):
+    """A mixin for Wagtail API view sets that loads related objects up front.
+
+    It looks at the serializer that will be used for the request (which depends on the `fields`
+    query parameter) and adds the matching select_related() and prefetch_related() calls to the
+    queryset, so the number of queries stays the same no matter how many rows are returned.
+
+    Other actions (such as find_view, or a view set's own export views) don't serialize anything,
+    so their querysets are left alone.
+
+    The serializer classes are reused between requests (see SerializerClassCacheMixin), so the
+    relations each one needs are only worked out once.
+    """
+
+    serializing_actions = ("listing_view", "detail_view")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action not in self.serializing_actions:
+            return queryset
+
+        return plan_queryset(queryset, self.get_requested_serializer_class())
+
+    def get_requested_serializer_class(self):
+        """Builds the serializer class for the current request.
+
+        BaseAPIViewSet.get_serializer_class() calls get_queryset() to find the model, so it can't
+        be used from within get_queryset(). This does the same work using the view set's model.
+
+        Returns:
+            The serializer class that will be used to serialize the response.
+        """
+
+        if "fields" in self.request.GET:
+            try:
+                fields_config = parse_fields_parameter(self.request.GET["fields"])
+            except ValueError as e:
+                raise BadRequestError("fields error: %s" % str(e))
+        else:
+            fields_config = []
+
+        return self._get_serializer_class(
+            self.request.wagtailapi_router,
+            self.model,
+            fields_config,
+            show_details=self.action != "listing_view",
+        )
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from wagtail.models import Page
+
+from pages.models import SpeciesPage
+from pages.serializers import SpeciesPageSerializer
+from taxonomy.models import Species
+from utils.benchmarks import create_synthetic_collection, rolled_back
+from utils.query_planner import plan_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark listing every species page, comparing the lineage loaded one object at a time "
+        "with the lineage joined into the page query. Synthetic species (and their pages) are "
+        "created under the home page and rolled back afterwards."
+    )
+
+    def handle(self, *args, **options):
+        try:
+            home = Page.objects.get(slug="home")
+        except Page.DoesNotExist:
+            raise CommandError("Parent page with slug 'home' does not exist.")
+
+        with rolled_back():
+            create_synthetic_collection(0, log=self.stdout.write)
+
+            self.stdout.write("Creating species pages...")
+            species = Species.objects.filter(species_page__isnull=True).select_related(
+                "genus"
+            )
+            SpeciesPage.bulk_add_for_species(home, list(species))
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            count = SpeciesPage.objects.count()
+            self.stdout.write(f"\nListing {count:,} species pages")
+            self.stdout.write(f"{'Queryset':<20}{'Queries':>10}{'Time':>12}")
+
+            for label, queryset in [
+                ("Lazy lineage", SpeciesPage.objects.all()),
+                (
+                    "Joined lineage",
+                    plan_queryset(SpeciesPage.objects.all(), SpeciesPageSerializer),
+                ),
+            ]:
+                queries, seconds = self.serialize(queryset)
+                self.stdout.write(f"{label:<20}{queries:>10,}{seconds:>10.2f} s")
+
+    def serialize(self, queryset):
+        """Serializes every page in a queryset, the way the species pages endpoint does.
+
+        Returns:
+            A tuple of the number of queries run and the time taken in seconds.
+        """
+
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_query):
+            start = time.perf_counter()
+            SpeciesPageSerializer(queryset, many=True).data
+            seconds = time.perf_counter() - start
+
+        return queries, seconds
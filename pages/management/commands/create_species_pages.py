@@ -1,14 +1,30 @@
 from django.core.management.base import BaseCommand
-from django.template.defaultfilters import slugify
 from pages.models import SpeciesPage
 from taxonomy.models import Species
+from utils.response_cache import bump_generations
 from wagtail.models import Page
 
 
 class Command(BaseCommand):
-    help = "Create a SpeciesPage for every Species in the database that does not already have one."
+    help = (
+        "Create a SpeciesPage for every Species in the database that does not already have one. "
+        "Pages are created in batches, and added to the search index in bulk at the end."
+    )
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="The number of pages created at a time (default: 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the pages that would be created without creating them",
+        )
+
+    def handle(self, *args, **options):
         try:
             parent_page = Page.objects.get(slug="home")
         except Page.DoesNotExist:
@@ -17,17 +33,38 @@ class Command(BaseCommand):
             )
             return
 
-        species_without_pages = Species.objects.filter(species_page__isnull=True)
+        # The genus is needed for each species' binomial (the page's title)
+        species_without_pages = list(
+            Species.objects.filter(species_page__isnull=True).select_related("genus")
+        )
+        total = len(species_without_pages)
+        batch_size = options["batch_size"]
 
-        for species in species_without_pages:
-            species_page = SpeciesPage(
-                title=species.binomial,
-                species=species,
-                slug=slugify(species.binomial),
-            )
-            parent_page.add_child(instance=species_page)
+        if options["dry_run"]:
+            for species in species_without_pages:
+                self.stdout.write(f"Would create SpeciesPage for {species.binomial}")
             self.stdout.write(
-                self.style.SUCCESS(f"Created SpeciesPage for {species.binomial}")
+                self.style.SUCCESS(f"{total} species pages would be created.")
+            )
+            return
+
+        page_ids = []
+
+        for start in range(0, total, batch_size):
+            pages = SpeciesPage.bulk_add_for_species(
+                parent_page, species_without_pages[start : start + batch_size]
             )
+            page_ids += [page.id for page in pages]
+
+            if options["verbosity"] > 1:
+                for page in pages:
+                    self.stdout.write(f"Created SpeciesPage for {page.title}")
+            self.stdout.write(f"Created {len(page_ids)} / {total} species pages")
+
+        if page_ids:
+            self.stdout.write("Updating the search index...")
+            SpeciesPage.update_search_index(page_ids)
+            # The pages were inserted without sending any signals
+            bump_generations(SpeciesPage)
 
         self.stdout.write(self.style.SUCCESS("SpeciesPage creation process completed."))
@@ -1,9 +1,14 @@
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import F
+from django.template.defaultfilters import slugify
+from django.utils import timezone
 from wagtail.admin.panels import FieldPanel
 from wagtail.fields import RichTextField
-from wagtail.models import Page
+from wagtail.models import Page, PageLogEntry
+from wagtail.search.backends import get_search_backends
 
-from taxonomy.models import Species, Subspecies
+from taxonomy.models import Species
 
 
 class SpeciesPage(Page):
@@ -101,6 +106,146 @@ class SpeciesPage(Page):
     def subspecies(self):
         """An array of subspecies that belong to this page's species object."""
 
-        return Subspecies.objects.select_related("species").filter(
-            species__id=self.species.id
-        )
+        return self.species.subspecies.all()
+
+    @classmethod
+    def get_available_slug(cls, parent, base_slug, taken):
+        """Finds a slug that isn't used by any of a parent page's children, the way Wagtail does
+        (by adding -2, -3, etc. to the end of the slug).
+
+        Args:
+            parent (Page): The parent page.
+            base_slug (str): The preferred slug.
+            taken (set): Slugs that are already used, either by existing children or by pages in
+                         the same batch. Slugs with a suffix are checked against the database.
+
+        Returns:
+            A slug.
+        """
+
+        slug = base_slug
+        suffix = 1
+
+        while slug in taken or (
+            suffix > 1 and not Page._slug_is_available(slug, parent)
+        ):
+            suffix += 1
+            slug = f"{base_slug}-{suffix}"
+
+        return slug
+
+    @classmethod
+    def bulk_add_for_species(cls, parent, species):
+        """Creates a species page for each of some species under a parent page, in a few queries.
+
+        Calling parent.add_child() for each page looks up and updates the parent, finds the last
+        child, validates, and saves the page (along with a log entry) one page at a time. This
+        allocates the tree paths for the whole batch at once, inserts the pages with one query per
+        table, and updates the parent's child count once. Since save() isn't called, the pages
+        aren't added to the search index; call update_search_index() afterwards.
+
+        Args:
+            parent (Page): The page to add the species pages to.
+            species (list): The species, with their genus loaded (for the pages' titles).
+
+        Returns:
+            A list of the new species pages.
+        """
+
+        if not species:
+            return []
+
+        with transaction.atomic():
+            # Lock the parent, so no other page can be given the same paths
+            parent = Page.objects.select_for_update().get(pk=parent.pk)
+            last_child = parent.get_last_child()
+            step = Page._str2int(last_child.path[-Page.steplen :]) if last_child else 0
+            depth = parent.depth + 1
+
+            slugs = [slugify(item.binomial) for item in species]
+            taken = set(
+                parent.get_children()
+                .filter(slug__in=slugs)
+                .values_list("slug", flat=True)
+            )
+            content_type = ContentType.objects.get_for_model(cls)
+            pages = []
+
+            for offset, (item, base_slug) in enumerate(zip(species, slugs), start=1):
+                slug = cls.get_available_slug(parent, base_slug, taken)
+                taken.add(slug)
+                page = cls(
+                    title=item.binomial,
+                    draft_title=item.binomial,
+                    slug=slug,
+                    species=item,
+                    content_type=content_type,
+                    locale_id=parent.locale_id,
+                    depth=depth,
+                    path=Page._get_path(parent.path, depth, step + offset),
+                    numchild=0,
+                )
+                page.set_url_path(parent)
+                pages.append(page)
+
+            # Django can't bulk create multi-table inherited models, so the Page rows are created
+            # first, and then the SpeciesPage rows are inserted pointing at them
+            base_fields = [
+                field.attname
+                for field in Page._meta.concrete_fields
+                if not field.primary_key
+            ]
+            base_pages = Page.objects.bulk_create(
+                [
+                    Page(**{name: getattr(page, name) for name in base_fields})
+                    for page in pages
+                ]
+            )
+
+            for page, base_page in zip(pages, base_pages):
+                page.id = page.page_ptr_id = base_page.id
+
+            cls._base_manager._insert(pages, fields=cls._meta.local_concrete_fields)
+            for page in pages:
+                page._state.adding = False
+
+            Page.objects.filter(pk=parent.pk).update(
+                numchild=F("numchild") + len(pages)
+            )
+
+            now = timezone.now()
+            PageLogEntry.objects.bulk_create(
+                [
+                    PageLogEntry(
+                        page_id=page.id,
+                        content_type=content_type,
+                        label=page.title,
+                        action="wagtail.create",
+                        timestamp=now,
+                        content_changed=True,
+                    )
+                    for page in pages
+                ]
+            )
+
+        return pages
+
+    @classmethod
+    def update_search_index(cls, page_ids, batch_size=1000):
+        """Adds species pages to the search index in bulk.
+
+        Args:
+            page_ids (list): The IDs of the pages to index.
+            batch_size (int): The number of pages indexed at a time.
+        """
+
+        backends = list(get_search_backends(with_auto_update=True))
+
+        for start in range(0, len(page_ids), batch_size):
+            pages = list(
+                cls.get_indexed_objects().filter(
+                    pk__in=page_ids[start : start + batch_size]
+                )
+            )
+            for backend in backends:
+                backend.add_bulk(cls, pages)
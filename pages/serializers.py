@@ -22,15 +22,28 @@ from taxonomy.serializers import (
 
 
 class SpeciesPageSerializer(serializers.ModelSerializer):
-    """A serializer for the SpeciesPage model."""
-
-    order = OrderSerializer()
-    family = FamilySerializer()
-    subfamily = SubfamilySerializer()
-    tribe = TribeSerializer()
-    genus = GenusSerializer()
-    species = SpeciesSerializer()
-    subspecies = SubspeciesSerializer(many=True)
+    """A serializer for the SpeciesPage model.
+
+    The species' lineage is read through the full relation path (rather than the page's `order`,
+    `family`, etc. properties), so the API's query planner can join every rank into the page query.
+    Each rank is null if the page has no species.
+    """
+
+    order = OrderSerializer(
+        source="species.genus.tribe.subfamily.family.order", allow_null=True
+    )
+    family = FamilySerializer(
+        source="species.genus.tribe.subfamily.family", allow_null=True
+    )
+    subfamily = SubfamilySerializer(
+        source="species.genus.tribe.subfamily", allow_null=True
+    )
+    tribe = TribeSerializer(source="species.genus.tribe", allow_null=True)
+    genus = GenusSerializer(source="species.genus", allow_null=True)
+    species = SpeciesSerializer(allow_null=True)
+    subspecies = SubspeciesSerializer(
+        source="species.subspecies", many=True, allow_null=True
+    )
     # footnotes = FootnoteSerializer(many=True)
 
     class Meta:
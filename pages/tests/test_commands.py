@@ -0,0 +1,103 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from pages.models import SpeciesPage
+from taxonomy.models import Genus, Species
+from taxonomy.tests.test_models import TAXONOMY_FIXTURES
+
+
+class CreateSpeciesPagesTestCase(TestCase):
+    """A test case for the create_species_pages command."""
+
+    fixtures = TAXONOMY_FIXTURES
+
+    def create_species(self, count):
+        """Creates some species in the first genus."""
+
+        genus = Genus.objects.first()
+        Species.objects.bulk_create(
+            [
+                Species(genus=genus, name=f"synthetica{number}", authority="Test")
+                for number in range(count)
+            ]
+        )
+
+    def create_pages(self, *args):
+        """Runs the command and returns the number of queries it ran."""
+
+        with CaptureQueriesContext(connection) as context:
+            call_command("create_species_pages", *args, stdout=StringIO())
+
+        return len(context.captured_queries)
+
+    def test_creates_pages(self):
+        """Ensures a valid page is created under the home page for each species without one."""
+
+        home = Page.objects.get(slug="home")
+        self.create_pages("--batch-size=2")
+
+        pages = SpeciesPage.objects.order_by("path")
+        self.assertEqual(pages.count(), Species.objects.count())
+        self.assertEqual(
+            {page.species_id for page in pages},
+            set(Species.objects.values_list("id", flat=True)),
+        )
+
+        page = pages.get(species__name="polyxenes")
+        self.assertEqual(page.title, "Papilio polyxenes")
+        self.assertEqual(page.url_path, f"{home.url_path}papilio-polyxenes/")
+        self.assertEqual(page.get_parent().specific, home.specific)
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+
+        home.refresh_from_db()
+        self.assertEqual(home.numchild, pages.count())
+        self.assertIn(page, SpeciesPage.objects.search("polyxenes"))
+
+    def test_skips_existing_pages_and_slugs(self):
+        """Ensures species that have pages are skipped, and taken slugs get a suffix."""
+
+        self.create_pages()
+        count = SpeciesPage.objects.count()
+        self.create_pages()
+        self.assertEqual(SpeciesPage.objects.count(), count)
+
+        genus = Species.objects.get(name="polyxenes").genus
+        Species.objects.create(genus=genus, name="polyxenes", authority="Test")
+        self.create_pages()
+
+        self.assertEqual(
+            sorted(
+                SpeciesPage.objects.filter(title="Papilio polyxenes").values_list(
+                    "slug", flat=True
+                )
+            ),
+            ["papilio-polyxenes", "papilio-polyxenes-2"],
+        )
+
+    def test_dry_run(self):
+        """Ensures a dry run doesn't create anything."""
+
+        output = StringIO()
+        call_command("create_species_pages", "--dry-run", stdout=output)
+
+        self.assertFalse(SpeciesPage.objects.exists())
+        self.assertIn(
+            "Would create SpeciesPage for Papilio polyxenes", output.getvalue()
+        )
+
+    def test_query_count(self):
+        """Ensures a batch takes the same number of queries no matter how many pages it has."""
+
+        self.create_species(10)
+        small = self.create_pages("--batch-size=1000")
+
+        self.create_species(100)
+        SpeciesPage.objects.all().delete()
+        large = self.create_pages("--batch-size=1000")
+
+        self.assertEqual(large, small)
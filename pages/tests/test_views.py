@@ -0,0 +1,82 @@
+from django.test import TestCase
+from wagtail.models import Page
+
+from pages.models import SpeciesPage
+from taxonomy.models import Genus, Species, Subspecies
+from taxonomy.tests.test_models import TAXONOMY_FIXTURES
+
+
+class SpeciesPagesAPIViewSetTestCase(TestCase):
+    """A test case for the species pages endpoint."""
+
+    fixtures = TAXONOMY_FIXTURES
+
+    def setUp(self):
+        self.home = Page.objects.get(slug="home")
+        SpeciesPage.bulk_add_for_species(
+            self.home, list(Species.objects.select_related("genus"))
+        )
+
+    def add_pages(self, count):
+        """Creates some species, each with a subspecies, and a page for each species."""
+
+        genera = list(Genus.objects.all())
+        species = Species.objects.bulk_create(
+            [
+                Species(genus=genera[i % 2], name=f"synthetica{i}", authority="Test")
+                for i in range(count)
+            ]
+        )
+        Subspecies.objects.bulk_create(
+            [
+                Subspecies(species=item, name="synthetica", authority="Test")
+                for item in species
+            ]
+        )
+        SpeciesPage.bulk_add_for_species(
+            self.home, list(Species.objects.filter(name__startswith="synthetica"))
+        )
+
+    def test_listing_lineage(self):
+        """Ensures each page is listed with its species' full lineage and subspecies."""
+
+        response = self.client.get("/api/v2/species-pages/")
+        items = {item["title"]: item for item in response.json()["items"]}
+        item = items["Papilio polyxenes"]
+        species = Species.objects.get(name="polyxenes")
+        genus = species.genus
+
+        self.assertEqual(item["species"]["id"], species.id)
+        self.assertEqual(item["genus"]["id"], genus.id)
+        self.assertEqual(item["tribe"]["id"], genus.tribe_id)
+        self.assertEqual(item["subfamily"]["id"], genus.tribe.subfamily_id)
+        self.assertEqual(item["family"]["id"], genus.tribe.subfamily.family_id)
+        self.assertEqual(item["order"]["name"], "Lepidoptera")
+        self.assertEqual(
+            [subspecies["id"] for subspecies in item["subspecies"]],
+            list(species.subspecies.values_list("id", flat=True)),
+        )
+
+    def test_listing_without_species(self):
+        """Ensures a page whose species was deleted is listed with an empty lineage."""
+
+        SpeciesPage.objects.filter(species__name="polyxenes").update(species=None)
+
+        response = self.client.get("/api/v2/species-pages/")
+        items = {item["title"]: item for item in response.json()["items"]}
+
+        self.assertIsNone(items["Papilio polyxenes"]["order"])
+        self.assertIsNone(items["Papilio polyxenes"]["species"])
+        self.assertIsNone(items["Papilio polyxenes"]["subspecies"])
+
+    def test_listing_query_count(self):
+        """Ensures 500 pages are listed in a fixed number of queries."""
+
+        self.add_pages(500)
+
+        # One query for the ETag, one count query, one query for the pages joined to their
+        # species' lineage, and one for the prefetched subspecies
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/v2/species-pages/?limit=1000")
+
+        self.assertEqual(len(response.json()["items"]), SpeciesPage.objects.count())
@@ -1,15 +1,21 @@
 from wagtail.api.v2.views import BaseAPIViewSet
 
+from mixins.views import ConditionalGetMixin, EagerLoadingMixin
 from pages.models import SpeciesPage
 from pages.serializers import SpeciesPageSerializer
 from utils.helpers import get_fields
 
 
-class SpeciesPagesAPIViewSet(BaseAPIViewSet):
-    """A custom API view set for the SpeciesPage model using the SpeciesPageSerializer."""
+class SpeciesPagesAPIViewSet(ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet):
+    """A custom API view set for the SpeciesPage model using the SpeciesPageSerializer.
+
+    Each page's species and its full lineage are joined into the page query, and its subspecies
+    are prefetched, so a listing takes the same number of queries no matter how many pages it has.
+    """
 
     base_serializer_class = SpeciesPageSerializer
     model = SpeciesPage
     queryset = SpeciesPage.objects.all()
     body_fields = get_fields(SpeciesPageSerializer)
     listing_default_fields = get_fields(SpeciesPageSerializer)
+    last_modified_field = "last_published_at"
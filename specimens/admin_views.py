@@ -0,0 +1,138 @@
+import os
+
+from django import forms
+from django.conf import settings
+from django.contrib import messages
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.views.generic import FormView
+from wagtail.admin.views.generic.base import WagtailAdminTemplateMixin
+from wagtail.admin.views.generic.permissions import PermissionCheckedMixin
+from wagtail.admin.widgets.button import Button
+from wagtail.snippets.views.snippets import IndexView
+
+from specimens.imports import IMPORT_FORMATS, SpecimenImport
+
+
+class SpecimenImportForm(forms.Form):
+    """A form for uploading a file of specimen records to import."""
+
+    file = forms.FileField(
+        help_text="A CSV, TSV, or XLSX file with the same columns as an export. Only the usi "
+        "column is required."
+    )
+    dry_run = forms.BooleanField(
+        required=False,
+        initial=True,
+        label="Dry run",
+        help_text="Check the file and report any errors without importing it.",
+    )
+
+    def clean_file(self):
+        """Reads the uploaded file.
+
+        The file is imported during the request, so it can only have up to
+        SPECIMEN_IMPORT_ADMIN_MAX_ROWS rows (5,000 by default, which take a few seconds). Larger
+        files have to be imported with the import_specimens management command.
+
+        Raises:
+            ValidationError: If the file's format is unknown, it can't be read, or it has too many
+                             rows.
+
+        Returns:
+            The uploaded file.
+        """
+
+        file = self.cleaned_data["file"]
+        file_format = os.path.splitext(file.name)[1][1:].lower()
+
+        if file_format not in IMPORT_FORMATS:
+            raise forms.ValidationError(
+                f"Upload a file ending in one of: {', '.join(IMPORT_FORMATS)}."
+            )
+
+        try:
+            self.specimen_import = SpecimenImport.from_file(file, file_format)
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+
+        max_rows = getattr(settings, "SPECIMEN_IMPORT_ADMIN_MAX_ROWS", 5000)
+
+        if len(self.specimen_import.rows) > max_rows:
+            raise forms.ValidationError(
+                f"This file has {len(self.specimen_import.rows):,} rows, but at most "
+                f"{max_rows:,} can be uploaded. Import larger files with the import_specimens "
+                "management command."
+            )
+
+        return file
+
+
+class SpecimenImportView(PermissionCheckedMixin, WagtailAdminTemplateMixin, FormView):
+    """An admin view for importing specimen records from an uploaded file.
+
+    The file is always validated first, and its report is shown if it has errors or it's a dry run.
+    Otherwise the specimen records are imported and the user is sent back to the index.
+    """
+
+    form_class = SpecimenImportForm
+    template_name = "specimens/import_specimens.html"
+    permission_required = "add"
+    page_title = "Import specimen records"
+    header_icon = "upload"
+    index_url_name = None
+    import_url_name = None
+
+    def get_breadcrumbs_items(self):
+        return self.breadcrumbs_items + [
+            {"url": reverse(self.index_url_name), "label": "Specimen Records"},
+            {"url": "", "label": "Import"},
+        ]
+
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(
+            action_url=reverse(self.import_url_name),
+            submit_button_label="Upload",
+            submit_button_active_label="Uploading…",
+            **kwargs,
+        )
+
+    def form_valid(self, form):
+        specimen_import = form.specimen_import
+        dry_run = form.cleaned_data["dry_run"]
+
+        if specimen_import.validate() and not dry_run:
+            count = specimen_import.save()
+            messages.success(self.request, f"Imported {count:,} specimen records.")
+            return redirect(self.index_url_name)
+
+        return self.render_to_response(
+            self.get_context_data(
+                form=form,
+                report=specimen_import.report(dry_run=True),
+                valid=not specimen_import.errors,
+            )
+        )
+
+
+class SpecimenRecordIndexView(IndexView):
+    """The specimen record index, with a button to import specimen records."""
+
+    import_url_name = None
+
+    @cached_property
+    def header_more_buttons(self):
+        buttons = super().header_more_buttons
+
+        if self.permission_policy.user_has_permission(self.request.user, "add"):
+            buttons.append(
+                Button(
+                    "Import",
+                    url=reverse(self.import_url_name),
+                    icon_name="upload",
+                    priority=30,
+                )
+            )
+
+        return buttons
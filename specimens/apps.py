@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SpecimensConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "specimens"
+
+    def ready(self):
+        import specimens.signals  # noqa: F401
@@ -0,0 +1,297 @@
+import csv
+import datetime
+import io
+import uuid
+import zipfile
+from xml.etree import ElementTree
+
+from django.db import models
+from django.db.models import Case, F, Func, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, ExtractMonth, NullIf
+
+from specimens.exports import (
+    EXPORT_CHUNK_SIZE,
+    collector_names,
+    iterate_values,
+    person_name,
+)
+from specimens.models import SpecimenRecord
+
+DWC = "http://rs.tdwg.org/dwc/terms/"
+DC = "http://purl.org/dc/terms/"
+EML = "https://eml.ecoinformatics.org/eml-2.2.0"
+
+# Terms with the same value for every specimen record. They're declared as defaults in meta.xml
+# instead of being repeated in every row of occurrence.txt.
+DEFAULT_TERMS = {
+    f"{DWC}basisOfRecord": "PreservedSpecimen",
+    f"{DWC}kingdom": "Animalia",
+    f"{DWC}phylum": "Arthropoda",
+    f"{DWC}class": "Insecta",
+}
+
+
+def strip_html(field):
+    """Removes the HTML tags from a rich text field in SQL."""
+
+    return Func(
+        F(field),
+        Value("<[^>]*>"),
+        Value(""),
+        Value("g"),
+        function="REGEXP_REPLACE",
+        output_field=models.TextField(),
+    )
+
+
+def join_words(*fields):
+    """Joins some fields with spaces in SQL, skipping nulls and blanks."""
+
+    return NullIf(
+        Func(
+            Value(" "),
+            *[NullIf(F(field), Value("")) for field in fields],
+            function="CONCAT_WS",
+            output_field=models.TextField(),
+        ),
+        Value(""),
+        output_field=models.TextField(),
+    )
+
+
+def lowest_rank(field):
+    """Builds the value of a field from the specimen record's lowest identified taxon in SQL."""
+
+    ranks = reversed(SpecimenRecord.TAXON_RANKS)
+
+    return Coalesce(
+        *[NullIf(F(f"{rank}__{field}"), Value("")) for rank in ranks],
+        output_field=models.TextField(),
+    )
+
+
+def event_date():
+    """Builds a specimen record's collection date as an ISO 8601 date or date range in SQL.
+
+    Partial dates become the range they cover, so a specimen collected in "June 2021" has the event
+    date "2021-06-01/2021-06-30".
+    """
+
+    start = Cast("collected_start", models.TextField())
+    end = Cast("collected_end", models.TextField())
+
+    return Case(
+        When(collected_start__isnull=True, then=None),
+        When(collected_start=F("collected_end"), then=start),
+        default=Concat(start, Value("/"), end, output_field=models.TextField()),
+        output_field=models.TextField(),
+    )
+
+
+def get_occurrence_columns():
+    """Returns the Darwin Core terms of the occurrence file and the values they're read from.
+
+    The first column (occurrenceID) is the archive's core ID.
+
+    Returns:
+        A list of tuples of each term's URI (str) and field path or expression.
+    """
+
+    taxon_rank = Case(
+        *[
+            When(**{f"{rank}__isnull": False}, then=Value(rank))
+            for rank in reversed(SpecimenRecord.TAXON_RANKS)
+        ],
+        default=None,
+        output_field=models.TextField(),
+    )
+
+    return [
+        (f"{DWC}occurrenceID", "usi"),
+        (f"{DWC}catalogNumber", "usi"),
+        (
+            f"{DWC}scientificName",
+            Coalesce(
+                join_words("genus__name", "species__name", "subspecies__name"),
+                lowest_rank("name"),
+                output_field=models.TextField(),
+            ),
+        ),
+        (f"{DWC}scientificNameAuthorship", lowest_rank("authority")),
+        (f"{DWC}taxonRank", taxon_rank),
+        (f"{DWC}order", "order__name"),
+        (f"{DWC}family", "family__name"),
+        (f"{DWC}subfamily", "subfamily__name"),
+        (f"{DWC}tribe", "tribe__name"),
+        (f"{DWC}genus", "genus__name"),
+        (f"{DWC}specificEpithet", "species__name"),
+        (f"{DWC}infraspecificEpithet", "subspecies__name"),
+        (f"{DWC}vernacularName", lowest_rank("common_name")),
+        (f"{DWC}identifiedBy", person_name("determiner")),
+        (f"{DWC}dateIdentified", "determined_year"),
+        (f"{DWC}sex", "sex"),
+        (f"{DWC}lifeStage", "stage"),
+        (f"{DWC}preparations", "preparation"),
+        (f"{DWC}recordedBy", collector_names(" | ")),
+        (f"{DWC}eventDate", event_date()),
+        (f"{DWC}year", "year"),
+        (
+            f"{DWC}month",
+            Case(
+                When(month="", then=None),
+                default=ExtractMonth("collected_start"),
+                output_field=models.IntegerField(),
+            ),
+        ),
+        (f"{DWC}day", "day"),
+        (f"{DWC}samplingProtocol", "method"),
+        (f"{DWC}habitat", strip_html("habitat")),
+        (f"{DWC}country", "country__name"),
+        (f"{DWC}stateProvince", "state__name"),
+        (f"{DWC}county", "county__name"),
+        (f"{DWC}locality", "locality__name"),
+        # The coordinates can be entered in degrees, minutes, and seconds, so the decimal terms
+        # come from their parsed values, and the verbatim terms keep what was entered
+        (f"{DWC}decimalLatitude", "gps__latitude_degrees"),
+        (f"{DWC}decimalLongitude", "gps__longitude_degrees"),
+        (f"{DWC}verbatimLatitude", "gps__latitude"),
+        (f"{DWC}verbatimLongitude", "gps__longitude"),
+        (f"{DWC}verbatimElevation", "gps__elevation"),
+        (f"{DWC}occurrenceRemarks", strip_html("notes")),
+        (
+            f"{DC}modified",
+            Func(
+                F("date_modified"),
+                Value('YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+                function="TO_CHAR",
+                output_field=models.TextField(),
+            ),
+        ),
+    ]
+
+
+def build_meta_xml(columns):
+    """Builds the archive descriptor (meta.xml), which maps the occurrence file's columns to terms.
+
+    Args:
+        columns (list): The occurrence file's columns, from get_occurrence_columns().
+
+    Returns:
+        The XML document as bytes.
+    """
+
+    archive = ElementTree.Element(
+        "archive",
+        {"xmlns": "http://rs.tdwg.org/dwc/text/", "metadata": "eml.xml"},
+    )
+    core = ElementTree.SubElement(
+        archive,
+        "core",
+        {
+            "encoding": "UTF-8",
+            "fieldsTerminatedBy": "\\t",
+            "linesTerminatedBy": "\\n",
+            "fieldsEnclosedBy": '"',
+            "ignoreHeaderLines": "1",
+            "rowType": f"{DWC}Occurrence",
+        },
+    )
+    files = ElementTree.SubElement(core, "files")
+    ElementTree.SubElement(files, "location").text = "occurrence.txt"
+    ElementTree.SubElement(core, "id", {"index": "0"})
+
+    for index, (term, _) in enumerate(columns):
+        ElementTree.SubElement(core, "field", {"index": str(index), "term": term})
+
+    for term, value in DEFAULT_TERMS.items():
+        ElementTree.SubElement(core, "field", {"term": term, "default": value})
+
+    ElementTree.indent(archive)
+    return ElementTree.tostring(archive, encoding="utf-8", xml_declaration=True)
+
+
+def build_eml_xml(title, creator, description="", published=None):
+    """Builds the dataset's metadata document (eml.xml) in Ecological Metadata Language.
+
+    Args:
+        title (str): The dataset's title.
+        creator (str): The name of the person or organization responsible for the dataset.
+        description (str): A paragraph describing the dataset.
+        published (date): The publication date. Defaults to today.
+
+    Returns:
+        The XML document as bytes.
+    """
+
+    published = published or datetime.date.today()
+    eml = ElementTree.Element(
+        "eml:eml",
+        {
+            "xmlns:eml": EML,
+            "packageId": str(uuid.uuid4()),
+            "system": "http://gbif.org",
+            "scope": "system",
+            "xml:lang": "eng",
+        },
+    )
+    dataset = ElementTree.SubElement(eml, "dataset")
+    ElementTree.SubElement(dataset, "title").text = title
+
+    for role in ("creator", "contact"):
+        party = ElementTree.SubElement(dataset, role)
+        ElementTree.SubElement(party, "organizationName").text = creator
+
+    ElementTree.SubElement(dataset, "pubDate").text = published.isoformat()
+    ElementTree.SubElement(dataset, "language").text = "eng"
+    abstract = ElementTree.SubElement(dataset, "abstract")
+    ElementTree.SubElement(abstract, "para").text = description
+
+    ElementTree.indent(eml)
+    return ElementTree.tostring(eml, encoding="utf-8", xml_declaration=True)
+
+
+def write_archive(
+    file, queryset, title, creator, description="", chunk_size=EXPORT_CHUNK_SIZE
+):
+    """Writes a Darwin Core Archive of some specimen records to a file.
+
+    The occurrence file is written into the zip file as its rows are read from the database (in
+    one query, with each specimen record's taxa, places, and people joined in), so memory use stays
+    the same no matter how many specimen records there are.
+
+    Args:
+        file (str or file): The path of the zip file, or a writable binary file object.
+        queryset (QuerySet): The specimen records to include.
+        title (str): The dataset's title.
+        creator (str): The name of the person or organization responsible for the dataset.
+        description (str): A paragraph describing the dataset.
+        chunk_size (int): The number of rows fetched from the database (and compressed) at a time.
+
+    Returns:
+        The number of specimen records written.
+    """
+
+    columns = get_occurrence_columns()
+    count = 0
+
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("occurrence.txt", "w", force_zip64=True) as occurrences:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, delimiter="\t", lineterminator="\n")
+            writer.writerow([term.rsplit("/", 1)[1] for term, _ in columns])
+
+            for row in iterate_values(queryset, columns, chunk_size):
+                writer.writerow(row)
+                count += 1
+
+                if count % chunk_size == 0:
+                    occurrences.write(buffer.getvalue().encode())
+                    buffer.seek(0)
+                    buffer.truncate()
+
+            occurrences.write(buffer.getvalue().encode())
+
+        archive.writestr("meta.xml", build_meta_xml(columns))
+        archive.writestr("eml.xml", build_eml_xml(title, creator, description))
+
+    return count
@@ -0,0 +1,231 @@
+import csv
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import models
+from django.db.models import Case, F, Func, OuterRef, Subquery, Value, When
+from django.db.models.functions import Concat, Left, NullIf
+from django.http import QueryDict
+
+from specimens.filters import SpecimenRecordFilter
+from specimens.models import SpecimenRecord
+
+# The delimiter and content type of each export format
+EXPORT_FORMATS = {
+    "csv": (",", "text/csv"),
+    "tsv": ("\t", "text/tab-separated-values"),
+}
+
+# The number of rows fetched from the database's server-side cursor at a time
+EXPORT_CHUNK_SIZE = 2000
+
+
+def filter_specimen_records(filters):
+    """Filters the specimen records with the specimen records API endpoint's filters.
+
+    Args:
+        filters (list): The filters, as strings in the form NAME=VALUE (such as
+                        "family=Papilionidae").
+
+    Raises:
+        ValueError: If a filter isn't in the form NAME=VALUE or has an invalid value.
+
+    Returns:
+        The filtered specimen records, in USI order.
+    """
+
+    params = QueryDict(mutable=True)
+
+    for value in filters:
+        name, separator, value = value.partition("=")
+        if not separator:
+            raise ValueError(f"Filters must be in the form NAME=VALUE, not {name!r}.")
+        params.appendlist(name, value)
+
+    queryset = SpecimenRecord.objects.order_by("usi_number", "usi", "id")
+    filterset = SpecimenRecordFilter(params, queryset=queryset)
+
+    if not filterset.is_valid():
+        raise ValueError(f"Invalid filters: {filterset.errors.as_text()}")
+
+    return filterset.qs
+
+
+def person_name(relation):
+    """Builds a person's name in the format of Person.collector_name ("M. McCarty Jr.") in SQL.
+
+    Args:
+        relation (str): The lookup path to the person, such as "determiner".
+
+    Returns:
+        An expression, which is null when there's no person.
+    """
+
+    name = Func(
+        Value(" "),
+        Concat(
+            Left(f"{relation}__first_name", 1), Value(". "), f"{relation}__last_name"
+        ),
+        NullIf(F(f"{relation}__suffix"), Value("")),
+        function="CONCAT_WS",
+        output_field=models.TextField(),
+    )
+
+    return Case(When(**{f"{relation}__isnull": True}, then=None), default=name)
+
+
+def collector_names(separator=", "):
+    """Builds the names of a specimen record's collectors (in the format of
+    SpecimenRecord.collectors) in a correlated subquery.
+
+    Args:
+        separator (str): The string between names.
+
+    Returns:
+        A Subquery expression, which is null when there are no collectors.
+    """
+
+    Collector = SpecimenRecord.collector.through
+    names = (
+        Collector.objects.filter(specimenrecord=OuterRef("pk"))
+        .order_by()
+        .values("specimenrecord")
+        .annotate(
+            names=StringAgg(
+                person_name("person"),
+                separator,
+                ordering=("person__last_name", "person__first_name"),
+            )
+        )
+        .values("names")
+    )
+
+    return Subquery(names, output_field=models.TextField())
+
+
+def get_export_columns():
+    """Returns the columns of a specimen record export.
+
+    Every column is a value that the database can compute on its own (the collectors are joined in
+    a correlated subquery), so each row is a single tuple from one query rather than a model
+    instance with its related objects.
+
+    Returns:
+        A list of tuples of each column's header (str) and field path or expression.
+    """
+
+    return [
+        ("usi", "usi"),
+        ("order", "order__name"),
+        ("family", "family__name"),
+        ("subfamily", "subfamily__name"),
+        ("tribe", "tribe__name"),
+        ("genus", "genus__name"),
+        ("species", "species__name"),
+        ("subspecies", "subspecies__name"),
+        ("common_name", "species__common_name"),
+        ("determiner", person_name("determiner")),
+        ("determined_year", "determined_year"),
+        ("sex", "sex"),
+        ("stage", "stage"),
+        ("preparer", person_name("preparer")),
+        ("preparation", "preparation"),
+        ("preparation_date", "preparation_date"),
+        ("labels_printed", "labels_printed"),
+        ("labeled", "labeled"),
+        ("photographed", "photographed"),
+        ("collecting_trip", "collecting_trip__name"),
+        ("country", "country__name"),
+        ("state", "state__name"),
+        ("county", "county__name"),
+        ("locality", "locality__name"),
+        ("range", "locality__range"),
+        ("town", "locality__town"),
+        ("latitude", "gps__latitude"),
+        ("longitude", "gps__longitude"),
+        ("elevation", "gps__elevation"),
+        ("day", "day"),
+        ("month", "month"),
+        ("year", "year"),
+        ("collectors", collector_names()),
+        ("method", "method"),
+        ("weather", "weather"),
+        ("temperature", "temperature"),
+        ("time_of_day", "time_of_day"),
+        ("habitat", "habitat"),
+        ("notes", "notes"),
+    ]
+
+
+def iterate_values(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """Reads the values of some columns for every object in a queryset, in a single query.
+
+    The rows are read with a server-side cursor, chunk_size at a time, so memory use stays the
+    same no matter how many objects there are.
+
+    Args:
+        queryset (QuerySet): The objects to read, in the order they should be read.
+        columns (list): The columns, as tuples of a name and a field path or expression.
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Returns:
+        An iterator of tuples.
+    """
+
+    expressions = {
+        f"export_{index}": column
+        for index, (_, column) in enumerate(columns)
+        if not isinstance(column, str)
+    }
+    fields = [
+        column if isinstance(column, str) else f"export_{index}"
+        for index, (_, column) in enumerate(columns)
+    ]
+
+    return (
+        queryset.annotate(**expressions)
+        .values_list(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Generates the rows of a specimen record export, starting with the header row.
+
+    Args:
+        queryset (QuerySet): The specimen records to export, in the order they should be exported.
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Yields:
+        A tuple of values for each row.
+    """
+
+    columns = get_export_columns()
+
+    yield tuple(header for header, _ in columns)
+    yield from iterate_values(queryset, columns, chunk_size)
+
+
+class Echo:
+    """A file-like object that returns what is written to it instead of storing it, so csv.writer
+    can format rows one at a time."""
+
+    def write(self, value):
+        return value
+
+
+def stream_rows(rows, export_format="csv"):
+    """Formats rows as lines of CSV (or TSV) text, one at a time.
+
+    Args:
+        rows (iterable): The rows to format.
+        export_format (str): A key of EXPORT_FORMATS.
+
+    Yields:
+        A string for each row.
+    """
+
+    delimiter, _ = EXPORT_FORMATS[export_format]
+    writer = csv.writer(Echo(), delimiter=delimiter)
+
+    for row in rows:
+        yield writer.writerow(row)
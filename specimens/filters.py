@@ -1,8 +1,15 @@
 import django_filters as filters
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import Exists, OuterRef, Q
+from wagtail.api.v2.utils import BadRequestError
+
+from geography.filters import CoordinateFilterSet
 from specimens.models import SpecimenRecord
+from taxonomy.models import TaxonClosure
+from utils.helpers import parse_partial_date
 
 
-class SpecimenRecordFilter(filters.FilterSet):
+class SpecimenRecordFilter(CoordinateFilterSet):
     """A filter set for the SpecimenRecord model.
 
     This filter set allows filtering of specimen records based on various fields, including
@@ -10,15 +17,38 @@ class SpecimenRecordFilter(filters.FilterSet):
     attributes such as date, habitat, and notes.
 
     Each filter supports partial matching (case-insensitive) using the 'icontains' lookup
-    expression. This enables flexible querying of specimen records through the API.
+    expression. This enables flexible querying of specimen records through the API. These lookups
+    are backed by trigram indexes on the filtered columns.
+
+    The 'taxon' and 'common_name' filters match a taxon of any rank (from order to subspecies),
+    using the specimen's stored taxon_path and taxon_common_names columns. The 'full_date' filter
+    accepts a whole or partial date (such as "2021", "June 2021", or "26 June 2021") and returns the
+    specimens known to have been collected within it.
+
+    The 'descendants' filter takes a taxon in the form <rank>:<id> (such as "family:3") and returns
+    the specimens identified as that taxon or any taxon within it, using the taxonomy closure table.
+
+    There is also a 'search' filter, which runs a full-text search (using web search syntax, such
+    as quoted phrases and "-" to exclude words) against the specimen's search_vector column.
+
+    The 'bbox', 'near', and 'radius' filters (from CoordinateFilterSet) match the specimen's GPS
+    coordinates against a bounding box or a distance from a point.
 
     Example query parameters:
         - ?family=Papilionidae
         - ?genus=Papilio
         - ?collector_lastname=Smith
         - ?country=USA
+        - ?taxon=Papilionidae&full_date=June 2021
+        - ?descendants=tribe:2
+        - ?search=swallowtail -Papilio
+        - ?near=38.8495,-84.8663&radius=20
     """
 
+    coordinates_prefix = "gps__"
+
+    search = filters.CharFilter(method="filter_search")
+
     order = filters.CharFilter(field_name="order__name", lookup_expr="icontains")
     family = filters.CharFilter(field_name="family__name", lookup_expr="icontains")
     subfamily = filters.CharFilter(
@@ -30,9 +60,10 @@ class SpecimenRecordFilter(filters.FilterSet):
     subspecies = filters.CharFilter(
         field_name="subspecies__name", lookup_expr="icontains"
     )
-    taxon = filters.CharFilter(field_name="taxon__name", lookup_expr="icontains")
+    descendants = filters.CharFilter(method="filter_descendants")
+    taxon = filters.CharFilter(field_name="taxon_path", lookup_expr="icontains")
     common_name = filters.CharFilter(
-        field_name="taxon__common_name", lookup_expr="icontains"
+        field_name="taxon_common_names", lookup_expr="icontains"
     )
 
     determiner_lastname = filters.CharFilter(
@@ -48,10 +79,10 @@ class SpecimenRecordFilter(filters.FilterSet):
         field_name="preparer__first_name", lookup_expr="icontains"
     )
     collector_lastname = filters.CharFilter(
-        field_name="collector__last_name", lookup_expr="icontains"
+        field_name="last_name", method="filter_collector"
     )
     collector_firstname = filters.CharFilter(
-        field_name="collector__first_name", lookup_expr="icontains"
+        field_name="first_name", method="filter_collector"
     )
 
     collecting_trip = filters.CharFilter(
@@ -65,7 +96,7 @@ class SpecimenRecordFilter(filters.FilterSet):
     gps_long = filters.CharFilter(field_name="gps__longitude", lookup_expr="icontains")
     elevation = filters.CharFilter(field_name="gps__elevation", lookup_expr="icontains")
 
-    full_date = filters.CharFilter(field_name="full_date", lookup_expr="icontains")
+    full_date = filters.CharFilter(method="filter_full_date")
     method = filters.CharFilter(field_name="method", lookup_expr="icontains")
     weather = filters.CharFilter(field_name="weather", lookup_expr="icontains")
     temperature = filters.CharFilter(field_name="temperature", lookup_expr="icontains")
@@ -73,6 +104,69 @@ class SpecimenRecordFilter(filters.FilterSet):
     habitat = filters.CharFilter(field_name="habitat", lookup_expr="icontains")
     notes = filters.CharFilter(field_name="notes", lookup_expr="icontains")
 
+    def filter_search(self, queryset, name, value):
+        """Filters specimen records with a full-text search on their search_vector column."""
+
+        query = SearchQuery(value, search_type="websearch", config="english")
+        return queryset.filter(search_vector=query)
+
+    def filter_descendants(self, queryset, name, value):
+        """Filters specimen records to those identified as a taxon or any of its descendants.
+
+        Raises:
+            BadRequestError: If the value isn't a taxon in the form <rank>:<id>.
+        """
+
+        try:
+            rank, pk = TaxonClosure.parse_key(value)
+        except ValueError:
+            raise BadRequestError("descendants must be in the form <rank>:<id>")
+
+        closure = TaxonClosure.descendants(rank, pk, include_self=True)
+        ranks = SpecimenRecord.TAXON_RANKS
+        query = Q()
+
+        # A specimen's taxon is below the requested taxon if any of its own ranks (at the requested
+        # rank or lower) are
+        for specimen_rank in ranks[ranks.index(rank) :]:
+            query |= Q(
+                **{
+                    f"{specimen_rank}__in": closure.filter(
+                        descendant_rank=specimen_rank
+                    ).values("descendant_id")
+                }
+            )
+
+        return queryset.filter(query)
+
+    def filter_collector(self, queryset, name, value):
+        """Filters specimen records by the name of any of their collectors.
+
+        Joining the many-to-many collector table would return a specimen once per matching
+        collector, and removing those duplicates takes a DISTINCT over every selected column. An
+        EXISTS subquery on the collector table matches each specimen only once instead.
+        """
+
+        collectors = SpecimenRecord.collector.through.objects.filter(
+            specimenrecord=OuterRef("pk"), **{f"person__{name}__icontains": value}
+        )
+        return queryset.filter(Exists(collectors))
+
+    def filter_full_date(self, queryset, name, value):
+        """Filters specimen records to those collected within a whole or partial date.
+
+        A specimen only matches if its own (possibly partial) collected date falls entirely within
+        the requested one, so a specimen collected in "2021" doesn't match "June 2021". Values that
+        aren't valid dates match nothing.
+        """
+
+        try:
+            start, end = parse_partial_date(value)
+        except ValueError:
+            return queryset.none()
+
+        return queryset.filter(collected_start__gte=start, collected_end__lte=end)
+
     class Meta:
         model = SpecimenRecord
         fields = [
@@ -104,6 +198,9 @@ class SpecimenRecordFilter(filters.FilterSet):
             "gps_lat",
             "gps_long",
             "elevation",
+            "bbox",
+            "near",
+            "radius",
             "day",
             "month",
             "year",
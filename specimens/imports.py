@@ -0,0 +1,826 @@
+import csv
+import datetime
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Upper
+from openpyxl import load_workbook
+
+from geography.models import CollectingTrip, Country, County, GPS, Locality, State
+from mixins.signals import invalidate_responses
+from specimens.models import Person, SpecimenRecord
+from taxonomy.models import Family, Genus, Order, Species, Subfamily, Subspecies, Tribe
+from utils.helpers import get_date_range
+
+# The file formats that can be imported, and the delimiters of the text formats
+IMPORT_FORMATS = {
+    "csv": ",",
+    "tsv": "\t",
+    "xlsx": None,
+}
+
+# The number of specimen records inserted per query
+IMPORT_BATCH_SIZE = 2000
+
+# The columns an import can have. They're the same as the columns of an export (see
+# specimens.exports), so an export can be imported again. Only "usi" is required.
+IMPORT_COLUMNS = (
+    "usi",
+    "order",
+    "family",
+    "subfamily",
+    "tribe",
+    "genus",
+    "species",
+    "subspecies",
+    # Ignored, since the common name comes from the species
+    "common_name",
+    "determiner",
+    "determined_year",
+    "sex",
+    "stage",
+    "preparer",
+    "preparation",
+    "preparation_date",
+    "labels_printed",
+    "labeled",
+    "photographed",
+    "collecting_trip",
+    "country",
+    "state",
+    "county",
+    "locality",
+    "range",
+    "town",
+    "latitude",
+    "longitude",
+    "elevation",
+    "day",
+    "month",
+    "year",
+    "collectors",
+    "method",
+    "weather",
+    "temperature",
+    "time_of_day",
+    "habitat",
+    "notes",
+)
+
+# The taxa that are looked up by their name alone
+TAXON_MODELS = {
+    "order": Order,
+    "family": Family,
+    "subfamily": Subfamily,
+    "tribe": Tribe,
+    "genus": Genus,
+}
+
+# The columns copied onto each specimen record as they are (once converted by their fields)
+VALUE_COLUMNS = (
+    "determined_year",
+    "sex",
+    "stage",
+    "preparation",
+    "preparation_date",
+    "labels_printed",
+    "labeled",
+    "photographed",
+    "day",
+    "month",
+    "year",
+    "method",
+    "weather",
+    "temperature",
+    "time_of_day",
+    "habitat",
+    "notes",
+)
+
+BOOLEAN_VALUES = {
+    "TRUE": True,
+    "YES": True,
+    "Y": True,
+    "1": True,
+    "FALSE": False,
+    "NO": False,
+    "N": False,
+    "0": False,
+}
+
+
+def normalize(value):
+    """Normalizes a name for looking it up, ignoring case and extra whitespace.
+
+    Args:
+        value (str): The name.
+
+    Returns:
+        The name in uppercase, with its whitespace collapsed.
+    """
+
+    return " ".join((value or "").split()).upper()
+
+
+def cell_text(value):
+    """Converts the value of a spreadsheet cell into the text it would have in a CSV file.
+
+    Args:
+        value: The cell's value, as read by openpyxl.
+
+    Returns:
+        A string, which is empty for an empty cell.
+    """
+
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        return value.date().isoformat()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+
+    return str(value)
+
+
+def read_rows(file, file_format):
+    """Reads the rows of a CSV, TSV, or XLSX file.
+
+    Args:
+        file: A binary file object.
+        file_format (str): A key of IMPORT_FORMATS.
+
+    Raises:
+        ValueError: If the file can't be read.
+
+    Returns:
+        A tuple of the header (a list of column names) and a list of rows (each a list of strings).
+    """
+
+    if file_format == "xlsx":
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except Exception as e:
+            raise ValueError(f"The file isn't a valid XLSX workbook ({e}).")
+
+        rows = [
+            [cell_text(value) for value in row]
+            for row in workbook.worksheets[0].iter_rows(values_only=True)
+        ]
+        workbook.close()
+    else:
+        try:
+            text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+            rows = list(csv.reader(text, delimiter=IMPORT_FORMATS[file_format]))
+        except (UnicodeDecodeError, csv.Error) as e:
+            raise ValueError(f"The file isn't valid UTF-8 {file_format.upper()} ({e}).")
+
+    if not rows:
+        raise ValueError("The file is empty.")
+
+    return [value.strip().lower() for value in rows[0]], rows[1:]
+
+
+def group_pks(pairs):
+    """Builds a lookup dict from pairs of keys and primary keys.
+
+    Every primary key is kept, so that a key shared by more than one object can be reported as
+    ambiguous instead of silently picking one of them.
+
+    Args:
+        pairs (iterable): Tuples of a key and a primary key.
+
+    Returns:
+        A dict mapping each key to a set of primary keys.
+    """
+
+    lookup = {}
+
+    for key, pk in pairs:
+        lookup.setdefault(key, set()).add(pk)
+
+    return lookup
+
+
+class SpecimenImport:
+    """Imports specimen records from the rows of a CSV, TSV, or XLSX file.
+
+    The rows are validated first, in a fixed number of queries no matter how many rows there are.
+    Each related table (taxa, people, collecting trips, countries, states, counties, localities,
+    and GPS coordinates) is queried once for all of the names used in the file, and the names are
+    then resolved from in-memory lookup dicts. Names are matched ignoring case and extra
+    whitespace.
+
+    The valid rows can then be saved with save(), which inserts the specimen records and their
+    collectors in batches. Nothing is saved if any row has an error.
+
+    Example:
+        specimen_import = SpecimenImport(header, rows)
+        specimen_import.validate()
+        if not specimen_import.errors:
+            specimen_import.save()
+
+    Attributes:
+        header (list): The file's column names.
+        rows (list): The file's rows, each a list of strings in the same order as the header.
+        errors (list): Tuples of a row number (counted from the header as row 1, as in a
+                       spreadsheet), a column (or None for the whole file), and an error message.
+        records (list): The unsaved SpecimenRecord object instances of the valid rows.
+        collectors (list): The IDs of each record's collectors.
+    """
+
+    def __init__(self, header, rows):
+        self.header = header
+        self.rows = rows
+        self.errors = []
+        self.records = []
+        self.collectors = []
+
+    @classmethod
+    def from_file(cls, file, file_format):
+        """Reads an import from a CSV, TSV, or XLSX file.
+
+        Args:
+            file: A binary file object.
+            file_format (str): A key of IMPORT_FORMATS.
+
+        Raises:
+            ValueError: If the file can't be read.
+
+        Returns:
+            A SpecimenImport object instance.
+        """
+
+        return cls(*read_rows(file, file_format))
+
+    def add_error(self, row, column, message):
+        """Records an error, and marks the row as invalid."""
+
+        self.errors.append((row["number"] if row else None, column, message))
+
+        if row:
+            row["valid"] = False
+
+    def resolve(self, row, column, lookup, key, name=None):
+        """Looks up a related object's ID, recording an error if it's unknown or ambiguous.
+
+        Args:
+            row (dict): The parsed row.
+            column (str): The column the name came from.
+            lookup (dict): A lookup dict built with group_pks().
+            key: The key to look up.
+            name (str): The name to show in an error message. Defaults to the column's value.
+
+        Returns:
+            The object's ID, or None if it couldn't be resolved.
+        """
+
+        pks = lookup.get(key, ())
+        name = name or row[column]
+
+        if len(pks) == 1:
+            return next(iter(pks))
+
+        if pks:
+            self.add_error(row, column, f"More than one {column} matches {name!r}")
+        else:
+            self.add_error(row, column, f"Unknown {column} {name!r}")
+
+        return None
+
+    def validate(self):
+        """Validates every row and builds the specimen records of the valid ones.
+
+        Returns:
+            True if every row is valid, or False if there are errors.
+        """
+
+        self.errors, self.records, self.collectors = [], [], []
+
+        unknown = sorted(
+            set(self.header) - set(IMPORT_COLUMNS) - {""}, key=self.header.index
+        )
+        if unknown:
+            self.add_error(None, None, f"Unknown columns: {', '.join(unknown)}")
+        if "usi" not in self.header:
+            self.add_error(None, None, "The usi column is required")
+        if self.errors:
+            return False
+
+        rows = self.parse_rows()
+
+        self.check_usis(rows)
+        self.resolve_taxa(rows)
+        self.resolve_people(rows)
+        self.resolve_places(rows)
+        self.build_records(rows)
+
+        # Each check runs over every row, so the errors are sorted to list each row's together
+        self.errors.sort(key=lambda error: error[0] or 0)
+
+        return not self.errors
+
+    def parse_rows(self):
+        """Converts the rows into dicts of their column values, skipping empty rows.
+
+        Returns:
+            A list of dicts, each with the row's number, its values, and whether it's valid.
+        """
+
+        rows = []
+
+        for number, values in enumerate(self.rows, start=2):
+            if not any(value.strip() for value in values):
+                continue
+
+            row = {column: "" for column in IMPORT_COLUMNS}
+            row.update(
+                (column, value.strip())
+                for column, value in zip(self.header, values)
+                if column in row
+            )
+            row.update(number=number, valid=True, values={})
+            rows.append(row)
+
+        return rows
+
+    def check_usis(self, rows):
+        """Checks that every row has a USI that isn't already used, in a single query."""
+
+        usis = {}
+
+        for row in rows:
+            if not row["usi"]:
+                self.add_error(row, "usi", "A USI is required")
+            elif row["usi"] in usis:
+                self.add_error(
+                    row, "usi", f"{row['usi']} repeats row {usis[row['usi']]}"
+                )
+            else:
+                usis[row["usi"]] = row["number"]
+
+        existing = set(
+            SpecimenRecord.objects.filter(usi__in=usis).values_list("usi", flat=True)
+        )
+
+        for row in rows:
+            if row["usi"] in existing and row["valid"]:
+                self.add_error(row, "usi", f"{row['usi']} already exists")
+
+    def resolve_taxa(self, rows):
+        """Resolves each row's taxa, with one query per rank.
+
+        Species are looked up by their genus and name, and subspecies by their genus, species, and
+        name, since those names are only unique within the rank above them.
+        """
+
+        for column, model in TAXON_MODELS.items():
+            names = {normalize(row[column]) for row in rows if row[column]}
+            lookup = group_pks(
+                model.objects.annotate(key=Upper("name"))
+                .filter(key__in=names)
+                .values_list("key", "pk")
+            )
+
+            for row in rows:
+                if row[column]:
+                    row["values"][column] = self.resolve(
+                        row, column, lookup, normalize(row[column])
+                    )
+
+        species_names = {normalize(row["species"]) for row in rows if row["species"]}
+        species = group_pks(
+            ((genus, name), pk)
+            for genus, name, pk in Species.objects.annotate(
+                key=Upper("name"), genus_key=Upper("genus__name")
+            )
+            .filter(key__in=species_names)
+            .values_list("genus_key", "key", "pk")
+        )
+        subspecies_names = {
+            normalize(row["subspecies"]) for row in rows if row["subspecies"]
+        }
+        subspecies = group_pks(
+            ((genus, species_name, name), pk)
+            for genus, species_name, name, pk in Subspecies.objects.annotate(
+                key=Upper("name"),
+                species_key=Upper("species__name"),
+                genus_key=Upper("species__genus__name"),
+            )
+            .filter(key__in=subspecies_names)
+            .values_list("genus_key", "species_key", "key", "pk")
+        )
+
+        for row in rows:
+            genus, name = normalize(row["genus"]), normalize(row["species"])
+            full_name = f"{row['genus']} {row['species']}".strip()
+
+            if row["species"]:
+                row["values"]["species"] = self.resolve(
+                    row, "species", species, (genus, name), full_name
+                )
+            if row["subspecies"]:
+                row["values"]["subspecies"] = self.resolve(
+                    row,
+                    "subspecies",
+                    subspecies,
+                    (genus, name, normalize(row["subspecies"])),
+                    f"{full_name} {row['subspecies']}",
+                )
+
+    def resolve_people(self, rows):
+        """Resolves each row's determiner, preparer, and collectors, in a single query.
+
+        A person can be named by their collector name ("M. McCarty", as in an export) or their
+        full name ("Megan E. McCarty"). Collectors are separated by commas or semicolons.
+        """
+
+        for row in rows:
+            separator = ";" if ";" in row["collectors"] else ","
+            row["collector_names"] = [
+                name.strip()
+                for name in row["collectors"].split(separator)
+                if name.strip()
+            ]
+
+        names = {
+            normalize(name)
+            for row in rows
+            for name in [row["determiner"], row["preparer"], *row["collector_names"]]
+            if name
+        }
+        # Every word of a name could be a last name, which narrows down the people to fetch
+        words = {word.strip(".,") for name in names for word in name.split()}
+        people = Person.objects.annotate(key=Upper("last_name")).filter(key__in=words)
+        lookup = group_pks(
+            (normalize(name), person.pk)
+            for person in people
+            for name in {person.collector_name, person.full_name}
+        )
+
+        for row in rows:
+            for column in ("determiner", "preparer"):
+                if row[column]:
+                    row["values"][column] = self.resolve(
+                        row, column, lookup, normalize(row[column])
+                    )
+
+            row["collector_ids"] = [
+                self.resolve(row, "collectors", lookup, normalize(name), name)
+                for name in row["collector_names"]
+            ]
+
+    def resolve_places(self, rows):
+        """Resolves each row's collecting trip, country, state, county, locality, and GPS
+        coordinates, with one query per table.
+
+        Countries and states can be named by their name or abbreviation. Counties are looked up
+        within the row's state, localities by their name, range, and town within the row's county
+        (or state or country, as in Locality.unique_keys()), and GPS coordinates by their latitude,
+        longitude, and elevation within the row's locality.
+        """
+
+        trip_names = {
+            normalize(row["collecting_trip"]) for row in rows if row["collecting_trip"]
+        }
+        trips = group_pks(
+            CollectingTrip.objects.annotate(key=Upper("name"))
+            .filter(key__in=trip_names)
+            .values_list("key", "pk")
+        )
+
+        for row in rows:
+            if row["collecting_trip"]:
+                row["values"]["collecting_trip"] = self.resolve(
+                    row, "collecting_trip", trips, normalize(row["collecting_trip"])
+                )
+
+        countries = self.lookup_by_name_or_abbr(Country, rows, "country")
+        states = self.lookup_by_name_or_abbr(State, rows, "state")
+
+        for row in rows:
+            for column, lookup in [("country", countries), ("state", states)]:
+                if row[column]:
+                    row["values"][column] = self.resolve(
+                        row, column, lookup, normalize(row[column])
+                    )
+
+        county_keys = {
+            (row["values"].get("state"), normalize(row["county"]))
+            for row in rows
+            if row["county"]
+        }
+        counties = group_pks(
+            ((state, name), pk)
+            for state, name, pk in County.objects.annotate(key=Upper("name"))
+            .filter(
+                key__in={name for _, name in county_keys},
+                state__in={state for state, _ in county_keys if state},
+            )
+            .values_list("state", "key", "pk")
+        )
+
+        for row in rows:
+            if row["county"]:
+                row["values"]["county"] = self.resolve(
+                    row,
+                    "county",
+                    counties,
+                    (row["values"].get("state"), normalize(row["county"])),
+                    f"{row['county']} ({row['state'] or 'no state'})",
+                )
+
+        # Localities repeat from row to row, so each one's key is only worked out once (and all
+        # of them in a single query)
+        row_localities = {}
+
+        for row in rows:
+            if row["locality"] or row["range"] or row["town"]:
+                values = row["values"]
+                # A locality belongs to only its most specific region
+                region = (
+                    {"county_id": values.get("county")}
+                    if row["county"]
+                    else (
+                        {"state_id": values.get("state")}
+                        if row["state"]
+                        else {"country_id": values.get("country")}
+                    )
+                )
+                names = (row["locality"], row["range"], row["town"])
+                key = (*names, *region.items())
+
+                if key not in row_localities:
+                    row_localities[key] = Locality(
+                        name=names[0], range=names[1], town=names[2], **region
+                    )
+
+                row["locality_key"] = key
+
+        locality_keys = dict(
+            zip(row_localities, Locality.unique_keys(row_localities.values()))
+        )
+
+        for row in rows:
+            if "locality_key" in row:
+                row["locality_key"] = locality_keys[row["locality_key"]]
+
+        localities = Locality.find_existing(
+            row["locality_key"] for row in rows if "locality_key" in row
+        )
+        localities = {key: {pk} for key, pk in localities.items()}
+
+        for row in rows:
+            if "locality_key" in row:
+                row["values"]["locality"] = self.resolve(
+                    row,
+                    "locality",
+                    localities,
+                    row["locality_key"],
+                    ", ".join(
+                        filter(None, [row["range"], row["town"], row["locality"]])
+                    ),
+                )
+
+        self.resolve_gps(rows)
+
+    def lookup_by_name_or_abbr(self, model, rows, column):
+        """Builds a lookup dict of the countries or states used in the rows, in a single query.
+
+        Returns:
+            A dict mapping each normalized name and abbreviation to a set of IDs.
+        """
+
+        names = {normalize(row[column]) for row in rows if row[column]}
+        objects = (
+            model.objects.annotate(name_key=Upper("name"), abbr_key=Upper("abbr"))
+            .filter(Q(name_key__in=names) | Q(abbr_key__in=names))
+            .values_list("name_key", "abbr_key", "pk")
+        )
+
+        return group_pks(
+            (key, pk) for name, abbr, pk in objects for key in {name, abbr}
+        )
+
+    def resolve_gps(self, rows):
+        """Resolves each row's GPS coordinates within its locality, in a single query.
+
+        Coordinates are compared as decimal degrees (see GPS.parse_coordinates()), so "38.8495"
+        matches "38.849500".
+        """
+
+        for row in rows:
+            if row["latitude"] or row["longitude"] or row["elevation"]:
+                if "locality_key" not in row:
+                    self.add_error(
+                        row, "locality", "GPS coordinates require a locality"
+                    )
+                if not row["values"].get("locality"):
+                    continue
+
+                row["gps_key"] = (
+                    row["values"]["locality"],
+                    *GPS.parse_coordinates(row["latitude"], row["longitude"]),
+                    normalize(row["elevation"]),
+                )
+
+        locality_ids = {row["gps_key"][0] for row in rows if "gps_key" in row}
+        lookup = group_pks(
+            ((locality, latitude, longitude, normalize(elevation)), pk)
+            for locality, latitude, longitude, elevation, pk in GPS.objects.filter(
+                locality__in=locality_ids
+            ).values_list(
+                "locality", "latitude_degrees", "longitude_degrees", "elevation", "pk"
+            )
+        )
+
+        for row in rows:
+            if "gps_key" in row:
+                name = " ".join(
+                    filter(None, [row["latitude"], row["longitude"], row["elevation"]])
+                )
+                row["values"]["gps"] = self.resolve(
+                    row, "gps", lookup, row["gps_key"], name
+                )
+
+    def build_records(self, rows):
+        """Builds a specimen record for each valid row, validating its values with the model's
+        fields.
+
+        Most values repeat from row to row (such as the sex, stage, and dates), so each distinct
+        value of a column is only converted and validated once.
+        """
+
+        fields = {field.name: field for field in SpecimenRecord._meta.get_fields()}
+        cleaned, date_ranges = {}, {}
+
+        for row in rows:
+            values = {}
+
+            for column in ("usi", *VALUE_COLUMNS):
+                key = (column, row[column])
+
+                if key not in cleaned:
+                    try:
+                        cleaned[key] = self.clean(fields[column], row[column])
+                    except ValidationError as e:
+                        cleaned[key] = e
+
+                if isinstance(cleaned[key], ValidationError):
+                    self.add_error(row, column, " ".join(cleaned[key].messages))
+                else:
+                    values[column] = cleaned[key]
+
+            if not row["valid"]:
+                continue
+
+            record = SpecimenRecord(
+                **values,
+                **{f"{column}_id": pk for column, pk in row["values"].items()},
+            )
+
+            # These are set by SpecimenRecord.save(), which bulk_create() doesn't call
+            record.usi_number = SpecimenRecord.parse_usi_number(record.usi)
+            date = (record.year, record.month, record.day)
+            if date not in date_ranges:
+                date_ranges[date] = get_date_range(*date)
+            record.collected_start, record.collected_end = date_ranges[date]
+
+            self.records.append(record)
+            self.collectors.append(row["collector_ids"])
+
+    @classmethod
+    def clean(cls, field, value):
+        """Converts a column's text with convert() and validates the result with the field.
+
+        Blank values are given the field's default, which doesn't need to be validated.
+
+        Raises:
+            ValidationError: If the value can't be converted or isn't valid.
+
+        Returns:
+            The converted value.
+        """
+
+        converted = cls.convert(field, value)
+
+        return field.clean(converted, None) if value else converted
+
+    @staticmethod
+    def convert(field, value):
+        """Converts a column's text into a value for a specimen record field.
+
+        Choices are matched ignoring case (and months can be abbreviated, as in "Jun"), and
+        booleans can be written as true/false, yes/no, y/n, or 1/0. Blank values become the
+        field's default.
+
+        Raises:
+            ValidationError: If the value can't be converted.
+
+        Returns:
+            The converted value.
+        """
+
+        if not value:
+            return field.get_default() if field.has_default() else None
+
+        if field.choices:
+            for choice, label in field.choices:
+                if normalize(value) in {normalize(choice), normalize(label)}:
+                    return choice
+                if field.name == "month" and normalize(value) == normalize(choice[:3]):
+                    return choice
+
+            choices = ", ".join(choice for choice, _ in field.choices if choice)
+            raise ValidationError(f"{value!r} isn't one of: {choices}")
+
+        if field.get_internal_type() == "BooleanField":
+            if normalize(value) not in BOOLEAN_VALUES:
+                raise ValidationError(f"{value!r} isn't true or false")
+            return BOOLEAN_VALUES[normalize(value)]
+
+        return field.to_python(value)
+
+    @transaction.atomic
+    def save(self, batch_size=IMPORT_BATCH_SIZE):
+        """Saves the validated specimen records and their collectors in a single transaction.
+
+        The records are inserted batch_size at a time, along with their collectors. Their taxon
+        paths and search vectors (which save() would normally set) are then built in one query per
+        batch.
+
+        Args:
+            batch_size (int): The number of records inserted per query.
+
+        Raises:
+            ValueError: If the import hasn't been validated, or has errors.
+
+        Returns:
+            The number of specimen records created.
+        """
+
+        if self.errors or len(self.records) != len(self.rows_with_values()):
+            raise ValueError("Only a validated import without errors can be saved.")
+
+        Collector = SpecimenRecord.collector.through
+
+        for start in range(0, len(self.records), batch_size):
+            batch = SpecimenRecord.objects.bulk_create(
+                self.records[start : start + batch_size]
+            )
+            Collector.objects.bulk_create(
+                [
+                    Collector(specimenrecord_id=record.pk, person_id=person)
+                    for record, people in zip(
+                        batch, self.collectors[start : start + batch_size]
+                    )
+                    for person in dict.fromkeys(people)
+                ]
+            )
+
+            queryset = SpecimenRecord.objects.filter(
+                pk__in=[record.pk for record in batch]
+            )
+            SpecimenRecord.update_stored_names(queryset)
+
+        invalidate_responses(SpecimenRecord)
+
+        return len(self.records)
+
+    def rows_with_values(self):
+        """Returns the rows that aren't empty."""
+
+        return [row for row in self.rows if any(value.strip() for value in row)]
+
+    def report(self, dry_run=False):
+        """Summarizes the validation, for the import command and the admin.
+
+        Args:
+            dry_run (bool): Whether the records won't be saved.
+
+        Returns:
+            A list of lines: a summary, followed by each error.
+        """
+
+        invalid = {row for row, _, _ in self.errors if row}
+        collectors = sum(len(set(people)) for people in self.collectors)
+        lines = [
+            f"Checked {len(self.rows_with_values()):,} rows: {len(self.records):,} valid, "
+            f"{len(invalid):,} with errors."
+        ]
+
+        if not self.errors:
+            verb = "Would create" if dry_run else "Creating"
+            lines.append(
+                f"{verb} {len(self.records):,} specimen records with {collectors:,} "
+                f"collectors."
+            )
+
+        for row, column, message in self.errors:
+            location = f"Row {row}, {column}" if row else "File"
+            lines.append(f"{location}: {message}")
+
+        return lines
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from specimens.darwin_core import write_archive
+from specimens.models import SpecimenRecord
+from utils.benchmarks import create_synthetic_collection, rolled_back
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark building a Darwin Core Archive from a synthetic collection, showing that memory "
+        "use doesn't grow with the number of specimen records. All synthetic data is rolled back "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=1_000_000,
+            help="The number of synthetic specimen records to create (default: 1,000,000)",
+        )
+
+    def handle(self, *args, **options):
+        records = options["records"]
+
+        with rolled_back():
+            create_synthetic_collection(records, log=self.stdout.write)
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            self.stdout.write(
+                f"\n{'Records':>12}{'Time':>10}{'Rows/s':>10}{'Archive':>12}{'Peak memory':>14}"
+            )
+
+            for count in sorted({records // 100, records // 10, records}):
+                seconds, size, peak = self.build(count)
+                self.stdout.write(
+                    f"{count:>12,}{seconds:>8.1f} s{count / seconds:>10,.0f}"
+                    f"{size / 1e6:>9.1f} MB{peak / 1e6:>11.1f} MB"
+                )
+
+    def build(self, count):
+        """Builds an archive of the first `count` specimen records in a temporary file.
+
+        Returns:
+            A tuple of the time taken in seconds, the size of the archive in bytes, and the peak
+            memory allocated by Python while building it in bytes.
+        """
+
+        queryset = SpecimenRecord.objects.order_by("usi_number", "usi", "id")[:count]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dwca.zip")
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            write_archive(path, queryset, title="Benchmark", creator="Benchmark")
+
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            return seconds, os.path.getsize(path), peak
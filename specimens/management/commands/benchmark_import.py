@@ -0,0 +1,117 @@
+import csv
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from specimens.exports import export_rows
+from specimens.imports import IMPORT_BATCH_SIZE, SpecimenImport
+from specimens.models import SpecimenRecord
+from utils.benchmarks import create_synthetic_collection, rolled_back, time_call
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark importing a CSV file of specimen records made from a synthetic collection's "
+        "export, comparing one import of the whole file with importing it row by row. All "
+        "synthetic data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=50_000,
+            help="The number of rows in the imported file (default: 50,000)",
+        )
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=200,
+            help="The number of rows imported row by row, to estimate the time it would take for "
+            "the whole file (default: 200)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="The number of timed runs of reading and validating the file (default: 3)",
+        )
+
+    def handle(self, *args, **options):
+        count, repeat = options["rows"], options["repeat"]
+
+        with rolled_back():
+            # The file's rows repeat the export of a smaller collection, with new USIs
+            records = min(count, 10000)
+            create_synthetic_collection(records, log=self.stdout.write)
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            header, *exported = export_rows(
+                SpecimenRecord.objects.order_by("usi_number")
+            )
+            exported = [
+                ["" if value is None else str(value) for value in row[1:]]
+                for row in exported
+            ]
+            rows = [
+                [f"MEM-{records + 1 + number:07}", *exported[number % records]]
+                for number in range(count)
+            ]
+
+            file = io.StringIO()
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+            data = file.getvalue().encode()
+
+            self.stdout.write(
+                f"\nImporting {count:,} rows ({len(data) / 1e6:.1f} MB of CSV)"
+            )
+            self.stdout.write(f"{'Step':<32}{'Time':>10}{'Rows/s':>10}")
+
+            def read():
+                return SpecimenImport.from_file(io.BytesIO(data), "csv")
+
+            specimen_import = read()
+            self.write_row("Reading the file", time_call(read, repeat) / 1000, count)
+
+            seconds = time_call(specimen_import.validate, repeat) / 1000
+            self.write_row("Validating (a dry run)", seconds, count)
+
+            if specimen_import.errors:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"{len(specimen_import.errors):,} errors, such as: "
+                        f"{specimen_import.errors[0]}"
+                    )
+                )
+                return
+
+            start = time.perf_counter()
+            specimen_import.save(batch_size=IMPORT_BATCH_SIZE)
+            self.write_row("Saving", time.perf_counter() - start, count)
+
+            # Importing the same rows one at a time (validating and saving each one) runs the
+            # same queries once per row, so a sample is enough to estimate the whole file
+            sample = [
+                [f"MEM-{records + 1 + count + number:07}", *row[1:]]
+                for number, row in enumerate(rows[: options["sample"]])
+            ]
+            start = time.perf_counter()
+
+            for row in sample:
+                row_import = SpecimenImport(header, [row])
+                row_import.validate()
+                row_import.save()
+
+            seconds = (time.perf_counter() - start) / len(sample) * count
+            self.write_row("Row by row (estimated)", seconds, count)
+
+    def write_row(self, label, seconds, count):
+        """Writes a row of the results table."""
+
+        self.stdout.write(f"{label:<32}{seconds:>8.2f} s{count / seconds:>10,.0f}")
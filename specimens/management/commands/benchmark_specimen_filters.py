@@ -0,0 +1,92 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import QueryDict
+
+from specimens.filters import SpecimenRecordFilter
+from specimens.models import SpecimenRecord
+from utils.benchmarks import create_synthetic_collection, rolled_back, time_call
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the specimen record filters against a synthetic collection, comparing "
+        "sequential scans with the trigram and full-text indexes. All synthetic data is rolled "
+        "back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--records",
+            type=int,
+            default=500_000,
+            help="The number of synthetic specimen records to create (default: 500,000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="The number of timed runs per filter (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            data = create_synthetic_collection(
+                options["records"], log=self.stdout.write
+            )
+            names, words = data["names"], data["words"]
+
+            self.stdout.write("Building taxon paths and search vectors...")
+            SpecimenRecord.update_taxon_paths()
+            SpecimenRecord.update_search_vectors()
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+            filters = [
+                {"family": names[3][1:6]},
+                {"genus": names[150][1:6]},
+                {"taxon": names[3][1:6]},
+                {"taxon": names[3][1:6], "full_date": "June 2021"},
+                {"collector_lastname": names[3960][1:6]},
+                {"locality": names[2000][:5]},
+                {"habitat": words[10]},
+                {"notes": words[20]},
+                {"search": words[30]},
+            ]
+
+            self.stdout.write(
+                f"\n{'Filter':<44}{'Seq scan':>12}{'Indexed':>12}{'Speedup':>10}"
+            )
+
+            for params in filters:
+                without_indexes = self.time_filter(params, options["repeat"], False)
+                with_indexes = self.time_filter(params, options["repeat"], True)
+                label = ", ".join(f"{key}={value}" for key, value in params.items())
+
+                self.stdout.write(
+                    f"{label:<44}{without_indexes:>9.1f} ms{with_indexes:>9.1f} ms"
+                    f"{without_indexes / with_indexes:>9.1f}x"
+                )
+
+    def time_filter(self, params, repeat, use_indexes):
+        """Times one page of filtered results (plus its count), the way the API fetches it.
+
+        Trigram and full-text (GIN) indexes can only be read with bitmap scans, so turning those
+        off for the transaction gives the sequential scan timings from before the indexes existed.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SET LOCAL enable_bitmapscan = {'on' if use_indexes else 'off'}"
+            )
+
+        query_params = QueryDict(mutable=True)
+        query_params.update(params)
+
+        def run():
+            queryset = SpecimenRecord.objects.order_by("usi_number", "usi", "id")
+            queryset = SpecimenRecordFilter(query_params, queryset=queryset).qs
+            queryset.count()
+            list(queryset[:20])
+
+        return time_call(run, repeat)
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.api.v2.utils import BadRequestError
+
+from specimens.darwin_core import write_archive
+from specimens.exports import EXPORT_CHUNK_SIZE, filter_specimen_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Build a Darwin Core Archive (occurrence.txt, meta.xml, and eml.xml in a zip file) of the "
+        "specimen records, for publishing to GBIF and other aggregators. The occurrence file is "
+        "streamed from the database into the zip file, so memory use stays flat no matter how "
+        "large the collection is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            "-o",
+            default="dwca.zip",
+            help="The zip file to write (default: dwca.zip)",
+        )
+        parser.add_argument(
+            "--title",
+            default=f"{settings.WAGTAIL_SITE_NAME} specimen records",
+            help="The dataset's title",
+        )
+        parser.add_argument(
+            "--creator",
+            default=settings.WAGTAIL_SITE_NAME,
+            help="The person or organization responsible for the dataset",
+        )
+        parser.add_argument(
+            "--description",
+            default="",
+            help="A paragraph describing the dataset",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="A filter from the specimen records API, such as family=Papilionidae (can be "
+            "repeated)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"The number of rows fetched from the database at a time (default: "
+            f"{EXPORT_CHUNK_SIZE:,})",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            queryset = filter_specimen_records(options["filter"])
+        except (ValueError, BadRequestError) as e:
+            raise CommandError(str(e))
+
+        count = write_archive(
+            options["output"],
+            queryset,
+            title=options["title"],
+            creator=options["creator"],
+            description=options["description"],
+            chunk_size=options["chunk_size"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {count:,} specimen records to {options['output']}."
+            )
+        )
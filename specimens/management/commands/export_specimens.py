@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.api.v2.utils import BadRequestError
+
+from specimens.exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    export_rows,
+    filter_specimen_records,
+    stream_rows,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Export specimen records as a CSV or TSV file, optionally filtered with the same filters "
+        "as the specimen records API endpoint. Rows are streamed from the database, so memory use "
+        "stays flat no matter how large the collection is."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            "-o",
+            help="The file to write to (default: standard output)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=EXPORT_FORMATS,
+            default="csv",
+            help="The file format (default: csv)",
+        )
+        parser.add_argument(
+            "--filter",
+            action="append",
+            default=[],
+            metavar="NAME=VALUE",
+            help="A filter from the specimen records API, such as family=Papilionidae (can be "
+            "repeated)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"The number of rows fetched from the database at a time (default: "
+            f"{EXPORT_CHUNK_SIZE:,})",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            queryset = filter_specimen_records(options["filter"])
+        except (ValueError, BadRequestError) as e:
+            raise CommandError(str(e))
+
+        rows = export_rows(queryset, chunk_size=options["chunk_size"])
+        lines = stream_rows(rows, options["format"])
+        # The first line is the header
+        count = -1
+
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as output:
+                for count, line in enumerate(lines):
+                    output.write(line)
+        else:
+            for count, line in enumerate(lines):
+                self.stdout.write(line, ending="")
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {count:,} specimen records."))
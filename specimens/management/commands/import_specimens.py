@@ -0,0 +1,65 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from specimens.imports import IMPORT_BATCH_SIZE, IMPORT_FORMATS, SpecimenImport
+
+
+class Command(BaseCommand):
+    help = (
+        "Import specimen records from a CSV, TSV, or XLSX file with the same columns as an export. "
+        "The taxa, people, and places in the file are looked up by name with one query per "
+        "table, and the records are inserted in batches. Nothing is imported if any row has an "
+        "error."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="The file to import")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="The file format (default: the file's extension)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file and report any errors without importing it",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help=f"The number of specimen records inserted per query (default: "
+            f"{IMPORT_BATCH_SIZE:,})",
+        )
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or os.path.splitext(options["path"])[1][1:]
+
+        if file_format.lower() not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Unknown file format {file_format!r}. Use --format to choose one of: "
+                f"{', '.join(IMPORT_FORMATS)}."
+            )
+
+        try:
+            with open(options["path"], "rb") as file:
+                specimen_import = SpecimenImport.from_file(file, file_format.lower())
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        valid = specimen_import.validate()
+
+        for line in specimen_import.report(dry_run=options["dry_run"]):
+            self.stderr.write(line)
+
+        if not valid:
+            raise CommandError(
+                "No specimen records were imported. Fix the errors above and try again."
+            )
+
+        if not options["dry_run"]:
+            count = specimen_import.save(batch_size=options["batch_size"])
+            self.stderr.write(
+                self.style.SUCCESS(f"Imported {count:,} specimen records.")
+            )
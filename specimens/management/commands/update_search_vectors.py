@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from specimens.models import SpecimenRecord
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the taxon paths and full-text search vector of every SpecimenRecord (for "
+        "example, after bulk loading records or renaming a locality)."
+    )
+
+    def handle(self, *args, **kwargs):
+        updated = SpecimenRecord.update_stored_names()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated search vectors for {updated} specimen records."
+            )
+        )
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0012_alter_county_state_alter_gps_locality_and_more"),
+        ("specimens", "0005_alter_specimenrecord_collecting_trip_and_more"),
+        ("taxonomy", "0016_alter_family_order_alter_genus_tribe_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="specimenrecord",
+            options={"ordering": ["usi_number", "usi"]},
+        ),
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="usi_number",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="The numeric part of the USI (set automatically)",
+            ),
+        ),
+        # Backfill the numeric part of every existing USI (the same rule as
+        # SpecimenRecord.parse_usi_number). Numbers too long for an integer are left at 0 and
+        # filled in by 0009, once the column is a big integer.
+        migrations.RunSQL(
+            sql=r"""
+                UPDATE specimens_specimenrecord
+                SET usi_number = COALESCE(SUBSTRING(usi FROM '(\d+)$')::integer, 0)
+                WHERE usi !~ '\d{10,}$'
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=models.Index(
+                fields=["usi_number", "usi", "id"], name="specimens_usi_sort_idx"
+            ),
+        ),
+    ]
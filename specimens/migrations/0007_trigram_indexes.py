@@ -0,0 +1,164 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:13
+
+import functools
+import operator
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+# A snapshot of SpecimenRecord.SEARCH_FIELDS at the time of this migration
+SEARCH_FIELDS = {
+    "A": (
+        "usi",
+        "order__name",
+        "order__common_name",
+        "family__name",
+        "family__common_name",
+        "subfamily__name",
+        "subfamily__common_name",
+        "tribe__name",
+        "tribe__common_name",
+        "genus__name",
+        "genus__common_name",
+        "species__name",
+        "species__common_name",
+        "subspecies__name",
+        "subspecies__common_name",
+    ),
+    "B": (
+        "collecting_trip__name",
+        "country__name",
+        "state__name",
+        "county__name",
+        "locality__name",
+        "locality__town",
+    ),
+    "C": ("method", "weather", "time_of_day", "habitat", "notes"),
+}
+
+
+def backfill_search_vectors(apps, schema_editor):
+    SpecimenRecord = apps.get_model("specimens", "SpecimenRecord")
+
+    vector = functools.reduce(
+        operator.add,
+        [
+            SearchVector(*fields, weight=weight, config="english")
+            for weight, fields in SEARCH_FIELDS.items()
+        ],
+    )
+    document = (
+        SpecimenRecord.objects.filter(pk=OuterRef("pk"))
+        .order_by()
+        .annotate(document=vector)
+        .values("document")
+    )
+    SpecimenRecord.objects.update(search_vector=Subquery(document))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0013_trigram_indexes"),
+        ("specimens", "0006_specimenrecord_usi_number"),
+        ("taxonomy", "0017_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_person_first_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_person_last_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="specimens_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("method"), name="gin_trgm_ops"
+                ),
+                name="specimens_method_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("weather"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_weather_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("temperature"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_temperature_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("time_of_day"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_time_of_day_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("habitat"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_habitat_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("notes"), name="gin_trgm_ops"
+                ),
+                name="specimens_notes_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,153 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:34
+
+import calendar
+import datetime
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import NullIf
+
+TAXON_RANKS = (
+    "order",
+    "family",
+    "subfamily",
+    "tribe",
+    "genus",
+    "species",
+    "subspecies",
+)
+
+
+def get_date_range(year, month="", day=None):
+    """A frozen copy of utils.helpers.get_date_range(), as it was when this migration was written,
+    so later changes to the helper don't change what this migration does."""
+
+    if not year:
+        return None, None
+
+    months = list(calendar.month_name)
+
+    if month not in months[1:]:
+        return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+
+    month_number = months.index(month)
+
+    if day:
+        try:
+            date = datetime.date(year, month_number, day)
+            return date, date
+        except ValueError:
+            pass
+
+    last_day = calendar.monthrange(year, month_number)[1]
+    return datetime.date(year, month_number, 1), datetime.date(
+        year, month_number, last_day
+    )
+
+
+def backfill_computed_fields(apps, schema_editor):
+    SpecimenRecord = apps.get_model("specimens", "SpecimenRecord")
+
+    def join_names(separator, field):
+        names = [NullIf(F(f"{rank}__{field}"), Value("")) for rank in TAXON_RANKS]
+        return Func(
+            Value(separator),
+            *names,
+            function="CONCAT_WS",
+            output_field=models.TextField(),
+        )
+
+    taxa = SpecimenRecord.objects.filter(pk=OuterRef("pk")).order_by()
+    SpecimenRecord.objects.update(
+        taxon_path=Subquery(taxa.annotate(path=join_names(" ", "name")).values("path")),
+        taxon_common_names=Subquery(
+            taxa.annotate(names=join_names(" | ", "common_name")).values("names")
+        ),
+    )
+
+    specimens = list(SpecimenRecord.objects.only("day", "month", "year"))
+    for specimen in specimens:
+        specimen.collected_start, specimen.collected_end = get_date_range(
+            specimen.year, specimen.month, specimen.day
+        )
+    SpecimenRecord.objects.bulk_update(
+        specimens, ["collected_start", "collected_end"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("geography", "0013_trigram_indexes"),
+        ("specimens", "0007_trigram_indexes"),
+        ("taxonomy", "0017_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="collected_end",
+            field=models.DateField(
+                editable=False,
+                help_text="The last possible collection date (set automatically)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="collected_start",
+            field=models.DateField(
+                editable=False,
+                help_text="The first possible collection date (set automatically)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="taxon_common_names",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="The common names of the specimen's taxa (set automatically)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="specimenrecord",
+            name="taxon_path",
+            field=models.TextField(
+                default="",
+                editable=False,
+                help_text="The scientific names of the specimen's taxa (set automatically)",
+            ),
+        ),
+        migrations.RunPython(backfill_computed_fields, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=models.Index(
+                fields=["collected_start", "collected_end"],
+                name="specimens_collected_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("taxon_path"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_taxon_path_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specimenrecord",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("taxon_common_names"),
+                    name="gin_trgm_ops",
+                ),
+                name="specimens_taxon_common_trgm",
+            ),
+        ),
+    ]
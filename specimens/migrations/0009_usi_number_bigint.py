@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("specimens", "0008_taxon_path_and_collected_dates"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="specimenrecord",
+            name="usi_number",
+            field=models.PositiveBigIntegerField(
+                default=0,
+                editable=False,
+                help_text="The numeric part of the USI (set automatically)",
+            ),
+        ),
+        # Fill in the USIs whose numbers were too long for 0006's integer column
+        migrations.RunSQL(
+            sql=r"""
+                UPDATE specimens_specimenrecord
+                SET usi_number = SUBSTRING(usi FROM '(\d+)$')::bigint
+                WHERE usi ~ '\d{10,}$'
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
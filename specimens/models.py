@@ -1,12 +1,20 @@
 import datetime
+import functools
+import operator
+import re
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import F, Func, OuterRef, Subquery, Value
+from django.db.models.functions import NullIf, Upper
 from wagtail.fields import RichTextField
 
 from geography.models import CollectingTrip, Country, County, GPS, Locality, State
 from mixins.models import TimeStampMixin
 from taxonomy.models import Genus, Family, Order, Species, Subfamily, Subspecies, Tribe
+from utils.helpers import get_date_range
 from utils.insect_attributes import Sex, Stage
 
 
@@ -47,6 +55,16 @@ class Person(TimeStampMixin):
 
     class Meta:
         ordering = ["last_name", "first_name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="specimens_person_first_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("last_name"), name="gin_trgm_ops"),
+                name="specimens_person_last_trgm",
+            ),
+        ]
         verbose_name_plural = "People"
 
     def __str__(self):
@@ -93,6 +111,9 @@ class SpecimenRecord(TimeStampMixin):
         usi (str): The Unique Specimen Identifier (USI) number. I am setting it as my initials \
                    followed by a dash and a number (which I increment with each specimen added to \
                    the collection).
+        usi_number (int): The numeric part of the USI, stored so that specimens can be sorted in \
+                          natural order (MEM-9 before MEM-10) using an index. It is set \
+                          automatically when the specimen is saved.
         order (Order): The order to which the specimen belongs.
         family (Family): The family to which the specimen belongs.
         subfamily (Subfamily): The subfamily to which the specimen belongs.
@@ -129,6 +150,22 @@ class SpecimenRecord(TimeStampMixin):
         time_of_day (str): The time of day (or night) the specimen was captured.
         habitat (str): The habitat details of where the specimen was captured.
         notes (str): Any additional notes about the specimen.
+        taxon_path (str): The scientific names of the specimen's taxa, from order to subspecies \
+                          (such as "Lepidoptera Papilionidae ... Papilio polyxenes asterius"), \
+                          so that the specimen can be filtered by a taxon of any rank. It is \
+                          updated automatically when the specimen or its taxa are saved.
+        taxon_common_names (str): The common names of the specimen's taxa, from order to \
+                                  subspecies, separated by " | ". It is updated along with \
+                                  taxon_path.
+        collected_start (date): The first date on which the specimen could have been collected, \
+                                based on the day, month, and year fields (1 June 2021 for a \
+                                specimen collected in "June 2021"). It is set automatically.
+        collected_end (date): The last date on which the specimen could have been collected (30 \
+                              June 2021 for a specimen collected in "June 2021"). It is set \
+                              automatically.
+        search_vector (SearchVector): A full-text search document built from the specimen's text \
+                                      fields and the names of its related taxa and places. It is \
+                                      updated automatically when the specimen is saved.
         date_created (datetime): The date when the object instance was created. Inherited from \
                                  TimeStampMixin.
         date_modified (datetime): The date when the object instance was last modified. Inherited \
@@ -141,6 +178,12 @@ class SpecimenRecord(TimeStampMixin):
         verbose_name="Unique Specimen Identifier",
         help_text="Enter the specimen's unique identifier number",
     )
+    # A big integer, since the USI can be up to 15 digits long
+    usi_number = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        help_text="The numeric part of the USI (set automatically)",
+    )
 
     # Taxonomy fields
     order = models.ForeignKey(
@@ -393,9 +436,113 @@ class SpecimenRecord(TimeStampMixin):
     notes = RichTextField(
         default="", blank=True, help_text="Enter any other notes about the specimen"
     )
+    taxon_path = models.TextField(
+        default="",
+        editable=False,
+        help_text="The scientific names of the specimen's taxa (set automatically)",
+    )
+    taxon_common_names = models.TextField(
+        default="",
+        editable=False,
+        help_text="The common names of the specimen's taxa (set automatically)",
+    )
+    collected_start = models.DateField(
+        null=True,
+        editable=False,
+        help_text="The first possible collection date (set automatically)",
+    )
+    collected_end = models.DateField(
+        null=True,
+        editable=False,
+        help_text="The last possible collection date (set automatically)",
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # The taxonomy fields, from the highest rank to the lowest
+    TAXON_RANKS = (
+        "order",
+        "family",
+        "subfamily",
+        "tribe",
+        "genus",
+        "species",
+        "subspecies",
+    )
+
+    # The fields that make up the search_vector column, grouped by their search weight
+    SEARCH_FIELDS = {
+        "A": (
+            "usi",
+            "order__name",
+            "order__common_name",
+            "family__name",
+            "family__common_name",
+            "subfamily__name",
+            "subfamily__common_name",
+            "tribe__name",
+            "tribe__common_name",
+            "genus__name",
+            "genus__common_name",
+            "species__name",
+            "species__common_name",
+            "subspecies__name",
+            "subspecies__common_name",
+        ),
+        "B": (
+            "collecting_trip__name",
+            "country__name",
+            "state__name",
+            "county__name",
+            "locality__name",
+            "locality__town",
+        ),
+        "C": ("method", "weather", "time_of_day", "habitat", "notes"),
+    }
 
     class Meta:
-        ordering = ["usi"]
+        ordering = ["usi_number", "usi"]
+        indexes = [
+            models.Index(
+                fields=["usi_number", "usi", "id"], name="specimens_usi_sort_idx"
+            ),
+            models.Index(
+                fields=["collected_start", "collected_end"],
+                name="specimens_collected_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="specimens_search_vector_idx"),
+            GinIndex(
+                OpClass(Upper("taxon_path"), name="gin_trgm_ops"),
+                name="specimens_taxon_path_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("taxon_common_names"), name="gin_trgm_ops"),
+                name="specimens_taxon_common_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("method"), name="gin_trgm_ops"),
+                name="specimens_method_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("weather"), name="gin_trgm_ops"),
+                name="specimens_weather_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("temperature"), name="gin_trgm_ops"),
+                name="specimens_temperature_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("time_of_day"), name="gin_trgm_ops"),
+                name="specimens_time_of_day_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("habitat"), name="gin_trgm_ops"),
+                name="specimens_habitat_trgm",
+            ),
+            GinIndex(
+                OpClass(Upper("notes"), name="gin_trgm_ops"),
+                name="specimens_notes_trgm",
+            ),
+        ]
 
     def __str__(self):
         """Returns a string representation of a SpecimenRecord object instance.
@@ -405,6 +552,147 @@ class SpecimenRecord(TimeStampMixin):
         """
         return self.usi
 
+    def save(self, *args, **kwargs):
+        """Modifies the default Django save() method to keep usi_number, the collected date range,
+        taxon_path, and search_vector in sync with the rest of the specimen's fields."""
+
+        self.usi_number = self.parse_usi_number(self.usi)
+        self.collected_start, self.collected_end = get_date_range(
+            self.year, self.month, self.day
+        )
+        super().save(*args, **kwargs)
+
+        SpecimenRecord.update_stored_names(SpecimenRecord.objects.filter(pk=self.pk))
+
+    @classmethod
+    def update_taxon_paths(cls, queryset=None):
+        """Rebuilds the taxon_path and taxon_common_names columns for a set of specimen records.
+
+        Like update_search_vectors(), the names are joined in correlated subqueries, so all of the
+        specimen records are updated in a single query.
+
+        Args:
+            queryset (QuerySet): The specimen records to update. Defaults to all of them.
+
+        Returns:
+            The number of specimen records updated.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        return queryset.update(**cls.taxon_path_values())
+
+    @classmethod
+    def update_search_vectors(cls, queryset=None):
+        """Rebuilds the search_vector column for a set of specimen records in a single query.
+
+        The names of related taxa and places can't be referenced directly in an UPDATE statement,
+        so each row's search document is built in a correlated subquery instead.
+
+        Args:
+            queryset (QuerySet): The specimen records to update. Defaults to all of them.
+
+        Returns:
+            The number of specimen records updated.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        return queryset.update(**cls.search_vector_values())
+
+    @classmethod
+    def update_stored_names(cls, queryset=None):
+        """Rebuilds the taxon_path, taxon_common_names, and search_vector columns for a set of
+        specimen records in a single query.
+
+        This is the same as calling update_taxon_paths() and update_search_vectors(), but each
+        row (and each of its trigram indexes) is only rewritten once, which roughly halves the time
+        it takes to update many specimen records.
+
+        Args:
+            queryset (QuerySet): The specimen records to update. Defaults to all of them.
+
+        Returns:
+            The number of specimen records updated.
+        """
+
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        return queryset.update(**cls.taxon_path_values(), **cls.search_vector_values())
+
+    @classmethod
+    def taxon_path_values(cls):
+        """Builds the expressions that join the names of each specimen record's taxa.
+
+        Returns:
+            A dict of update() arguments for the taxon_path and taxon_common_names columns.
+        """
+
+        def join_names(separator, field):
+            # CONCAT_WS skips nulls, which covers both missing ranks and missing common names
+            names = [
+                NullIf(F(f"{rank}__{field}"), Value("")) for rank in cls.TAXON_RANKS
+            ]
+            return Func(
+                Value(separator),
+                *names,
+                function="CONCAT_WS",
+                output_field=models.TextField(),
+            )
+
+        taxa = cls.objects.filter(pk=OuterRef("pk")).order_by()
+
+        return {
+            "taxon_path": Subquery(
+                taxa.annotate(path=join_names(" ", "name")).values("path")
+            ),
+            "taxon_common_names": Subquery(
+                taxa.annotate(names=join_names(" | ", "common_name")).values("names")
+            ),
+        }
+
+    @classmethod
+    def search_vector_values(cls):
+        """Builds the expression of each specimen record's search document.
+
+        Returns:
+            A dict of update() arguments for the search_vector column.
+        """
+
+        vector = functools.reduce(
+            operator.add,
+            [
+                SearchVector(*fields, weight=weight, config="english")
+                for weight, fields in cls.SEARCH_FIELDS.items()
+            ],
+        )
+        document = (
+            cls.objects.filter(pk=OuterRef("pk"))
+            .order_by()
+            .annotate(document=vector)
+            .values("document")
+        )
+
+        return {"search_vector": Subquery(document)}
+
+    @staticmethod
+    def parse_usi_number(usi):
+        """Extracts the number at the end of a USI.
+
+        Args:
+            usi (str): A Unique Specimen Identifier, such as "MEM-000010".
+
+        Returns:
+            The trailing number as an integer (10 for "MEM-000010"), or 0 if the USI doesn't end in
+            a number.
+        """
+
+        match = re.search(r"(\d+)$", usi or "")
+        return int(match.group(1)) if match else 0
+
     @property
     def identified(self):
         """A boolean representing whether or not a specimen is identified to species."""
@@ -69,6 +69,20 @@ class SpecimenRecordSerializer(serializers.ModelSerializer):
 
     taxon = serializers.SerializerMethodField()
 
+    related_lookups = {
+        "identified": ("species",),
+        "collectors": ("collector",),
+        "taxon": (
+            "order",
+            "family",
+            "subfamily",
+            "tribe",
+            "genus",
+            "species__genus",
+            "subspecies__species__genus",
+        ),
+    }
+
     def get_taxon(self, obj):
         """Determine the most specific taxon field."""
         if obj.subspecies:
@@ -0,0 +1,60 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from geography.models import CollectingTrip, Country, County, Locality, State
+from specimens.models import SpecimenRecord
+from taxonomy.models import Family, Genus, Order, Species, Subfamily, Subspecies, Tribe
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_save, sender=Family)
+@receiver(post_save, sender=Subfamily)
+@receiver(post_save, sender=Tribe)
+@receiver(post_save, sender=Genus)
+@receiver(post_save, sender=Species)
+@receiver(post_save, sender=Subspecies)
+def update_specimen_taxon_names(sender, instance, created, raw, **kwargs):
+    """Updates the stored taxon names of a taxon's specimen records when the taxon is saved.
+
+    Specimen records store the names of their taxa in their taxon_path, taxon_common_names, and
+    search_vector columns, so renaming a taxon (or changing its common name) must update them.
+    """
+
+    if created or raw:
+        return
+
+    rank = sender._meta.model_name
+    specimens = SpecimenRecord.objects.filter(**{rank: instance})
+
+    SpecimenRecord.update_stored_names(specimens)
+
+
+# The field of a specimen record that refers to each kind of place whose names it stores
+PLACE_FIELDS = {
+    CollectingTrip: "collecting_trip",
+    Country: "country",
+    State: "state",
+    County: "county",
+    Locality: "locality",
+}
+
+
+@receiver(post_save, sender=CollectingTrip)
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=County)
+@receiver(post_save, sender=Locality)
+def update_specimen_place_names(sender, instance, created, raw, **kwargs):
+    """Updates the stored names of a collecting trip's or place's specimen records when it is
+    saved.
+
+    Specimen records store the names of their collecting trip, country, state, county, and locality
+    in their search_vector column, so renaming one of them must update it.
+    """
+
+    if created or raw:
+        return
+
+    specimens = SpecimenRecord.objects.filter(**{PLACE_FIELDS[sender]: instance})
+
+    SpecimenRecord.update_stored_names(specimens)
@@ -0,0 +1,147 @@
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from specimens.darwin_core import write_archive
+from specimens.models import SpecimenRecord
+from specimens.tests.test_views import SPECIMEN_FIXTURES
+
+
+class DarwinCoreArchiveTestCase(TestCase):
+    """A test case for the Darwin Core Archive builder."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def build(self, queryset=None):
+        """Builds an archive in memory and returns it as an open zip file."""
+
+        file = io.BytesIO()
+        queryset = queryset or SpecimenRecord.objects.order_by("usi_number")
+        write_archive(file, queryset, title="Test", creator="Tester")
+
+        return zipfile.ZipFile(file)
+
+    def read_occurrences(self, archive):
+        """Reads the rows of an archive's occurrence file as dicts."""
+
+        with archive.open("occurrence.txt") as file:
+            reader = csv.DictReader(io.TextIOWrapper(file, "utf-8"), delimiter="\t")
+            return list(reader)
+
+    def test_archive_files(self):
+        """Ensures the archive contains the occurrence file, its descriptor, and the metadata."""
+
+        archive = self.build()
+
+        self.assertEqual(
+            sorted(archive.namelist()), ["eml.xml", "meta.xml", "occurrence.txt"]
+        )
+
+        eml = ElementTree.fromstring(archive.read("eml.xml"))
+        self.assertEqual(eml.find("dataset/title").text, "Test")
+
+    def test_meta_xml_matches_occurrences(self):
+        """Ensures every column of the occurrence file is mapped to its term in meta.xml."""
+
+        archive = self.build()
+        namespace = {"dwc": "http://rs.tdwg.org/dwc/text/"}
+        core = ElementTree.fromstring(archive.read("meta.xml")).find(
+            "dwc:core", namespace
+        )
+
+        with archive.open("occurrence.txt") as file:
+            header = file.readline().decode().rstrip("\n").split("\t")
+
+        fields = {
+            int(field.get("index")): field.get("term")
+            for field in core.findall("dwc:field", namespace)
+            if field.get("index") is not None
+        }
+
+        self.assertEqual(
+            [fields[index].rsplit("/", 1)[1] for index in range(len(header))], header
+        )
+        self.assertEqual(core.find("dwc:id", namespace).get("index"), "0")
+
+    def test_occurrences(self):
+        """Ensures each specimen record becomes one occurrence with its taxa, places, and dates."""
+
+        rows = {row["occurrenceID"]: row for row in self.read_occurrences(self.build())}
+
+        self.assertEqual(len(rows), 4)
+        first = rows["MEM-000001"]
+        self.assertEqual(first["scientificName"], "Papilio polyxenes")
+        self.assertEqual(first["taxonRank"], "species")
+        self.assertEqual(first["family"], "Papilionidae")
+        self.assertEqual(first["eventDate"], "2006-06-26")
+        self.assertEqual(first["month"], "6")
+        self.assertEqual(first["recordedBy"], "M. McCarty")
+        self.assertEqual(rows["MEM-000002"]["eventDate"], "2009-05-01/2009-05-31")
+        self.assertNotIn("<", first["habitat"])
+
+    def test_coordinates(self):
+        """Ensures coordinates entered in degrees, minutes, and seconds are exported in decimal
+        degrees, along with the text that was entered."""
+
+        gps = SpecimenRecord.objects.get(usi="MEM-000001").gps
+        gps.latitude = "38°50'58.2\"N"
+        gps.longitude = "84°51'58.8\"W"
+        gps.save()
+
+        row = {row["occurrenceID"]: row for row in self.read_occurrences(self.build())}[
+            "MEM-000001"
+        ]
+
+        self.assertEqual(row["decimalLatitude"], "38.849500")
+        self.assertEqual(row["decimalLongitude"], "-84.866333")
+        self.assertEqual(row["verbatimLatitude"], "38°50'58.2\"N")
+
+    def test_filtered_command(self):
+        """Ensures the build_dwca command writes an archive of the filtered specimen records."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dwca.zip")
+            call_command(
+                "build_dwca",
+                f"--output={path}",
+                "--title=Swallowtails",
+                "--filter=family=Papilionidae",
+                stdout=io.StringIO(),
+            )
+
+            with zipfile.ZipFile(path) as archive:
+                rows = self.read_occurrences(archive)
+                eml = ElementTree.fromstring(archive.read("eml.xml"))
+
+        self.assertEqual(
+            [row["occurrenceID"] for row in rows],
+            ["MEM-000001", "MEM-000002", "MEM-000003"],
+        )
+        self.assertEqual(eml.find("dataset/title").text, "Swallowtails")
+
+    def test_command_invalid_filters(self):
+        """Ensures the build_dwca command reports invalid filters as command errors."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dwca.zip")
+
+            for value in ["descendants=bad", "near=38.8495,-84.8663", "family"]:
+                with self.subTest(value=value), self.assertRaises(CommandError):
+                    call_command(
+                        "build_dwca",
+                        f"--output={path}",
+                        f"--filter={value}",
+                        stdout=io.StringIO(),
+                    )
+
+    def test_single_query(self):
+        """Ensures the occurrence file is read in a single query."""
+
+        with self.assertNumQueries(1):
+            self.build()
@@ -0,0 +1,104 @@
+import csv
+import io
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from specimens.tests.test_views import SPECIMEN_FIXTURES, copy_specimen_records
+
+
+class SpecimenRecordExportTestCase(TestCase):
+    """A test case for the streaming specimen record exports."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def get_rows(self, url):
+        """Requests an export and returns its rows as dicts."""
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        content = b"".join(response.streaming_content).decode()
+        delimiter = "\t" if "/tsv/" in url else ","
+        return list(csv.DictReader(io.StringIO(content), delimiter=delimiter))
+
+    def test_csv_export(self):
+        """Ensures the CSV export contains every specimen record in USI order."""
+
+        response = self.client.get("/api/v2/specimen-records/export/csv/")
+        rows = self.get_rows("/api/v2/specimen-records/export/csv/")
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(
+            'filename="specimen-records.csv"', response["Content-Disposition"]
+        )
+        self.assertEqual(
+            [row["usi"] for row in rows],
+            ["MEM-000001", "MEM-000002", "MEM-000003", "MEM-000004"],
+        )
+        self.assertEqual(rows[0]["species"], "polyxenes")
+        self.assertEqual(rows[0]["common_name"], "Black Swallowtail")
+        self.assertEqual(rows[0]["determiner"], "M. McCarty")
+        self.assertEqual(rows[1]["determiner"], "")
+        self.assertEqual(
+            rows[2]["collectors"], "J. Doe, M. McCarty, P. Smith Jr., T. Williams III"
+        )
+
+    def test_tsv_export_with_filters(self):
+        """Ensures the TSV export takes the same filters as the listing."""
+
+        rows = self.get_rows(
+            "/api/v2/specimen-records/export/tsv/?family=Papilionidae&full_date=2006"
+        )
+
+        self.assertEqual([row["usi"] for row in rows], ["MEM-000001"])
+
+    def test_export_query_count(self):
+        """Ensures the export reads every row (collectors included) in a single query."""
+
+        copy_specimen_records(start=100)
+
+        with self.assertNumQueries(1):
+            rows = self.get_rows("/api/v2/specimen-records/export/csv/")
+
+        self.assertEqual(len(rows), 8)
+
+    def test_export_command(self):
+        """Ensures the export_specimens command writes the same export to a file."""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.tsv")
+            call_command(
+                "export_specimens",
+                "--format=tsv",
+                f"--output={path}",
+                "--filter=taxon=Papilionidae",
+                stderr=io.StringIO(),
+            )
+
+            with open(path, newline="", encoding="utf-8") as file:
+                rows = list(csv.DictReader(file, delimiter="\t"))
+
+        self.assertEqual(
+            [row["usi"] for row in rows], ["MEM-000001", "MEM-000002", "MEM-000003"]
+        )
+        self.assertEqual(
+            rows,
+            self.get_rows("/api/v2/specimen-records/export/tsv/?taxon=Papilionidae"),
+        )
+
+    def test_export_command_invalid_filters(self):
+        """Ensures the export_specimens command reports invalid filters as command errors."""
+
+        for filters in [["descendants=bad"], ["near=38.8495,-84.8663"], ["family"]]:
+            with self.subTest(filters=filters), self.assertRaises(CommandError):
+                call_command(
+                    "export_specimens",
+                    *[f"--filter={value}" for value in filters],
+                    stdout=io.StringIO(),
+                    stderr=io.StringIO(),
+                )
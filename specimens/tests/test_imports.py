@@ -0,0 +1,271 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from openpyxl import Workbook
+
+from specimens.exports import export_rows
+from specimens.imports import SpecimenImport, read_rows
+from specimens.models import SpecimenRecord
+from specimens.tests.test_views import SPECIMEN_FIXTURES
+
+
+def export_fixture_rows(start):
+    """Exports every specimen record as text, with new USIs numbered from start."""
+
+    header, *rows = export_rows(SpecimenRecord.objects.order_by("usi_number"))
+    rows = [["" if value is None else str(value) for value in row] for row in rows]
+
+    for number, row in enumerate(rows, start=start):
+        row[0] = f"MEM-{number:06}"
+
+    return list(header), rows
+
+
+def to_csv(header, rows):
+    """Formats a header and rows as a CSV file."""
+
+    lines = [",".join(f'"{value}"' for value in row) for row in [header, *rows]]
+    return io.BytesIO("\n".join(lines).encode())
+
+
+class SpecimenImportTestCase(TestCase):
+    """A test case for importing specimen records from CSV and XLSX files."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def test_round_trip(self):
+        """Ensures an export can be imported again, creating the same specimen records."""
+
+        header, rows = export_fixture_rows(start=100)
+        specimen_import = SpecimenImport(header, rows)
+
+        self.assertTrue(specimen_import.validate(), specimen_import.errors)
+        self.assertEqual(specimen_import.save(), 4)
+
+        _, originals = export_fixture_rows(start=0)
+        imported = [
+            ["" if value is None else str(value) for value in row[1:]]
+            for row in export_rows(
+                SpecimenRecord.objects.filter(usi_number__gte=100).order_by(
+                    "usi_number"
+                )
+            )
+        ][1:]
+        self.assertEqual(imported, [row[1:] for row in originals[4:]])
+
+        record = SpecimenRecord.objects.get(usi="MEM-000102")
+        self.assertEqual(record.usi_number, 102)
+        self.assertNotEqual(record.taxon_path, "")
+        self.assertIsNotNone(record.search_vector)
+        self.assertEqual(
+            record.collectors, "J. Doe, M. McCarty, P. Smith Jr., T. Williams III"
+        )
+
+    def test_query_count(self):
+        """Ensures validating a file runs the same number of queries no matter how many rows it
+        has."""
+
+        header, rows = export_fixture_rows(start=100)
+        few = SpecimenImport(header, rows[:1])
+        many = SpecimenImport(
+            header,
+            [[f"MEM-{number:06}", *rows[number % 4][1:]] for number in range(200, 360)],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(few.validate())
+        with self.assertNumQueries(len(queries)):
+            self.assertTrue(many.validate())
+
+        # The records, their collectors, and their taxon paths and search vectors, within a
+        # savepoint
+        with self.assertNumQueries(5):
+            many.save(batch_size=200)
+
+        self.assertEqual(SpecimenRecord.objects.count(), 164)
+
+    def test_errors(self):
+        """Ensures every invalid value is reported with its row and column, and nothing is
+        saved."""
+
+        header = [
+            "usi",
+            "genus",
+            "species",
+            "sex",
+            "month",
+            "year",
+            "labeled",
+            "state",
+            "county",
+            "collectors",
+        ]
+        rows = [
+            ["MEM-000001", "", "", "", "", "", "", "", "", ""],
+            ["MEM-000100", "Papilio", "nope", "m", "jun", "2021", "yes", "", "", ""],
+            ["MEM-000100", "", "", "Male", "Jun", "1900", "maybe", "", "", ""],
+            [
+                "MEM-000101",
+                "",
+                "",
+                "",
+                "",
+                "",
+                "",
+                "IN",
+                "Rapides",
+                "M. McCarty; Nobody",
+            ],
+            ["", "", "", "", "", "", "", "", "", ""],
+        ]
+        specimen_import = SpecimenImport(header, rows)
+
+        self.assertFalse(specimen_import.validate())
+        self.assertEqual(
+            specimen_import.errors,
+            [
+                (2, "usi", "MEM-000001 already exists"),
+                (3, "species", "Unknown species 'Papilio nope'"),
+                (3, "sex", "'m' isn't one of: male, female, unknown"),
+                (4, "usi", "MEM-000100 repeats row 3"),
+                (4, "labeled", "'maybe' isn't true or false"),
+                (4, "year", "Ensure this value is greater than or equal to 2005."),
+                (5, "collectors", "Unknown collectors 'Nobody'"),
+                (5, "county", "Unknown county 'Rapides (IN)'"),
+            ],
+        )
+        self.assertEqual(
+            specimen_import.report(dry_run=True)[:2],
+            [
+                "Checked 4 rows: 0 valid, 4 with errors.",
+                "Row 2, usi: MEM-000001 already exists",
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            specimen_import.save()
+
+    def test_year_validation(self):
+        """Ensures values are validated by the model's fields."""
+
+        specimen_import = SpecimenImport(["usi", "year"], [["MEM-000100", "1900"]])
+
+        self.assertFalse(specimen_import.validate())
+        self.assertEqual(
+            specimen_import.errors,
+            [(2, "year", "Ensure this value is greater than or equal to 2005.")],
+        )
+
+    def test_unknown_columns(self):
+        """Ensures a file with unknown columns or without a USI column is rejected."""
+
+        specimen_import = SpecimenImport(["species", "wingspan"], [["polyxenes", "8"]])
+
+        self.assertFalse(specimen_import.validate())
+        self.assertEqual(
+            specimen_import.errors,
+            [
+                (None, None, "Unknown columns: wingspan"),
+                (None, None, "The usi column is required"),
+            ],
+        )
+
+    def test_read_xlsx(self):
+        """Ensures the first sheet of a workbook is read as text, like a CSV file."""
+
+        workbook = Workbook()
+        workbook.active.append(["USI", "Year", "Latitude", "Labeled"])
+        workbook.active.append(["MEM-000100", 2021, 38.8495, True])
+        file = io.BytesIO()
+        workbook.save(file)
+        file.seek(0)
+
+        self.assertEqual(
+            read_rows(file, "xlsx"),
+            (
+                ["usi", "year", "latitude", "labeled"],
+                [["MEM-000100", "2021", "38.8495", "True"]],
+            ),
+        )
+
+    def test_import_command(self):
+        """Ensures the import_specimens command validates a file, and only imports it when every
+        row is valid and it isn't a dry run."""
+
+        header, rows = export_fixture_rows(start=100)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "specimens.csv")
+
+            with open(path, "wb") as file:
+                file.write(to_csv(header, rows).getvalue())
+
+            stderr = io.StringIO()
+            call_command("import_specimens", path, "--dry-run", stderr=stderr)
+            self.assertIn("Would create 4 specimen records", stderr.getvalue())
+            self.assertEqual(SpecimenRecord.objects.count(), 4)
+
+            call_command("import_specimens", path, stderr=io.StringIO())
+            self.assertEqual(SpecimenRecord.objects.count(), 8)
+
+            stderr = io.StringIO()
+            with self.assertRaises(CommandError):
+                call_command("import_specimens", path, stderr=stderr)
+            self.assertIn("Row 2, usi: MEM-000100 already exists", stderr.getvalue())
+            self.assertEqual(SpecimenRecord.objects.count(), 8)
+
+    def test_import_view(self):
+        """Ensures the admin's import view reports a dry run, and imports a file otherwise."""
+
+        self.client.force_login(
+            get_user_model().objects.create_superuser(
+                "admin", "admin@example.com", "password"
+            )
+        )
+        url = reverse("wagtailsnippets_specimens_specimenrecord:import")
+        header, rows = export_fixture_rows(start=100)
+
+        def upload(name, dry_run):
+            file = SimpleUploadedFile(name, to_csv(header, rows).getvalue())
+            return self.client.post(url, {"file": file, "dry_run": dry_run})
+
+        response = self.client.get(
+            reverse("wagtailsnippets_specimens_specimenrecord:list")
+        )
+        self.assertContains(response, url)
+
+        response = upload("specimens.csv", True)
+        self.assertContains(
+            response, "Would create 4 specimen records with 7 collectors."
+        )
+        self.assertEqual(SpecimenRecord.objects.count(), 4)
+
+        response = upload("specimens.txt", False)
+        self.assertContains(response, "Upload a file ending in one of: csv, tsv, xlsx.")
+
+        response = upload("specimens.csv", False)
+        self.assertRedirects(
+            response, reverse("wagtailsnippets_specimens_specimenrecord:list")
+        )
+        self.assertEqual(SpecimenRecord.objects.count(), 8)
+
+        response = upload("specimens.csv", False)
+        self.assertContains(response, "Row 2, usi: MEM-000100 already exists")
+        self.assertEqual(SpecimenRecord.objects.count(), 8)
+
+        # Files too large to import during the request are sent to the management command
+        with override_settings(SPECIMEN_IMPORT_ADMIN_MAX_ROWS=3):
+            response = upload("specimens.csv", True)
+        self.assertContains(
+            response,
+            "This file has 4 rows, but at most 3 can be uploaded. Import larger files with the "
+            "import_specimens management command.",
+        )
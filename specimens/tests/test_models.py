@@ -1,6 +1,12 @@
+import datetime
+
+from django.contrib.postgres.search import SearchQuery
 from django.test import TestCase
 
+from geography.models import CollectingTrip
 from specimens.models import Person, SpecimenRecord
+from taxonomy.models import Family
+from utils.helpers import parse_partial_date
 
 
 class PersonTestCase(TestCase):
@@ -169,3 +175,149 @@ class SpecimenRecordTestCase(TestCase):
         self.assertEqual(specimen_temp_F_decimal.temp_C, f"29.7{DEGREE_SIGN}C")
         self.assertEqual(specimen_temp_F_integer.temp_C, f"24.4{DEGREE_SIGN}C")
         self.assertEqual(specimen_no_temp.temp_C, "")
+
+    def test_usi_number(self):
+        """Ensures the numeric part of the USI is stored when a specimen is saved."""
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        specimen.usi = "MEM-000123"
+        specimen.save()
+
+        self.assertEqual(SpecimenRecord.objects.get(pk=specimen.pk).usi_number, 123)
+        self.assertEqual(SpecimenRecord.parse_usi_number("MEM-10"), 10)
+        self.assertEqual(SpecimenRecord.parse_usi_number("MEM"), 0)
+
+        # A USI can be entirely digits, which doesn't fit in a 32-bit integer
+        specimen.usi = "123456789012345"
+        specimen.save()
+
+        self.assertEqual(
+            SpecimenRecord.objects.get(pk=specimen.pk).usi_number, 123456789012345
+        )
+
+    def test_ordering(self):
+        """Ensures specimens are sorted by the number in their USI rather than alphabetically."""
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        for usi in ["MEM-10", "MEM-9", "MEM-100"]:
+            specimen.pk = None
+            specimen.usi = usi
+            specimen.save()
+
+        usis = list(
+            SpecimenRecord.objects.filter(
+                usi__in=["MEM-10", "MEM-9", "MEM-100"]
+            ).values_list("usi", flat=True)
+        )
+
+        self.assertEqual(usis, ["MEM-9", "MEM-10", "MEM-100"])
+
+    def test_taxon_path(self):
+        """Ensures the stored taxon names match the specimen's taxa from order to subspecies."""
+
+        SpecimenRecord.objects.update(taxon_path="", taxon_common_names="")
+        SpecimenRecord.update_taxon_paths()
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        order_only = SpecimenRecord.objects.get(usi="MEM-000004")
+
+        self.assertEqual(
+            specimen.taxon_path,
+            "Lepidoptera Papilionidae Papilioninae Papilionini Papilio polyxenes",
+        )
+        self.assertTrue(specimen.taxon_common_names.endswith(" | Black Swallowtail"))
+        self.assertEqual(order_only.taxon_path, "Lepidoptera")
+
+    def test_taxon_path_after_rename(self):
+        """Ensures renaming a taxon updates the stored names of its specimen records."""
+
+        family = Family.objects.get(name="Papilionidae")
+        family.name = "Renamedidae"
+        family.save()
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        self.assertIn(" Renamedidae ", specimen.taxon_path)
+        self.assertEqual(
+            list(
+                SpecimenRecord.objects.filter(
+                    search_vector=SearchQuery("Renamedidae", config="english")
+                )
+            ),
+            list(SpecimenRecord.objects.filter(family=family)),
+        )
+
+    def test_search_after_place_rename(self):
+        """Ensures renaming a collecting trip or place updates the stored names its specimen
+        records are searched by."""
+
+        # None of the fixtures' specimen records were collected on a trip
+        SpecimenRecord.objects.filter(usi="MEM-000001").update(
+            collecting_trip=CollectingTrip.objects.first()
+        )
+        places = {
+            "collecting_trip": "Renamedtrip",
+            "country": "Renamedland",
+            "state": "Renamedstate",
+            "county": "Renamedcounty",
+            "locality": "Renamedlocality",
+        }
+
+        for field, name in places.items():
+            with self.subTest(field=field):
+                specimen = SpecimenRecord.objects.filter(
+                    **{f"{field}__isnull": False}
+                ).first()
+                place = getattr(specimen, field)
+                place.name = name
+                place.save()
+
+                self.assertEqual(
+                    list(
+                        SpecimenRecord.objects.filter(
+                            search_vector=SearchQuery(name, config="english")
+                        )
+                    ),
+                    list(SpecimenRecord.objects.filter(**{field: place})),
+                )
+
+    def test_collected_date_range(self):
+        """Ensures the range of possible collection dates is stored when a specimen is saved."""
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+
+        expected = {
+            (26, "June", 2006): (
+                datetime.date(2006, 6, 26),
+                datetime.date(2006, 6, 26),
+            ),
+            (None, "June", 2006): (
+                datetime.date(2006, 6, 1),
+                datetime.date(2006, 6, 30),
+            ),
+            (31, "June", 2006): (datetime.date(2006, 6, 1), datetime.date(2006, 6, 30)),
+            (None, "", 2006): (datetime.date(2006, 1, 1), datetime.date(2006, 12, 31)),
+            (None, "June", None): (None, None),
+        }
+
+        for (day, month, year), dates in expected.items():
+            specimen.day, specimen.month, specimen.year = day, month, year
+            specimen.save()
+            specimen.refresh_from_db()
+            self.assertEqual((specimen.collected_start, specimen.collected_end), dates)
+
+    def test_parse_partial_date(self):
+        """Ensures the date formats used by specimen records can be parsed into date ranges."""
+
+        june = (datetime.date(2021, 6, 1), datetime.date(2021, 6, 30))
+        day = (datetime.date(2021, 6, 1), datetime.date(2021, 6, 1))
+
+        self.assertEqual(
+            parse_partial_date("2021"),
+            (datetime.date(2021, 1, 1), datetime.date(2021, 12, 31)),
+        )
+        for value in ["June 2021", "jun 2021", "2021-06", " June  2021 "]:
+            self.assertEqual(parse_partial_date(value), june)
+        for value in ["1 June 2021", "1-Jun-2021", "2021-06-01"]:
+            self.assertEqual(parse_partial_date(value), day)
+        with self.assertRaises(ValueError):
+            parse_partial_date("Summer 2021")
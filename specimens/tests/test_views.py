@@ -0,0 +1,425 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from specimens.models import Person, SpecimenRecord
+from taxonomy.models import TaxonClosure
+from utils.pagination import encode_cursor
+
+SPECIMEN_FIXTURES = [
+    "countries.json",
+    "states.json",
+    "counties.json",
+    "localities.json",
+    "gps_coordinates.json",
+    "collecting_trips.json",
+    "orders.json",
+    "families.json",
+    "subfamilies.json",
+    "tribes.json",
+    "genera.json",
+    "species.json",
+    "subspecies.json",
+    "people.json",
+    "specimen_records.json",
+]
+
+
+def copy_specimen_records(start):
+    """Saves a copy of every specimen record (and its collectors) with a new USI."""
+
+    for number, specimen in enumerate(SpecimenRecord.objects.all(), start=start):
+        collectors = list(specimen.collector.all())
+        specimen.pk = None
+        specimen.usi = f"MEM-{number:06}"
+        specimen.save()
+        specimen.collector.set(collectors)
+
+
+class QueryCountTestCase(TestCase):
+    """A base test case for checking that an endpoint's query count doesn't grow with its rows."""
+
+    def count_queries(self, url):
+        """Requests a URL and returns the number of queries it ran."""
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+
+class PeopleAPIViewSetTestCase(QueryCountTestCase):
+    """A test case for the people endpoint."""
+
+    fixtures = ["people.json"]
+
+    def test_listing_query_count(self):
+        """Ensures the listing runs the same number of queries no matter how many people exist."""
+
+        before = self.count_queries("/api/v2/people/")
+        Person.objects.create(first_name="John", last_name="Smith")
+        Person.objects.create(first_name="Mary", last_name="Jones")
+
+        self.assertEqual(self.count_queries("/api/v2/people/"), before)
+
+
+class SpecimenRecordAPIViewSetTestCase(QueryCountTestCase):
+    """A test case for the specimen records endpoint."""
+
+    fixtures = SPECIMEN_FIXTURES
+
+    def test_listing_query_count(self):
+        """Ensures the listing's query count is fixed no matter how many records are returned."""
+
+        url = "/api/v2/specimen-records/?limit=100"
+
+        # One query for the ETag, one count query, one query for the records, and one for the
+        # prefetched collectors
+        self.assertNumQueries(4, self.client.get, url)
+        copy_specimen_records(start=100)
+        copy_specimen_records(start=200)
+        self.assertNumQueries(4, self.client.get, url)
+
+    def test_listing_query_count_with_fields(self):
+        """Ensures only the relations needed by the requested fields are loaded."""
+
+        url = "/api/v2/specimen-records/?fields=_,usi,species,county&limit=100"
+
+        before = self.count_queries(url)
+        copy_specimen_records(start=100)
+
+        self.assertEqual(self.count_queries(url), before)
+        self.assertEqual(before, 3)
+
+    def test_cursor_pagination(self):
+        """Ensures the cursor mode walks every record in USI order, forwards and backwards."""
+
+        copy_specimen_records(start=100)
+        expected = list(
+            SpecimenRecord.objects.order_by("usi_number", "usi", "id").values_list(
+                "usi", flat=True
+            )
+        )
+
+        url = "/api/v2/specimen-records/?fields=_,usi&limit=3&cursor="
+        pages = [self.client.get(url).json()]
+        while pages[-1]["meta"]["next"]:
+            pages.append(self.client.get(url + pages[-1]["meta"]["next"]).json())
+
+        walked = [item["usi"] for page in pages for item in page["items"]]
+        self.assertEqual(walked, expected)
+        self.assertIsNone(pages[0]["meta"]["previous"])
+        self.assertNotIn("total_count", pages[0]["meta"])
+
+        previous = self.client.get(url + pages[-1]["meta"]["previous"]).json()
+        self.assertEqual(previous["items"], pages[-2]["items"])
+        self.assertEqual(previous["meta"]["next"], pages[-2]["meta"]["next"])
+
+    def test_cursor_pagination_query_count(self):
+        """Ensures a cursor page skips the count query and costs the same at any depth."""
+
+        copy_specimen_records(start=100)
+        first = self.client.get("/api/v2/specimen-records/?limit=2&cursor=").json()
+        url = f"/api/v2/specimen-records/?limit=2&cursor={first['meta']['next']}"
+
+        # One query for the ETag, one for the records, and one for the prefetched collectors
+        self.assertNumQueries(3, self.client.get, url)
+
+    def test_cursor_pagination_query_plan(self):
+        """Ensures a cursor page seeks to its position with an index condition on the sort index,
+        rather than filtering out every row before it."""
+
+        copy_specimen_records(start=100)
+        first = self.client.get("/api/v2/specimen-records/?limit=2&cursor=").json()
+        url = f"/api/v2/specimen-records/?limit=2&cursor={first['meta']['next']}"
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(url)
+
+        sql = next(
+            query["sql"]
+            for query in context.captured_queries
+            if "ROW(" in query["sql"] and "LIMIT" in query["sql"]
+        )
+
+        with connection.cursor() as cursor:
+            # The test tables are tiny, so the planner would otherwise scan them
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertIn("specimens_usi_sort_idx", plan)
+        self.assertIn("Index Cond: (ROW(usi_number, (usi)::text, id) >", plan)
+        # Joins to the related tables can have a Join Filter, but no rows are filtered out
+        self.assertNotRegex(plan, r"(?<!Join )Filter:")
+
+    def test_cursor_pagination_invalid_cursor(self):
+        """Ensures a malformed cursor, or one whose position has the wrong types, returns a 400
+        error."""
+
+        for position in [
+            [None, None, None],
+            ["abc", "x", 1],
+            [1, 2, 3],
+            [True, "x", 1],
+        ]:
+            with self.subTest(position=position):
+                response = self.client.get(
+                    f"/api/v2/specimen-records/?cursor={encode_cursor(position)}"
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {"message": "cursor is not valid"})
+
+        response = self.client.get("/api/v2/specimen-records/?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"message": "cursor is not valid"})
+
+    def test_offset_pagination(self):
+        """Ensures the original limit/offset mode still works for existing clients."""
+
+        data = self.client.get("/api/v2/specimen-records/?limit=2&offset=2").json()
+
+        self.assertEqual(data["meta"], {"total_count": 4})
+        self.assertEqual(len(data["items"]), 2)
+
+    def test_search(self):
+        """Ensures the search filter matches specimens on their related taxon and place names."""
+
+        SpecimenRecord.update_search_vectors()
+
+        data = self.client.get("/api/v2/specimen-records/?search=polyxenes").json()
+        usis = [item["usi"] for item in data["items"]]
+
+        self.assertEqual(
+            usis,
+            list(
+                SpecimenRecord.objects.filter(species__name="polyxenes").values_list(
+                    "usi", flat=True
+                )
+            ),
+        )
+        self.assertNotEqual(usis, [])
+
+        data = self.client.get("/api/v2/specimen-records/?search=zzzzz").json()
+        self.assertEqual(data["items"], [])
+
+    def test_taxon_filters(self):
+        """Ensures the taxon and common_name filters match a taxon of any rank."""
+
+        def usis(query):
+            data = self.client.get(f"/api/v2/specimen-records/?fields=_,usi&{query}")
+            return [item["usi"] for item in data.json()["items"]]
+
+        self.assertEqual(
+            usis("taxon=Papilionidae"), ["MEM-000001", "MEM-000002", "MEM-000003"]
+        )
+        self.assertEqual(usis("taxon=Papilio polyxenes"), ["MEM-000001"])
+        self.assertEqual(usis("taxon=Lepidoptera"), usis(""))
+        self.assertEqual(usis("common_name=black swallowtail"), ["MEM-000001"])
+        self.assertEqual(usis("common_name=Parnassians"), ["MEM-000003"])
+
+    def test_full_date_filter(self):
+        """Ensures the full_date filter matches specimens collected within a partial date."""
+
+        def usis(full_date):
+            data = self.client.get(
+                f"/api/v2/specimen-records/?fields=_,usi&full_date={full_date}"
+            )
+            return [item["usi"] for item in data.json()["items"]]
+
+        self.assertEqual(usis("26 June 2006"), ["MEM-000001"])
+        self.assertEqual(usis("June 2006"), ["MEM-000001"])
+        self.assertEqual(usis("2006"), ["MEM-000001"])
+        self.assertEqual(usis("May 2009"), ["MEM-000002"])
+        self.assertEqual(usis("1 May 2009"), [])
+        self.assertEqual(usis("2012-06"), [])
+        self.assertEqual(usis("not a date"), [])
+
+        url = "/api/v2/specimen-records/?taxon=Papilionidae&full_date=June 2006"
+        self.assertEqual(
+            [item["usi"] for item in self.client.get(url).json()["items"]],
+            ["MEM-000001"],
+        )
+
+    def test_coordinate_filters(self):
+        """Ensures the bbox and near filters match specimens by their GPS coordinates."""
+
+        def usis(query):
+            data = self.client.get(f"/api/v2/specimen-records/?fields=_,usi&{query}")
+            return [item["usi"] for item in data.json()["items"]]
+
+        self.assertEqual(usis("bbox=-85,38.5,-84.5,39"), ["MEM-000001"])
+        self.assertEqual(usis("bbox=-84.5,38.5,-84,39"), [])
+        self.assertEqual(usis("near=38.95,-84.87&radius=20"), ["MEM-000001"])
+        self.assertEqual(usis("near=38.95,-84.87&radius=10"), [])
+
+        for query, message in [
+            ("bbox=1,2,3", "bbox must be 4 comma-separated numbers"),
+            ("near=38.95,-84.87", "radius is required with near"),
+            ("radius=10", "near is required with radius"),
+            ("near=38.95,-84.87&radius=-1", "radius must be greater than 0"),
+        ]:
+            response = self.client.get(f"/api/v2/specimen-records/?{query}")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"message": message})
+
+    def test_tile(self):
+        """Ensures a map tile clusters the filtered specimens by their GPS coordinates."""
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        data = self.client.get("/api/v2/specimen-records/tiles/0/0/0/").json()
+
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["bbox"], [-180, -85.051129, 180, 85.051129])
+        self.assertEqual(
+            data["clusters"],
+            [
+                {
+                    "count": 1,
+                    "latitude": 38.8495,
+                    "longitude": -84.866328,
+                    "bbox": [-84.866328, 38.8495, -84.866328, 38.8495],
+                    "id": specimen.pk,
+                }
+            ],
+        )
+
+        # The copies share the same coordinates, so they're clustered together
+        copy_specimen_records(5)
+        data = self.client.get("/api/v2/specimen-records/tiles/1/0/0/").json()
+
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(len(data["clusters"]), 1)
+        self.assertNotIn("id", data["clusters"][0])
+
+        for url in [
+            "/api/v2/specimen-records/tiles/1/1/0/",
+            "/api/v2/specimen-records/tiles/1/0/1/",
+            "/api/v2/specimen-records/tiles/1/0/0/?taxon=Parnassiidae",
+        ]:
+            self.assertEqual(self.client.get(url).json()["clusters"], [])
+
+        response = self.client.get("/api/v2/specimen-records/tiles/1/2/0/")
+        self.assertEqual(response.status_code, 400)
+
+    def test_tile_query_count(self):
+        """Ensures a tile is built in a single query, no matter how many specimens are in it."""
+
+        copy_specimen_records(5)
+
+        with self.assertNumQueries(1):
+            self.client.get("/api/v2/specimen-records/tiles/4/4/6/")
+
+    def get_listing_sql(self, query):
+        """Requests a filtered listing and returns the SQL of the query that fetched its records."""
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                f"/api/v2/specimen-records/?fields=_,usi&{query}"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        return next(
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "specimens_specimenrecord"' in query["sql"]
+            and "LIMIT" in query["sql"]
+        )
+
+    def test_filter_sql_without_collector_filter(self):
+        """Ensures filters on single-valued fields neither join collectors nor use DISTINCT."""
+
+        sql = self.get_listing_sql("family=Papilionidae&habitat=Trifolium")
+
+        self.assertNotIn("DISTINCT", sql)
+        self.assertNotIn("specimens_specimenrecord_collector", sql)
+
+    def test_filter_sql_with_collector_filter(self):
+        """Ensures the collector filters use an EXISTS subquery instead of a join and DISTINCT."""
+
+        sql = self.get_listing_sql(
+            "collector_lastname=McCarty&collector_firstname=Megan"
+        )
+
+        self.assertNotIn("DISTINCT", sql)
+        self.assertEqual(sql.count("EXISTS"), 2)
+        self.assertNotIn(
+            'JOIN "specimens_specimenrecord_collector"', sql.split("EXISTS")[0]
+        )
+
+    def test_collector_filter_returns_each_specimen_once(self):
+        """Ensures a specimen with several matching collectors is only returned once."""
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000001")
+        specimen.collector.set(
+            Person.objects.filter(last_name__in=["Smith", "Williams"])
+        )
+
+        data = self.client.get(
+            "/api/v2/specimen-records/?fields=_,usi&collector_lastname=i"
+        ).json()
+        usis = [item["usi"] for item in data["items"]]
+
+        self.assertEqual(usis.count("MEM-000001"), 1)
+        self.assertEqual(data["meta"]["total_count"], len(usis))
+
+    def test_descendants_filter(self):
+        """Ensures the descendants filter returns the specimens identified within a taxon."""
+
+        TaxonClosure.rebuild()
+
+        def usis(taxon):
+            data = self.client.get(
+                f"/api/v2/specimen-records/?fields=_,usi&descendants={taxon}"
+            )
+            return [item["usi"] for item in data.json()["items"]]
+
+        self.assertEqual(usis("family:1"), ["MEM-000001", "MEM-000002", "MEM-000003"])
+        self.assertEqual(usis("tribe:2"), ["MEM-000001"])
+        self.assertEqual(usis("subfamily:1"), ["MEM-000003"])
+        self.assertEqual(len(usis("order:1")), 4)
+
+        response = self.client.get("/api/v2/specimen-records/?descendants=tribe")
+        self.assertEqual(response.status_code, 400)
+
+    def test_conditional_get(self):
+        """Ensures a listing answers a matching If-None-Match header with a 304 response, using
+        only the query for its ETag."""
+
+        url = "/api/v2/specimen-records/?family=Papilionidae"
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        self.assertNotIn("Last-Modified", response)
+        self.assertIn("max-age=0", response["Cache-Control"])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertNotEqual(
+            self.client.get("/api/v2/specimen-records/?family=Parnassiidae")["ETag"],
+            etag,
+        )
+
+    def test_conditional_get_after_changes(self):
+        """Ensures the ETag changes when a listed specimen is saved or deleted."""
+
+        url = "/api/v2/specimen-records/"
+        etag = self.client.get(url)["ETag"]
+
+        specimen = SpecimenRecord.objects.get(usi="MEM-000002")
+        specimen.notes = "Worn"
+        specimen.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        SpecimenRecord.objects.get(usi="MEM-000001").delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
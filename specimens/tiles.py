@@ -0,0 +1,149 @@
+import math
+
+from django.db import models
+from django.db.models import Avg, Count, F, Max, Min, Q, Value
+from django.db.models.functions import (
+    Cast,
+    Cos,
+    Floor,
+    Greatest,
+    Least,
+    Ln,
+    Radians,
+    Tan,
+)
+
+# The highest zoom level a tile can be requested at
+MAX_ZOOM = 22
+
+# The number of grid cells along each side of a tile. Points are clustered by cell, so on a
+# 256 pixel tile each cluster covers 16 x 16 pixels.
+GRID_SIZE = 16
+
+
+def tile_bounds(zoom, x, y):
+    """Works out the area covered by a Web Mercator (slippy map) tile.
+
+    Args:
+        zoom (int): The zoom level. The map is 2^zoom tiles wide and tall.
+        x (int): The tile's column, counted from the antimeridian eastward.
+        y (int): The tile's row, counted from the north edge of the map southward.
+
+    Raises:
+        ValueError: If the tile doesn't exist.
+
+    Returns:
+        A tuple of the tile's west, south, east, and north edges in degrees.
+    """
+
+    tiles = 2**zoom
+
+    if not (0 <= zoom <= MAX_ZOOM and 0 <= x < tiles and 0 <= y < tiles):
+        raise ValueError(f"Tile {zoom}/{x}/{y} doesn't exist")
+
+    def latitude(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / tiles))))
+
+    def longitude(column):
+        return column / tiles * 360 - 180
+
+    return longitude(x), latitude(y + 1), longitude(x + 1), latitude(y)
+
+
+def cluster_tile(queryset, zoom, x, y):
+    """Clusters the specimen records within a map tile by their GPS coordinates.
+
+    The tile is divided into a grid of GRID_SIZE x GRID_SIZE cells (evenly spaced in Web Mercator
+    projection, so they're square on the map), and the specimens in each cell are counted in a
+    single grouped query. Each cluster is placed at the mean position of its specimens. Tiles
+    include their west and north edges but not their east and south ones, so a point on the edge
+    between two tiles is only counted once.
+
+    Args:
+        queryset (QuerySet): The (possibly filtered) specimen records to cluster.
+        zoom (int): The tile's zoom level.
+        x (int): The tile's column.
+        y (int): The tile's row.
+
+    Raises:
+        ValueError: If the tile doesn't exist.
+
+    Returns:
+        A dict with the tile's position, its bounds (as [west, south, east, north]), the total
+        number of specimens within it, and its clusters. Each cluster has the number of specimens
+        in it, their mean latitude and longitude, and their bounds. A cluster of one specimen also
+        has the specimen's ID.
+    """
+
+    west, south, east, north = tile_bounds(zoom, x, y)
+    cells = 2**zoom * GRID_SIZE
+    latitude = Cast(F("gps__latitude_degrees"), models.FloatField())
+    longitude = Cast(F("gps__longitude_degrees"), models.FloatField())
+
+    # The last column and row of the map include their far edges, since there's no tile beyond them
+    bounds = Q(gps__longitude_degrees__gte=west, gps__latitude_degrees__lte=north)
+    bounds &= (
+        Q(gps__longitude_degrees__lte=east)
+        if east == 180
+        else Q(gps__longitude_degrees__lt=east)
+    )
+    bounds &= (
+        Q(gps__latitude_degrees__gte=south)
+        if y == 2**zoom - 1
+        else Q(gps__latitude_degrees__gt=south)
+    )
+
+    # A point's position on the whole map's grid (in Web Mercator projection), less the tile's
+    # first cell, kept within the tile in case a point is on one of its edges
+    radians = Radians(latitude)
+    mercator = Ln(Tan(radians) + Value(1.0) / Cos(radians)) / Value(math.pi)
+    cell_x = Floor((longitude + Value(180.0)) / Value(360.0) * Value(float(cells)))
+    cell_y = Floor((Value(1.0) - mercator) / Value(2.0) * Value(float(cells)))
+
+    def within_tile(cell, first):
+        return Least(
+            Greatest(cell - Value(float(first)), Value(0.0)), Value(GRID_SIZE - 1.0)
+        )
+
+    rows = (
+        queryset.order_by()
+        .filter(bounds)
+        .annotate(
+            cell_x=within_tile(cell_x, x * GRID_SIZE),
+            cell_y=within_tile(cell_y, y * GRID_SIZE),
+        )
+        .values("cell_y", "cell_x")
+        .annotate(
+            count=Count("pk"),
+            specimen=Min("pk"),
+            latitude=Avg(latitude),
+            longitude=Avg(longitude),
+            west=Min("gps__longitude_degrees"),
+            south=Min("gps__latitude_degrees"),
+            east=Max("gps__longitude_degrees"),
+            north=Max("gps__latitude_degrees"),
+        )
+        .order_by("cell_y", "cell_x")
+    )
+
+    clusters = []
+
+    for row in rows:
+        cluster = {
+            "count": row["count"],
+            "latitude": round(row["latitude"], 6),
+            "longitude": round(row["longitude"], 6),
+            "bbox": [float(row[edge]) for edge in ("west", "south", "east", "north")],
+        }
+        if row["count"] == 1:
+            cluster["id"] = row["specimen"]
+        clusters.append(cluster)
+
+    return {
+        "zoom": zoom,
+        "x": x,
+        "y": y,
+        "bbox": [round(edge, 6) for edge in (west, south, east, north)],
+        "count": sum(cluster["count"] for cluster in clusters),
+        "clusters": clusters,
+    }
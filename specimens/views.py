@@ -1,12 +1,20 @@
+from django.http import StreamingHttpResponse
+from django.urls import path
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
 from wagtail.api.v2.views import BaseAPIViewSet
 
+from mixins.views import ConditionalGetMixin, EagerLoadingMixin
+from specimens.exports import EXPORT_FORMATS, export_rows, stream_rows
 from specimens.filters import SpecimenRecordFilter
 from specimens.models import Person, SpecimenRecord
 from specimens.serializers import PersonSerializer, SpecimenRecordSerializer
+from specimens.tiles import cluster_tile
 from utils.helpers import get_fields
+from utils.pagination import KeysetPagination
 
 
-class PeopleAPIViewSet(BaseAPIViewSet):
+class PeopleAPIViewSet(ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet):
     """A custom API view set for the Person model using the PersonSerializer."""
 
     base_serializer_class = PersonSerializer
@@ -16,7 +24,7 @@ class PeopleAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(PersonSerializer)
 
 
-class SpecimenRecordAPIViewSet(BaseAPIViewSet):
+class SpecimenRecordAPIViewSet(ConditionalGetMixin, EagerLoadingMixin, BaseAPIViewSet):
     """A custom API view set for the SpecimenRecord model using the
     SpecimenRecordSerializer."""
 
@@ -26,6 +34,8 @@ class SpecimenRecordAPIViewSet(BaseAPIViewSet):
     body_fields = get_fields(SpecimenRecordSerializer)
     listing_default_fields = get_fields(SpecimenRecordSerializer)
     filterset_class = SpecimenRecordFilter
+    pagination_class = KeysetPagination
+    cursor_ordering = ("usi_number", "usi", "id")
 
     def check_query_parameters(self, query_params):
         """Disables Wagtail's strict query param validation so that
@@ -33,7 +43,13 @@ class SpecimenRecordAPIViewSet(BaseAPIViewSet):
         return
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        """Returns the filtered specimen records.
+
+        None of the filters join a many-valued relation (the collector filters use an EXISTS
+        subquery), so every specimen is returned at most once without needing DISTINCT.
+        """
+
+        queryset = super().get_queryset().order_by(*self.cursor_ordering)
 
         filterset = self.filterset_class(
             self.request.GET,
@@ -42,6 +58,84 @@ class SpecimenRecordAPIViewSet(BaseAPIViewSet):
         )
 
         if filterset.is_valid():
-            return filterset.qs.distinct()
+            return filterset.qs
 
         return queryset
+
+    def export_view(self, request, export_format):
+        """Streams the filtered specimen records as a CSV or TSV file.
+
+        The export takes the same filters as the listing, but ignores its pagination and fields
+        parameters. Rows are written as they're read from the database, so the whole collection can
+        be exported without building it in memory.
+
+        Args:
+            request (Request): The request being answered.
+            export_format (str): "csv" or "tsv".
+
+        Returns:
+            A StreamingHttpResponse.
+        """
+
+        _, content_type = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(
+            stream_rows(export_rows(self.get_queryset()), export_format),
+            content_type=f"{content_type}; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="specimen-records.{export_format}"'
+        )
+
+        return response
+
+    def tile_view(self, request, zoom, x, y):
+        """Returns the specimen records within a map tile, clustered by their GPS coordinates.
+
+        The tile takes the same filters as the listing (such as taxon, descendants, and full_date),
+        but ignores its pagination and fields parameters. Like the listing, its response is cached
+        by the API router until the specimen records (or the models they're built from) change.
+
+        Args:
+            request (Request): The request being answered.
+            zoom (int): The tile's zoom level.
+            x (int): The tile's column.
+            y (int): The tile's row.
+
+        Raises:
+            BadRequestError: If the tile doesn't exist.
+
+        Returns:
+            A Response with the tile's clusters (see cluster_tile()).
+        """
+
+        try:
+            data = cluster_tile(self.get_queryset(), zoom, x, y)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+
+        return Response(data)
+
+    @classmethod
+    def get_urlpatterns(cls):
+        """Adds the export URLs (export/csv/ and export/tsv/) and the map tile URL
+        (tiles/<zoom>/<x>/<y>/) to the endpoint's URLs."""
+
+        return (
+            super().get_urlpatterns()
+            + [
+                path(
+                    f"export/{export_format}/",
+                    cls.as_view({"get": "export_view"}),
+                    {"export_format": export_format},
+                    name=f"export-{export_format}",
+                )
+                for export_format in EXPORT_FORMATS
+            ]
+            + [
+                path(
+                    "tiles/<int:zoom>/<int:x>/<int:y>/",
+                    cls.as_view({"get": "tile_view"}),
+                    name="tile",
+                )
+            ]
+        )
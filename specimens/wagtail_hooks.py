@@ -1,9 +1,11 @@
+from django.urls import path
 from wagtail import hooks
 from wagtail.admin.ui.tables import UpdatedAtColumn
 from wagtail.admin.panels import FieldPanel, FieldRowPanel, MultiFieldPanel
 from wagtail.snippets.views.snippets import SnippetViewSet, SnippetViewSetGroup
 from wagtail.snippets.models import register_snippet
 
+from specimens.admin_views import SpecimenImportView, SpecimenRecordIndexView
 from specimens.models import Person, SpecimenRecord
 
 
@@ -33,9 +35,12 @@ class PersonSnippet(SnippetViewSet):
 
 
 class SpecimenRecordSnippet(SnippetViewSet):
-    """A snippet for the SpecimenRecord model."""
+    """A snippet for the SpecimenRecord model, with an extra view for importing specimen records
+    from a file."""
 
     model = SpecimenRecord
+    index_view_class = SpecimenRecordIndexView
+    import_view_class = SpecimenImportView
     menu_icon = "butterfly"
     menu_label = "Specimen Records"
     menu_name = "specimen_records"
@@ -69,6 +74,7 @@ class SpecimenRecordSnippet(SnippetViewSet):
         "year",
     ]
     list_per_page = 100
+    ordering = ["usi_number", "usi"]
 
     panels = [
         FieldPanel("usi"),
@@ -161,6 +167,20 @@ class SpecimenRecordSnippet(SnippetViewSet):
         ),
     ]
 
+    def get_common_view_kwargs(self, **kwargs):
+        return super().get_common_view_kwargs(
+            import_url_name=self.get_url_name("import"), **kwargs
+        )
+
+    @property
+    def import_view(self):
+        return self.construct_view(self.import_view_class)
+
+    def get_urlpatterns(self):
+        return super().get_urlpatterns() + [
+            path("import/", self.import_view, name="import"),
+        ]
+
 
 class SpecimensViewSetGroup(SnippetViewSetGroup):
     """This groups all of the specimen snippets together in the Wagtail admin."""
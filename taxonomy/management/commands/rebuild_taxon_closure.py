@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from taxonomy.models import TaxonClosure
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the taxonomy closure table from the taxonomy models (for example, after loading "
+        "fixtures)."
+    )
+
+    def handle(self, *args, **kwargs):
+        created = TaxonClosure.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} taxonomy closure rows.")
+        )
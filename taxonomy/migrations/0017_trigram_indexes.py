@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:13
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxonomy", "0016_alter_family_order_alter_genus_tribe_and_more"),
+    ]
+
+    operations = [
+        # The geography and specimens apps' trigram indexes depend on this migration, so the
+        # pg_trgm extension is only created (and dropped) in one place
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="family",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_family_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="genus",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_genus_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_order_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="species",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_species_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subfamily",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_subfamily_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subspecies",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_subspecies_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tribe",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="taxonomy_tribe_name_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+# Each taxonomy model and the foreign key to its parent, from the highest rank to the lowest
+RANKS = [
+    ("order", None),
+    ("family", "order"),
+    ("subfamily", "family"),
+    ("tribe", "subfamily"),
+    ("genus", "tribe"),
+    ("species", "genus"),
+    ("subspecies", "species"),
+]
+
+
+def build_closure(apps, schema_editor):
+    TaxonClosure = apps.get_model("taxonomy", "TaxonClosure")
+    rows = []
+    lineages = {}
+
+    for rank, parent_field in RANKS:
+        model = apps.get_model("taxonomy", rank)
+        parent_id_field = f"{parent_field}_id" if parent_field else "pk"
+
+        for pk, parent_id in model.objects.values_list("pk", parent_id_field):
+            lineage = [(rank, pk, 0)]
+            if parent_field:
+                lineage += [
+                    (ancestor_rank, ancestor_id, depth + 1)
+                    for ancestor_rank, ancestor_id, depth in lineages.get(
+                        (parent_field, parent_id), []
+                    )
+                ]
+            lineages[(rank, pk)] = lineage
+            rows += [
+                TaxonClosure(
+                    ancestor_rank=ancestor_rank,
+                    ancestor_id=ancestor_id,
+                    descendant_rank=rank,
+                    descendant_id=pk,
+                    depth=depth,
+                )
+                for ancestor_rank, ancestor_id, depth in lineage
+            ]
+
+    TaxonClosure.objects.bulk_create(rows, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("taxonomy", "0017_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaxonClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ancestor_rank",
+                    models.CharField(
+                        choices=[
+                            ("order", "order"),
+                            ("family", "family"),
+                            ("subfamily", "subfamily"),
+                            ("tribe", "tribe"),
+                            ("genus", "genus"),
+                            ("species", "species"),
+                            ("subspecies", "subspecies"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("ancestor_id", models.PositiveBigIntegerField()),
+                (
+                    "descendant_rank",
+                    models.CharField(
+                        choices=[
+                            ("order", "order"),
+                            ("family", "family"),
+                            ("subfamily", "subfamily"),
+                            ("tribe", "tribe"),
+                            ("genus", "genus"),
+                            ("species", "species"),
+                            ("subspecies", "subspecies"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("descendant_id", models.PositiveBigIntegerField()),
+                ("depth", models.PositiveSmallIntegerField()),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["descendant_rank", "descendant_id", "ancestor_rank"],
+                        name="taxonomy_closure_desc_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "ancestor_rank",
+                            "ancestor_id",
+                            "descendant_rank",
+                            "descendant_id",
+                        ),
+                        name="taxonomy_closure_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
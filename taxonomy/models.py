@@ -1,4 +1,6 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction
+from django.db.models.functions import Upper
 
 from mixins.models import TimeStampMixin
 
@@ -11,8 +13,12 @@ class TaxonomyBase(models.Model):
         name (str): The scientific name of the taxon.
         common_name (str): The common name of the taxon, if it has one.
         authority (str): The authority of the taxon.
+        parent_field (str): The name of the foreign key to the taxon's parent (the rank above it), \
+                            or None for the highest rank.
     """
 
+    parent_field = None
+
     name = models.CharField(
         max_length=100, help_text="Enter the taxon's scientific name"
     )
@@ -54,6 +60,12 @@ class Order(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_order_name_trgm",
+            ),
+        ]
 
 
 class Family(TimeStampMixin, TaxonomyBase):
@@ -70,6 +82,8 @@ class Family(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "order"
+
     order = models.ForeignKey(
         Order,
         on_delete=models.RESTRICT,
@@ -79,6 +93,12 @@ class Family(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["name", "order"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_family_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Families"
 
 
@@ -96,6 +116,8 @@ class Subfamily(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "family"
+
     family = models.ForeignKey(
         Family,
         on_delete=models.RESTRICT,
@@ -105,6 +127,12 @@ class Subfamily(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["name", "family"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_subfamily_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Subfamilies"
 
 
@@ -122,6 +150,8 @@ class Tribe(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "subfamily"
+
     subfamily = models.ForeignKey(
         Subfamily,
         on_delete=models.RESTRICT,
@@ -131,6 +161,12 @@ class Tribe(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["name", "subfamily"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_tribe_name_trgm",
+            ),
+        ]
 
 
 class Genus(TimeStampMixin, TaxonomyBase):
@@ -147,6 +183,8 @@ class Genus(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "tribe"
+
     tribe = models.ForeignKey(
         Tribe,
         on_delete=models.RESTRICT,
@@ -156,6 +194,12 @@ class Genus(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["name", "tribe"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_genus_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Genera"
 
 
@@ -177,6 +221,8 @@ class Species(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "genus"
+
     genus = models.ForeignKey(
         Genus,
         on_delete=models.RESTRICT,
@@ -206,6 +252,12 @@ class Species(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["genus", "name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_species_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Species"
 
     def __str__(self):
@@ -243,6 +295,8 @@ class Subspecies(TimeStampMixin, TaxonomyBase):
                                   from TimeStampMixin.
     """
 
+    parent_field = "species"
+
     species = models.ForeignKey(
         Species,
         on_delete=models.RESTRICT,
@@ -274,6 +328,12 @@ class Subspecies(TimeStampMixin, TaxonomyBase):
 
     class Meta:
         ordering = ["species", "name"]
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="taxonomy_subspecies_name_trgm",
+            ),
+        ]
         verbose_name_plural = "Subspecies"
 
     def __str__(self):
@@ -290,3 +350,271 @@ class Subspecies(TimeStampMixin, TaxonomyBase):
         """The subspecies' trinomial (genus + species + subspecies)."""
 
         return f"{self.species} {self.name}"
+
+
+class TaxonClosure(models.Model):
+    """A model for a TaxonClosure object, which links a taxon to one of its ancestors.
+
+    The taxonomy is stored in separate tables linked parent by parent, so finding every taxon
+    within a family (or every ancestor of a species) would otherwise take a join per rank. This
+    closure table instead stores a row for every ancestor-descendant pair (including a row linking
+    each taxon to itself), so those lookups are a single indexed query. It is kept in sync by the
+    signals in taxonomy/signals.py.
+
+    Attributes:
+        ancestor_rank (str): The rank of the ancestor (such as "family").
+        ancestor_id (int): The ID of the ancestor.
+        descendant_rank (str): The rank of the descendant (such as "species").
+        descendant_id (int): The ID of the descendant.
+        depth (int): The number of ranks between the ancestor and the descendant (0 for the row \
+                     linking a taxon to itself).
+    """
+
+    class Rank(models.TextChoices):
+        ORDER = "order", "order"
+        FAMILY = "family", "family"
+        SUBFAMILY = "subfamily", "subfamily"
+        TRIBE = "tribe", "tribe"
+        GENUS = "genus", "genus"
+        SPECIES = "species", "species"
+        SUBSPECIES = "subspecies", "subspecies"
+
+    ancestor_rank = models.CharField(max_length=10, choices=Rank.choices)
+    ancestor_id = models.PositiveBigIntegerField()
+    descendant_rank = models.CharField(max_length=10, choices=Rank.choices)
+    descendant_id = models.PositiveBigIntegerField()
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "ancestor_rank",
+                    "ancestor_id",
+                    "descendant_rank",
+                    "descendant_id",
+                ],
+                name="taxonomy_closure_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["descendant_rank", "descendant_id", "ancestor_rank"],
+                name="taxonomy_closure_desc_idx",
+            ),
+        ]
+
+    def __str__(self):
+        """Returns a string representation of a TaxonClosure object instance.
+
+        Returns:
+            A string that refers to a TaxonClosure object instance.
+        """
+
+        return (
+            f"{self.ancestor_rank}:{self.ancestor_id} > "
+            f"{self.descendant_rank}:{self.descendant_id}"
+        )
+
+    @staticmethod
+    def get_models():
+        """Returns the taxonomy models, from the highest rank to the lowest."""
+
+        return [Order, Family, Subfamily, Tribe, Genus, Species, Subspecies]
+
+    @staticmethod
+    def parse_key(value):
+        """Parses a taxon key, such as "family:3", into its rank and ID.
+
+        Args:
+            value (str): The rank and ID of a taxon, separated by a colon.
+
+        Raises:
+            ValueError: If the value isn't a valid rank and ID.
+
+        Returns:
+            A tuple of the rank (str) and ID (int).
+        """
+
+        rank, _, pk = value.partition(":")
+
+        if rank not in TaxonClosure.Rank.values or not pk.isdigit():
+            raise ValueError(f"'{value}' is not a valid taxon (use <rank>:<id>)")
+
+        return rank, int(pk)
+
+    @classmethod
+    def descendants(cls, rank, pk, include_self=False):
+        """Returns the closure rows linking a taxon to its descendants.
+
+        Args:
+            rank (str): The taxon's rank.
+            pk (int): The taxon's ID.
+            include_self (bool): Whether to include the row linking the taxon to itself.
+
+        Returns:
+            A QuerySet of TaxonClosure objects.
+        """
+
+        queryset = cls.objects.filter(ancestor_rank=rank, ancestor_id=pk)
+        return queryset if include_self else queryset.filter(depth__gt=0)
+
+    @classmethod
+    def ancestors(cls, rank, pk, include_self=False):
+        """Returns the closure rows linking a taxon to its ancestors.
+
+        Args:
+            rank (str): The taxon's rank.
+            pk (int): The taxon's ID.
+            include_self (bool): Whether to include the row linking the taxon to itself.
+
+        Returns:
+            A QuerySet of TaxonClosure objects.
+        """
+
+        queryset = cls.objects.filter(descendant_rank=rank, descendant_id=pk)
+        return queryset if include_self else queryset.filter(depth__gt=0)
+
+    @classmethod
+    def link(cls, taxon):
+        """Adds a taxon to the closure table, or moves it (and its descendants) to a new parent.
+
+        If the taxon's ancestors haven't changed, nothing is written.
+
+        Args:
+            taxon (TaxonomyBase): A saved instance of one of the taxonomy models.
+        """
+
+        rank = taxon._meta.model_name
+        old_ancestors = {
+            (row.ancestor_rank, row.ancestor_id)
+            for row in cls.ancestors(rank, taxon.pk)
+        }
+
+        if taxon.parent_field is None:
+            new_ancestors = []
+        else:
+            # The parent's rank is the name of the foreign key to it
+            parent_id = getattr(taxon, f"{taxon.parent_field}_id")
+            new_ancestors = list(
+                cls.ancestors(taxon.parent_field, parent_id, include_self=True)
+            )
+
+        subtree = list(cls.descendants(rank, taxon.pk, include_self=True))
+
+        if subtree and old_ancestors == {
+            (row.ancestor_rank, row.ancestor_id) for row in new_ancestors
+        }:
+            return
+
+        with transaction.atomic():
+            if subtree and old_ancestors:
+                cls.objects.filter(
+                    cls._keys_query("ancestor", old_ancestors),
+                    cls._keys_query(
+                        "descendant",
+                        {(row.descendant_rank, row.descendant_id) for row in subtree},
+                    ),
+                ).delete()
+            elif not subtree:
+                subtree = [
+                    cls.objects.create(
+                        ancestor_rank=rank,
+                        ancestor_id=taxon.pk,
+                        descendant_rank=rank,
+                        descendant_id=taxon.pk,
+                        depth=0,
+                    )
+                ]
+
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        ancestor_rank=ancestor.ancestor_rank,
+                        ancestor_id=ancestor.ancestor_id,
+                        descendant_rank=descendant.descendant_rank,
+                        descendant_id=descendant.descendant_id,
+                        depth=ancestor.depth + descendant.depth + 1,
+                    )
+                    for ancestor in new_ancestors
+                    for descendant in subtree
+                ]
+            )
+
+    @classmethod
+    def unlink(cls, taxon):
+        """Removes a taxon from the closure table.
+
+        Taxa can't be deleted while they have children, so only the taxon's own rows are removed.
+
+        Args:
+            taxon (TaxonomyBase): An instance of one of the taxonomy models.
+        """
+
+        cls.ancestors(taxon._meta.model_name, taxon.pk, include_self=True).delete()
+
+    @classmethod
+    def rebuild(cls):
+        """Rebuilds the whole closure table from the taxonomy models.
+
+        Returns:
+            The number of rows created.
+        """
+
+        rows = []
+        # The ancestors of each taxon (as rank, ID, and depth), including itself
+        lineages = {}
+
+        for model in cls.get_models():
+            rank = model._meta.model_name
+            parent_id_field = f"{model.parent_field}_id" if model.parent_field else None
+
+            for pk, parent_id in model.objects.values_list(
+                "pk", parent_id_field or "pk"
+            ):
+                lineage = [(rank, pk, 0)]
+
+                if parent_id_field:
+                    parent_lineage = lineages.get((model.parent_field, parent_id), [])
+                    lineage += [
+                        (ancestor_rank, ancestor_id, depth + 1)
+                        for ancestor_rank, ancestor_id, depth in parent_lineage
+                    ]
+
+                lineages[(rank, pk)] = lineage
+                rows += [
+                    cls(
+                        ancestor_rank=ancestor_rank,
+                        ancestor_id=ancestor_id,
+                        descendant_rank=rank,
+                        descendant_id=pk,
+                        depth=depth,
+                    )
+                    for ancestor_rank, ancestor_id, depth in lineage
+                ]
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            return len(cls.objects.bulk_create(rows, batch_size=5000))
+
+    @staticmethod
+    def _keys_query(prefix, keys):
+        """Builds a filter matching any of a set of (rank, ID) taxon keys.
+
+        Args:
+            prefix (str): Either "ancestor" or "descendant".
+            keys (set): A set of (rank, ID) tuples.
+
+        Returns:
+            A Q object.
+        """
+
+        ids_by_rank = {}
+        for rank, pk in keys:
+            ids_by_rank.setdefault(rank, []).append(pk)
+
+        query = models.Q()
+        for rank, ids in ids_by_rank.items():
+            query |= models.Q(**{f"{prefix}_rank": rank, f"{prefix}_id__in": ids})
+
+        return query
@@ -105,6 +105,8 @@ class SpeciesSerializer(serializers.ModelSerializer):
 
     binomial = serializers.CharField()
 
+    related_lookups = {"binomial": ("genus",)}
+
     class Meta:
         model = Species
         fields = (
@@ -130,6 +132,8 @@ class SubspeciesSerializer(serializers.ModelSerializer):
 
     trinomial = serializers.CharField()
 
+    related_lookups = {"trinomial": ("species__genus",)}
+
     class Meta:
         model = Subspecies
         fields = (
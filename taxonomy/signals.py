@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from taxonomy.models import (
+    Family,
+    Genus,
+    Order,
+    Species,
+    Subfamily,
+    Subspecies,
+    TaxonClosure,
+    Tribe,
+)
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_save, sender=Family)
+@receiver(post_save, sender=Subfamily)
+@receiver(post_save, sender=Tribe)
+@receiver(post_save, sender=Genus)
+@receiver(post_save, sender=Species)
+@receiver(post_save, sender=Subspecies)
+def link_taxon(sender, instance, raw, **kwargs):
+    """Adds a saved taxon to the closure table (or moves it if its parent has changed).
+
+    Fixtures are loaded without their related objects, so the closure table should be rebuilt
+    with the rebuild_taxon_closure command after loading them.
+    """
+
+    if not raw:
+        TaxonClosure.link(instance)
+
+
+@receiver(post_delete, sender=Order)
+@receiver(post_delete, sender=Family)
+@receiver(post_delete, sender=Subfamily)
+@receiver(post_delete, sender=Tribe)
+@receiver(post_delete, sender=Genus)
+@receiver(post_delete, sender=Species)
+@receiver(post_delete, sender=Subspecies)
+def unlink_taxon(sender, instance, **kwargs):
+    """Removes a deleted taxon from the closure table."""
+
+    TaxonClosure.unlink(instance)
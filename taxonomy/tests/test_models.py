@@ -1,6 +1,16 @@
 from django.test import TestCase
 
-from taxonomy.models import Order, Species, Subspecies
+from taxonomy.models import Genus, Order, Species, Subspecies, TaxonClosure, Tribe
+
+TAXONOMY_FIXTURES = [
+    "orders.json",
+    "families.json",
+    "subfamilies.json",
+    "tribes.json",
+    "genera.json",
+    "species.json",
+    "subspecies.json",
+]
 
 
 class TaxonomyBaseTestCase(TestCase):
@@ -74,3 +84,123 @@ class SubspeciesTestCase(TestCase):
 
         subspecies = Subspecies.objects.get(name="rudkini")
         self.assertEqual(subspecies.trinomial, "Papilio polyxenes rudkini")
+
+
+class TaxonClosureTestCase(TestCase):
+    """A test case for the TaxonClosure model and the signals that keep it in sync."""
+
+    fixtures = TAXONOMY_FIXTURES
+
+    def setUp(self):
+        TaxonClosure.rebuild()
+
+    def get_ancestors(self, taxon):
+        """Returns a taxon's ancestors as a list of (rank, ID, depth) tuples, nearest first."""
+
+        return list(
+            TaxonClosure.ancestors(taxon._meta.model_name, taxon.pk)
+            .order_by("depth")
+            .values_list("ancestor_rank", "ancestor_id", "depth")
+        )
+
+    def get_descendants(self, taxon):
+        """Returns a taxon's descendants as a set of (rank, ID) tuples."""
+
+        return set(
+            TaxonClosure.descendants(taxon._meta.model_name, taxon.pk).values_list(
+                "descendant_rank", "descendant_id"
+            )
+        )
+
+    def test_rebuild(self):
+        """Ensures every taxon is linked to itself and to each of its ancestors."""
+
+        subspecies = Subspecies.objects.get(name="rudkini")
+
+        self.assertEqual(
+            self.get_ancestors(subspecies),
+            [
+                ("species", 3, 1),
+                ("genus", 2, 2),
+                ("tribe", 2, 3),
+                ("subfamily", 2, 4),
+                ("family", 1, 5),
+                ("order", 1, 6),
+            ],
+        )
+        self.assertEqual(
+            self.get_descendants(Tribe.objects.get(name="Papilionini")),
+            {("genus", 2), ("species", 3), ("subspecies", 1)},
+        )
+        # Ten taxa, each linked to itself and its ancestors
+        self.assertEqual(TaxonClosure.objects.count(), 1 + 2 + 6 + 8 + 10 + 12 + 7)
+
+    def test_create(self):
+        """Ensures a new taxon is linked to its ancestors when it is saved."""
+
+        genus = Genus.objects.get(name="Papilio")
+        species = Species.objects.create(genus=genus, name="glaucus", authority="L.")
+
+        self.assertEqual(
+            [rank for rank, _, _ in self.get_ancestors(species)],
+            ["genus", "tribe", "subfamily", "family", "order"],
+        )
+        self.assertIn(("species", species.pk), self.get_descendants(genus))
+
+    def test_move(self):
+        """Ensures moving a taxon to a new parent also moves all of its descendants."""
+
+        genus = Genus.objects.get(name="Papilio")
+        old_tribe = Tribe.objects.get(name="Papilionini")
+        new_tribe = Tribe.objects.get(name="Parnassiini")
+
+        genus.tribe = new_tribe
+        genus.save()
+
+        self.assertEqual(self.get_descendants(old_tribe), set())
+        self.assertEqual(
+            self.get_descendants(new_tribe),
+            {
+                ("genus", 1),
+                ("species", 2),
+                ("genus", 2),
+                ("species", 3),
+                ("subspecies", 1),
+            },
+        )
+        self.assertEqual(
+            self.get_ancestors(Subspecies.objects.get(name="rudkini"))[2:4],
+            [("tribe", 1, 3), ("subfamily", 1, 4)],
+        )
+
+    def test_save_without_move(self):
+        """Ensures saving a taxon without changing its parent doesn't rewrite the closure table."""
+
+        genus = Genus.objects.get(name="Papilio")
+        genus.common_name = "Swallowtails"
+
+        # One query each for the update, the taxon's ancestors, its parent's ancestors, and its
+        # descendants (plus the specimen record update)
+        with self.assertNumQueries(5):
+            genus.save()
+
+    def test_delete(self):
+        """Ensures a deleted taxon is removed from the closure table."""
+
+        subspecies = Subspecies.objects.get(name="rudkini")
+        subspecies.delete()
+
+        self.assertFalse(
+            TaxonClosure.objects.filter(
+                descendant_rank="subspecies", descendant_id=1
+            ).exists()
+        )
+
+    def test_parse_key(self):
+        """Ensures taxon keys are parsed into a rank and ID."""
+
+        self.assertEqual(TaxonClosure.parse_key("family:3"), ("family", 3))
+
+        for value in ["family", "family:", "kingdom:1", "family:x"]:
+            with self.assertRaises(ValueError):
+                TaxonClosure.parse_key(value)
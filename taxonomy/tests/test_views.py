@@ -0,0 +1,198 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from taxonomy.models import Genus, Species, Subspecies, TaxonClosure
+from taxonomy.tests.test_models import TAXONOMY_FIXTURES
+
+
+class NestedTaxonomyAPIViewSetTestCase(TestCase):
+    """A test case for the query counts of the nested taxonomy endpoints."""
+
+    fixtures = TAXONOMY_FIXTURES
+
+    def test_nested_species_query_count(self):
+        """Ensures 1,000 nested species (with their full lineage) are loaded in a fixed number of
+        queries."""
+
+        url = "/api/v2/nested-species/?limit=1000"
+        genera = list(Genus.objects.all())
+        Species.objects.bulk_create(
+            [
+                Species(genus=genera[i % 2], name=f"species{i}", authority="Synthetic")
+                for i in range(1000)
+            ]
+        )
+
+        # One query for the ETag, one count query, and one query for the species joined to all of
+        # their ancestors
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        items = response.json()["items"]
+        self.assertEqual(len(items), 1000)
+        self.assertEqual(
+            items[-1]["genus"]["tribe"]["subfamily"]["family"]["order"]["name"],
+            "Lepidoptera",
+        )
+
+    def test_nested_endpoints_query_count(self):
+        """Ensures every nested taxonomy endpoint loads its lineage in the same query."""
+
+        species = Species.objects.get(name="polyxenes")
+        Subspecies.objects.bulk_create(
+            [
+                Subspecies(
+                    species=species, name=f"subspecies{i}", authority="Synthetic"
+                )
+                for i in range(50)
+            ]
+        )
+
+        for endpoint in [
+            "nested-families",
+            "nested-subfamilies",
+            "nested-tribes",
+            "nested-genera",
+            "nested-species",
+            "nested-subspecies",
+        ]:
+            with self.subTest(endpoint=endpoint):
+                self.assertNumQueries(
+                    3, self.client.get, f"/api/v2/{endpoint}/?limit=100"
+                )
+
+
+class TaxonClosureFilterTestCase(TestCase):
+    """A test case for the descendants and ancestors filters on the taxonomy endpoints."""
+
+    fixtures = TAXONOMY_FIXTURES
+
+    def setUp(self):
+        TaxonClosure.rebuild()
+
+    def get_names(self, url):
+        """Requests a taxonomy listing and returns the names of the taxa in it."""
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return [item["name"] for item in response.json()["items"]]
+
+    def test_descendants(self):
+        """Ensures the descendants filter returns the taxa of one rank within a taxon."""
+
+        self.assertEqual(
+            self.get_names("/api/v2/species/?descendants=family:1"),
+            ["smintheus", "polyxenes"],
+        )
+        self.assertEqual(
+            self.get_names("/api/v2/nested-species/?descendants=tribe:2"),
+            ["polyxenes"],
+        )
+        self.assertEqual(self.get_names("/api/v2/families/?descendants=family:1"), [])
+
+    def test_ancestors(self):
+        """Ensures the ancestors filter returns the taxa of one rank above a taxon."""
+
+        self.assertEqual(
+            self.get_names("/api/v2/subfamilies/?ancestors=subspecies:1"),
+            ["Papilioninae"],
+        )
+        self.assertEqual(
+            self.get_names("/api/v2/orders/?ancestors=species:2"), ["Lepidoptera"]
+        )
+
+    def test_query_count(self):
+        """Ensures the filter is a single subquery rather than a query per rank."""
+
+        # One query for the ETag, one count query, and one query for the species
+        self.assertNumQueries(
+            3, self.client.get, "/api/v2/species/?fields=_,name&descendants=order:1"
+        )
+
+    def test_invalid_taxon(self):
+        """Ensures a malformed taxon returns a 400 error."""
+
+        response = self.client.get("/api/v2/species/?descendants=family")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"message": "descendants must be in the form <rank>:<id>"}
+        )
+
+
+class TaxonomyTreeAPIViewSetTestCase(TestCase):
+    """A test case for the taxonomy tree endpoint."""
+
+    fixtures = TAXONOMY_FIXTURES
+    url = "/api/v2/taxonomy-tree/"
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tree(self):
+        """Ensures every taxon is nested under its parent."""
+
+        orders = self.client.get(self.url).json()["items"]
+        family = orders[0]["families"][0]
+        papilioninae = family["subfamilies"][0]
+
+        self.assertEqual([order["name"] for order in orders], ["Lepidoptera"])
+        self.assertEqual(family["name"], "Papilionidae")
+        self.assertEqual(
+            [subfamily["name"] for subfamily in family["subfamilies"]],
+            ["Papilioninae", "Parnassiinae"],
+        )
+        self.assertEqual(
+            papilioninae["tribes"][0]["genera"][0]["species"][0]["subspecies"],
+            [
+                {
+                    "id": 1,
+                    "name": "rudkini",
+                    "common_name": "Desert Black Swallowtail",
+                    "authority": Subspecies.objects.get(pk=1).authority,
+                }
+            ],
+        )
+
+    def test_cache(self):
+        """Ensures the tree is built once and then served from the cache with a single query."""
+
+        # One query for the version and one for each of the seven ranks
+        self.assertNumQueries(8, self.client.get, self.url)
+        self.assertNumQueries(1, self.client.get, self.url)
+
+    def test_etag(self):
+        """Ensures a request with a matching ETag returns a 304 response."""
+
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304
+        )
+
+    def test_invalidation(self):
+        """Ensures the cached tree and ETag change when any taxon is saved or deleted."""
+
+        etag = self.client.get(self.url)["ETag"]
+
+        genus = Genus.objects.get(name="Papilio")
+        genus.common_name = "Tiger Swallowtails"
+        genus.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        tribe = response.json()["items"][0]["families"][0]["subfamilies"][0]["tribes"][
+            0
+        ]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(tribe["genera"][0]["common_name"], "Tiger Swallowtails")
+
+        etag = response["ETag"]
+        Subspecies.objects.get(name="rudkini").delete()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
@@ -1,6 +1,20 @@
+from django.core.cache import cache
+from django.urls import path
+from rest_framework.response import Response
+from wagtail.api.v2.utils import BadRequestError
 from wagtail.api.v2.views import BaseAPIViewSet
 
-from taxonomy.models import Family, Genus, Order, Species, Subfamily, Subspecies, Tribe
+from mixins.views import ConditionalGetMixin, EagerLoadingMixin
+from taxonomy.models import (
+    Family,
+    Genus,
+    Order,
+    Species,
+    Subfamily,
+    Subspecies,
+    TaxonClosure,
+    Tribe,
+)
 from taxonomy.serializers import (
     FamilySerializer,
     GenusSerializer,
@@ -16,10 +30,71 @@ from taxonomy.serializers import (
     SubspeciesSerializer,
     TribeSerializer,
 )
+from utils.caching import get_models_version, make_etag
 from utils.helpers import get_fields
 
 
-class OrdersAPIViewSet(BaseAPIViewSet):
+class TaxonClosureFilterMixin:
+    """A mixin for the taxonomy API view sets that adds `descendants` and `ancestors` filters.
+
+    Both filters take a taxon in the form <rank>:<id>, such as "family:3". For example,
+    /api/v2/species/?descendants=tribe:2 returns every species in tribe 2, and
+    /api/v2/families/?ancestors=species:3 returns the family of species 3. Each filter is a single
+    indexed lookup on the taxonomy closure table, no matter how many ranks apart the taxa are.
+
+    Since the filters can read any rank, every taxonomy model is added to the view set's
+    `cache_dependencies` for the API router's response cache.
+    """
+
+    cache_dependencies = TaxonClosure.get_models()
+    known_query_parameters = BaseAPIViewSet.known_query_parameters.union(
+        ["descendants", "ancestors"]
+    )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        rank = self.model._meta.model_name
+
+        if "descendants" in self.request.GET:
+            ancestor_rank, ancestor_id = self.get_taxon_key("descendants")
+            queryset = queryset.filter(
+                pk__in=TaxonClosure.descendants(ancestor_rank, ancestor_id)
+                .filter(descendant_rank=rank)
+                .values("descendant_id")
+            )
+
+        if "ancestors" in self.request.GET:
+            descendant_rank, descendant_id = self.get_taxon_key("ancestors")
+            queryset = queryset.filter(
+                pk__in=TaxonClosure.ancestors(descendant_rank, descendant_id)
+                .filter(ancestor_rank=rank)
+                .values("ancestor_id")
+            )
+
+        return queryset
+
+    def get_taxon_key(self, param):
+        """Reads a taxon (in the form <rank>:<id>) from a query parameter.
+
+        Args:
+            param (str): The name of the query parameter.
+
+        Raises:
+            BadRequestError: If the parameter isn't a valid taxon.
+
+        Returns:
+            A tuple of the taxon's rank (str) and ID (int).
+        """
+
+        try:
+            return TaxonClosure.parse_key(self.request.GET[param])
+        except ValueError:
+            raise BadRequestError(f"{param} must be in the form <rank>:<id>")
+
+
+class OrdersAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Order model using the OrderSerializer."""
 
     base_serializer_class = OrderSerializer
@@ -29,149 +104,242 @@ class OrdersAPIViewSet(BaseAPIViewSet):
     listing_default_fields = get_fields(OrderSerializer)
 
 
-class FamiliesAPIViewSet(BaseAPIViewSet):
+class FamiliesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Family model using the FamilySerializer."""
 
     base_serializer_class = FamilySerializer
     model = Family
-    queryset = Family.objects.select_related("order").all()
+    queryset = Family.objects.all()
     body_fields = get_fields(FamilySerializer)
     listing_default_fields = get_fields(FamilySerializer)
 
 
-class SubfamiliesAPIViewSet(BaseAPIViewSet):
+class SubfamiliesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Subfamily model using the SubfamilySerializer."""
 
     base_serializer_class = SubfamilySerializer
     model = Subfamily
-    queryset = Subfamily.objects.select_related("family").all()
+    queryset = Subfamily.objects.all()
     body_fields = get_fields(SubfamilySerializer)
     listing_default_fields = get_fields(SubfamilySerializer)
 
 
-class TribesAPIViewSet(BaseAPIViewSet):
+class TribesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Tribe model using the TribeSerializer."""
 
     base_serializer_class = TribeSerializer
     model = Tribe
-    queryset = Tribe.objects.select_related("subfamily").all()
+    queryset = Tribe.objects.all()
     body_fields = get_fields(TribeSerializer)
     listing_default_fields = get_fields(TribeSerializer)
 
 
-class GeneraAPIViewSet(BaseAPIViewSet):
+class GeneraAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Genus model using the GenusSerializer."""
 
     base_serializer_class = GenusSerializer
     model = Genus
-    queryset = Genus.objects.select_related("tribe").all()
+    queryset = Genus.objects.all()
     body_fields = get_fields(GenusSerializer)
     listing_default_fields = get_fields(GenusSerializer)
 
 
-class SpeciesAPIViewSet(BaseAPIViewSet):
+class SpeciesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Species model using the SpeciesSerializer."""
 
     base_serializer_class = SpeciesSerializer
     model = Species
-    queryset = Species.objects.select_related("genus").all()
+    queryset = Species.objects.all()
     body_fields = get_fields(SpeciesSerializer)
     listing_default_fields = get_fields(SpeciesSerializer)
 
 
-class SubspeciesAPIViewSet(BaseAPIViewSet):
+class SubspeciesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Subspecies model using the SubspeciesSerializer."""
 
     base_serializer_class = SubspeciesSerializer
     model = Subspecies
-    queryset = Subspecies.objects.select_related("species").all()
+    queryset = Subspecies.objects.all()
     body_fields = get_fields(SubspeciesSerializer)
     listing_default_fields = get_fields(SubspeciesSerializer)
 
 
-class NestedFamiliesAPIViewSet(BaseAPIViewSet):
+class NestedFamiliesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Family model using the NestedFamilySerializer."""
 
     base_serializer_class = NestedFamilySerializer
     model = Family
-    queryset = Family.objects.select_related("order").all()
+    queryset = Family.objects.all()
     body_fields = get_fields(NestedFamilySerializer)
     listing_default_fields = get_fields(NestedFamilySerializer)
 
 
-class NestedSubfamiliesAPIViewSet(BaseAPIViewSet):
+class NestedSubfamiliesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Subfamily model using the NestedSubfamilySerializer."""
 
     base_serializer_class = NestedSubfamilySerializer
     model = Subfamily
-    queryset = (
-        Subfamily.objects.select_related("family").select_related("family__order").all()
-    )
+    queryset = Subfamily.objects.all()
     body_fields = get_fields(NestedSubfamilySerializer)
     listing_default_fields = get_fields(NestedSubfamilySerializer)
 
 
-class NestedTribesAPIViewSet(BaseAPIViewSet):
+class NestedTribesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Tribe model using the NestedTribeSerializer."""
 
     base_serializer_class = NestedTribeSerializer
     model = Tribe
-    queryset = (
-        Tribe.objects.select_related("subfamily")
-        .select_related("subfamily__family")
-        .select_related("subfamily__family__order")
-        .all()
-    )
+    queryset = Tribe.objects.all()
     body_fields = get_fields(NestedTribeSerializer)
     listing_default_fields = get_fields(NestedTribeSerializer)
 
 
-class NestedGeneraAPIViewSet(BaseAPIViewSet):
+class NestedGeneraAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Genus model using the NestedGenusSerializer."""
 
     base_serializer_class = NestedGenusSerializer
     model = Genus
-    queryset = (
-        Genus.objects.select_related("tribe")
-        .select_related("tribe__familiy")
-        .select_related("tribe__subfamily__family")
-        .select_related("tribe__subfamily__family__order")
-        .all()
-    )
+    queryset = Genus.objects.all()
     body_fields = get_fields(NestedGenusSerializer)
     listing_default_fields = get_fields(NestedGenusSerializer)
 
 
-class NestedSpeciesAPIViewSet(BaseAPIViewSet):
+class NestedSpeciesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Species model using the NestedSpeciesSerializer."""
 
     base_serializer_class = NestedSpeciesSerializer
     model = Species
-    queryset = (
-        Species.objects.select_related("genus")
-        .select_related("genus__tribe")
-        .select_related("genus__tribe__familiy")
-        .select_related("genus__tribe__subfamily__family")
-        .select_related("genus__tribe__subfamily__family__order")
-        .all()
-    )
+    queryset = Species.objects.all()
     body_fields = get_fields(NestedSpeciesSerializer)
     listing_default_fields = get_fields(NestedSpeciesSerializer)
 
 
-class NestedSubspeciesAPIViewSet(BaseAPIViewSet):
+class NestedSubspeciesAPIViewSet(
+    ConditionalGetMixin, EagerLoadingMixin, TaxonClosureFilterMixin, BaseAPIViewSet
+):
     """A custom API view set for the Subspecies model using the NestedSubspeciesSerializer."""
 
     base_serializer_class = NestedSubspeciesSerializer
     model = Subspecies
-    queryset = (
-        Subspecies.objects.select_related("species")
-        .select_related("species__genus")
-        .select_related("species__genus__tribe")
-        .select_related("species__genus__tribe__subfamily")
-        .select_related("species__genus__tribe__subfamily__family")
-        .select_related("species__genus__tribe__subfamily__family__order")
-        .all()
-    )
+    queryset = Subspecies.objects.all()
     body_fields = get_fields(NestedSubspeciesSerializer)
     listing_default_fields = get_fields(NestedSubspeciesSerializer)
+
+
+class TaxonomyTreeAPIViewSet(ConditionalGetMixin, BaseAPIViewSet):
+    """A custom API view set that returns the whole taxonomy as a single nested document.
+
+    Each order contains its families, each family its subfamilies, and so on down to subspecies,
+    so clients can build a taxonomic browser from one request instead of stitching together the
+    nested endpoints (which repeat every ancestor for each row).
+
+    The tree is cached under the taxonomy's current version (built from each taxonomy model's
+    latest date_modified and row count), so any change to the taxonomy invalidates it. The same
+    version is used for the ETag, so ConditionalGetMixin can answer a matching If-None-Match
+    request header with a 304 response.
+    """
+
+    model = Order
+    # The models in the tree, from the highest rank to the lowest, with the key used for each
+    # rank's list of children
+    levels = [
+        (Order, None),
+        (Family, "families"),
+        (Subfamily, "subfamilies"),
+        (Tribe, "tribes"),
+        (Genus, "genera"),
+        (Species, "species"),
+        (Subspecies, "subspecies"),
+    ]
+    # Read by the API router's response cache (see utils/response_cache.py)
+    cache_dependencies = [model for model, _ in levels]
+    cache_prefix = "taxonomy-tree"
+    cache_control = {"public": True, "max_age": 300}
+
+    def get_listing_response(self, request):
+        cache_key = f"{self.cache_prefix}:{self.version}"
+        tree = cache.get(cache_key)
+
+        if tree is None:
+            tree = self.build_tree()
+            cache.set(cache_key, tree, timeout=None)
+
+        return Response(tree)
+
+    def get_etag(self, request):
+        """Computes the ETag from the taxonomy's current version.
+
+        Args:
+            request (Request): The request being answered.
+
+        Returns:
+            The ETag (str).
+        """
+
+        _, self.version = get_models_version([model for model, _ in self.levels])
+
+        return make_etag(self.cache_prefix, self.version)
+
+    def build_tree(self):
+        """Builds the nested taxonomy document.
+
+        Each rank is loaded in one query, and each taxon is attached to its parent in a single pass
+        (a taxon's parent always comes from the rank before it).
+
+        Returns:
+            A dict with the list of orders (and everything within them) under "items".
+        """
+
+        nodes = {}
+        orders = []
+
+        for model, children_key in self.levels:
+            rank = model._meta.model_name
+            fields = ["id", "name", "common_name", "authority"]
+
+            if model.parent_field:
+                fields.append(f"{model.parent_field}_id")
+
+            for taxon in model.objects.order_by("name", "id").values(*fields):
+                parent_id = taxon.pop(f"{model.parent_field}_id", None)
+                nodes[(rank, taxon["id"])] = taxon
+
+                if model.parent_field is None:
+                    orders.append(taxon)
+                    continue
+
+                parent = nodes.get((model.parent_field, parent_id))
+                if parent is not None:
+                    parent.setdefault(children_key, []).append(taxon)
+
+        return {"items": orders}
+
+    @classmethod
+    def get_urlpatterns(cls):
+        """Only the listing URL is available, since the endpoint returns a single document."""
+
+        return [
+            path("", cls.as_view({"get": "listing_view"}), name="listing"),
+        ]
@@ -0,0 +1,294 @@
+import random
+import statistics
+import string
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import transaction
+
+from utils.helpers import get_date_range
+
+
+class Rollback(Exception):
+    """Raised to roll back the transaction opened by rolled_back()."""
+
+
+@contextmanager
+def rolled_back():
+    """Runs a block of code inside a transaction that is always rolled back.
+
+    Benchmarks create a lot of synthetic data, and this makes sure none of it is left behind in the
+    database afterwards (even if the benchmark is interrupted).
+    """
+
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def time_call(func, repeat=5):
+    """Times a function call.
+
+    Args:
+        func (callable): The function to time. It is called once to warm up before timing.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        The median duration of the timed calls in milliseconds.
+    """
+
+    func()
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(durations)
+
+
+def make_words(count, rng):
+    """Makes a list of unique, made-up lowercase words.
+
+    Args:
+        count (int): The number of words to make.
+        rng (Random): The random number generator to use.
+
+    Returns:
+        A list of strings.
+    """
+
+    words = set()
+
+    while len(words) < count:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))))
+
+    return sorted(words)
+
+
+def make_gps_points(localities, count, rng, latitudes, longitudes):
+    """Makes (but doesn't save) GPS objects at random points within a range of coordinates.
+
+    Args:
+        localities (list): The localities to cycle through for the points.
+        count (int): The number of points to make.
+        rng (Random): The random number generator to use.
+        latitudes (tuple): The lowest and highest latitudes, in degrees.
+        longitudes (tuple): The lowest and highest longitudes, in degrees.
+
+    Returns:
+        A list of GPS objects, with both their text and decimal coordinates filled in.
+    """
+
+    from geography.models import GPS
+
+    points = []
+
+    for i in range(count):
+        latitude = Decimal(f"{rng.uniform(*latitudes):.6f}")
+        longitude = Decimal(f"{rng.uniform(*longitudes):.6f}")
+        points.append(
+            GPS(
+                locality=localities[i % len(localities)],
+                latitude=str(latitude),
+                longitude=str(longitude),
+                latitude_degrees=latitude,
+                longitude_degrees=longitude,
+                elevation=str(rng.randint(0, 3000)),
+            )
+        )
+
+    return points
+
+
+def create_synthetic_collection(records, seed=0, batch_size=5000, log=None):
+    """Fills the database with a synthetic collection of specimen records for benchmarking.
+
+    A taxonomy (3,000 species), geography (10,000 GPS points), and people are created first, then
+    the specimen records are bulk created with random (but consistent) taxonomy, places, dates, and
+    free-text fields made up of random words. It should be run inside rolled_back().
+
+    Args:
+        records (int): The number of specimen records to create.
+        seed (int): The seed for the random number generator, so runs are repeatable.
+        batch_size (int): The number of rows inserted per query.
+        log (callable): An optional function called with progress messages.
+
+    Returns:
+        A dict with the lists of words used for names and free text ("names" and "words").
+    """
+
+    from geography.models import GPS, Country, County, Locality, State
+    from specimens.models import Person, SpecimenRecord
+    from taxonomy.models import Family, Genus, Order, Species, Subfamily, Tribe
+
+    rng = random.Random(seed)
+    log = log or (lambda message: None)
+    names = make_words(4000, rng)
+    words = make_words(2000, rng)
+
+    def create(model, objects):
+        return model.objects.bulk_create(objects, batch_size=batch_size)
+
+    log("Creating taxonomy...")
+    order = Order.objects.create(name="Lepidoptera", authority="Linnaeus, 1758")
+    families = create(
+        Family,
+        [
+            Family(order=order, name=f"{names[i].title()}idae", authority="Synthetic")
+            for i in range(10)
+        ],
+    )
+    subfamilies = create(
+        Subfamily,
+        [
+            Subfamily(
+                family=families[i % 10],
+                name=f"{names[10 + i].title()}inae",
+                authority="Synthetic",
+            )
+            for i in range(30)
+        ],
+    )
+    tribes = create(
+        Tribe,
+        [
+            Tribe(
+                subfamily=subfamilies[i % 30],
+                name=f"{names[40 + i].title()}ini",
+                authority="Synthetic",
+            )
+            for i in range(60)
+        ],
+    )
+    genera = create(
+        Genus,
+        [
+            Genus(
+                tribe=tribes[i % 60], name=names[100 + i].title(), authority="Synthetic"
+            )
+            for i in range(300)
+        ],
+    )
+    species = create(
+        Species,
+        [
+            Species(
+                genus=genera[i % 300],
+                name=names[400 + i],
+                common_name=f"{names[400 + i].title()} Moth",
+                authority="Synthetic",
+            )
+            for i in range(3000)
+        ],
+    )
+
+    log("Creating geography and people...")
+    country = Country.objects.create(name="Synthetic Republic", abbr="SYN")
+    states = create(
+        State,
+        [
+            State(country=country, name=names[3400 + i].title(), abbr=f"S{i}")
+            for i in range(50)
+        ],
+    )
+    counties = create(
+        County,
+        [
+            County(state=states[i % 50], name=names[3450 + i].title())
+            for i in range(500)
+        ],
+    )
+    localities = create(
+        Locality,
+        [
+            Locality(
+                county=counties[i % 500],
+                name=f"{rng.choice(names).title()} {rng.choice(['Park', 'Road', 'Creek'])}",
+                town=rng.choice(names).title(),
+            )
+            for i in range(5000)
+        ],
+    )
+    gps_points = create(
+        GPS, make_gps_points(localities[:5000], 10000, rng, (25, 49), (-124, -67))
+    )
+    people = create(
+        Person,
+        [
+            Person(first_name=names[i].title(), last_name=names[3950 + i].title())
+            for i in range(50)
+        ],
+    )
+
+    log(f"Creating {records:,} specimen records...")
+    months = [month for month, _ in SpecimenRecord.Month.choices]
+    methods = [method for method, _ in SpecimenRecord.Method.choices]
+    Collector = SpecimenRecord.collector.through
+
+    for start in range(0, records, batch_size):
+        batch = []
+
+        for number in range(start + 1, min(start + batch_size, records) + 1):
+            # Each level was created by cycling through the level above it, so an object's
+            # parents can be found from its index
+            index = rng.randrange(3000)
+            specimen_species = species[index]
+            genus = genera[index % 300]
+            tribe = tribes[index % 300 % 60]
+            subfamily = subfamilies[index % 300 % 60 % 30]
+            gps_index = rng.randrange(10000)
+            gps = gps_points[gps_index]
+            locality = localities[gps_index % 5000]
+            county = counties[gps_index % 5000 % 500]
+            day, month, year = (
+                rng.randint(1, 28),
+                rng.choice(months),
+                rng.randint(2005, 2025),
+            )
+            collected_start, collected_end = get_date_range(year, month, day)
+
+            batch.append(
+                SpecimenRecord(
+                    usi=f"MEM-{number:07}",
+                    usi_number=number,
+                    order=order,
+                    family_id=subfamily.family_id,
+                    subfamily=subfamily,
+                    tribe=tribe,
+                    genus=genus,
+                    species=specimen_species,
+                    preparer=people[0],
+                    country=country,
+                    state_id=county.state_id,
+                    county=county,
+                    locality=locality,
+                    gps=gps,
+                    day=day,
+                    month=month,
+                    year=year,
+                    collected_start=collected_start,
+                    collected_end=collected_end,
+                    method=rng.choice(methods),
+                    temperature=str(rng.randint(40, 95)),
+                    habitat=f"<p>{' '.join(rng.choices(words, k=8))}</p>",
+                    notes=f"<p>{' '.join(rng.choices(words, k=4))}</p>",
+                )
+            )
+
+        specimens = SpecimenRecord.objects.bulk_create(batch)
+        Collector.objects.bulk_create(
+            [
+                Collector(specimenrecord_id=specimen.id, person_id=person.id)
+                for specimen in specimens
+                for person in rng.sample(people, rng.randint(1, 2))
+            ]
+        )
+        log(f"  {start + len(batch):,} / {records:,}")
+
+    return {"names": names, "words": words}
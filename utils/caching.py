@@ -0,0 +1,48 @@
+import hashlib
+
+from django.db import connection
+
+
+def get_models_version(models):
+    """Finds when a set of models' data last changed, using a single query.
+
+    The version combines each model's latest date_modified with its row count, so it changes when
+    any object is created, saved, or deleted (through the ORM).
+
+    Args:
+        models (list): Model classes that inherit from TimeStampMixin.
+
+    Returns:
+        A tuple of the latest date_modified across all of the models (datetime, or None if they're
+        all empty) and a version string that changes whenever their data does.
+    """
+
+    quote = connection.ops.quote_name
+    columns = ", ".join(
+        f"(SELECT MAX({quote('date_modified')}) FROM {quote(model._meta.db_table)}), "
+        f"(SELECT COUNT(*) FROM {quote(model._meta.db_table)})"
+        for model in models
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {columns}")
+        row = cursor.fetchone()
+
+    last_modified = max((value for value in row[::2] if value), default=None)
+    version = hashlib.sha1(repr(row).encode()).hexdigest()
+
+    return last_modified, version
+
+
+def make_etag(*parts):
+    """Builds a strong ETag (a quoted hash) from a list of values.
+
+    Args:
+        *parts: The values the response depends on, such as a version string and the query string.
+
+    Returns:
+        A quoted string suitable for an ETag header.
+    """
+
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
@@ -1,6 +1,21 @@
+import calendar
+import copy
+import datetime
+import re
+from decimal import Decimal
+from functools import lru_cache
+
+from rest_framework.serializers import ModelSerializer
+from rest_framework.utils import model_meta
+
+
 def get_fields(serializer):
     """Obtains a serializer's fields and returns them as a list.
 
+    The field names are worked out from the serializer class (its declared fields and its Meta)
+    without building the serializer's fields, so nested serializers aren't instantiated. The result
+    is cached for each class, since view sets call this for their serializers at import time.
+
     Args:
         serializer (ModelSerializer): A Django serializer class (inherits from ModelSerializer).
 
@@ -8,9 +23,177 @@ def get_fields(serializer):
         A list of fields as strings.
     """
 
-    fields = []
+    return list(get_field_names(serializer))
+
+
+@lru_cache(maxsize=None)
+def get_field_names(serializer):
+    """Works out a serializer class's field names, in the order the serializer outputs them.
+
+    Args:
+        serializer (Serializer): A Django REST Framework serializer class.
+
+    Returns:
+        A tuple of field names.
+    """
+
+    declared_fields = copy.deepcopy(serializer._declared_fields)
+
+    if not issubclass(serializer, ModelSerializer):
+        return tuple(declared_fields)
+
+    info = model_meta.get_field_info(serializer.Meta.model)
+
+    return tuple(serializer().get_field_names(declared_fields, info))
+
+
+def get_date_range(year, month="", day=None):
+    """Converts a partial date (as stored on a specimen record) into the range of dates it covers.
+
+    A specimen collected in "June 2021" could have been collected on any day in June, so its range
+    is 1 June 2021 to 30 June 2021. A date with only a year covers the whole year. If the day isn't
+    valid for the month (such as 31 June), only the month is used.
+
+    Args:
+        year (int): The year, if known.
+        month (str): The month's full name (such as "June"), if known.
+        day (int): The day of the month, if known.
+
+    Returns:
+        A tuple of the first and last dates in the range (both inclusive), or (None, None) if the
+        year isn't known.
+    """
+
+    if not year:
+        return None, None
+
+    months = list(calendar.month_name)
+
+    if month not in months[1:]:
+        return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+
+    month_number = months.index(month)
+
+    if day:
+        try:
+            date = datetime.date(year, month_number, day)
+            return date, date
+        except ValueError:
+            pass
+
+    last_day = calendar.monthrange(year, month_number)[1]
+    return datetime.date(year, month_number, 1), datetime.date(
+        year, month_number, last_day
+    )
+
+
+# The partial date formats accepted by parse_partial_date(), with the precision of each one. These
+# include the formats of the full_date, collected_date, and num_date fields on specimen records.
+PARTIAL_DATE_FORMATS = [
+    ("%Y", "year"),
+    ("%B %Y", "month"),
+    ("%b %Y", "month"),
+    ("%Y-%m", "month"),
+    ("%d %B %Y", "day"),
+    ("%d %b %Y", "day"),
+    ("%d-%b-%Y", "day"),
+    ("%Y-%m-%d", "day"),
+]
+
+
+def parse_partial_date(value):
+    """Parses a date that may be missing its day (or its day and month).
+
+    Examples of accepted values include "2021", "June 2021", "Jun 2021", "2021-06", "1 June 2021",
+    "1-Jun-2021", and "2021-06-01".
+
+    Args:
+        value (str): The date to parse.
+
+    Raises:
+        ValueError: If the value isn't in one of the accepted formats.
+
+    Returns:
+        A tuple of the first and last dates the value covers (both inclusive).
+    """
+
+    value = " ".join(value.split())
+
+    for date_format, precision in PARTIAL_DATE_FORMATS:
+        try:
+            date = datetime.datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+        if precision == "year":
+            return get_date_range(date.year)
+        if precision == "month":
+            return get_date_range(date.year, calendar.month_name[date.month])
+        return date, date
+
+    raise ValueError(f"'{value}' is not a valid date")
+
+
+# A coordinate in decimal degrees or degrees, minutes, and seconds, with an optional sign or
+# hemisphere letter (before or after the number), such as "38.8495", "-84.866328",
+# "38.8495 N", "38°50'58.2\"N", or "W 84 51 58.8"
+COORDINATE_PATTERN = re.compile(
+    r"""^(?P<prefix>[NSEW])?\s*
+    (?P<sign>[-+])?\s*
+    (?P<degrees>\d+(?:\.\d+)?)\s*°?\s*
+    (?:(?P<minutes>\d+(?:\.\d+)?)\s*['′]?\s*)?
+    (?:(?P<seconds>\d+(?:\.\d+)?)\s*(?:"|″|'')?\s*)?
+    (?P<suffix>[NSEW])?$""",
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def parse_coordinate(value, axis):
+    """Parses a latitude or longitude written as text into decimal degrees.
+
+    Accepted values include decimal degrees ("38.8495" or "-84.866328") and degrees, minutes, and
+    seconds ("38°50'58.2\"N" or "84 51 58.8 W"), with either a sign or a hemisphere letter.
+
+    Args:
+        value (str): The coordinate to parse.
+        axis (str): Either "latitude" or "longitude", which sets the allowed range and hemispheres.
+
+    Raises:
+        ValueError: If the value isn't a valid coordinate for the axis.
+
+    Returns:
+        The coordinate in decimal degrees (Decimal, rounded to 6 decimal places), or None if the
+        value is empty.
+    """
+
+    if value is None or not str(value).strip():
+        return None
+
+    limit, hemispheres = {"latitude": (90, "NS"), "longitude": (180, "EW")}[axis]
+    match = COORDINATE_PATTERN.match(str(value).strip())
+
+    if not match:
+        raise ValueError(f"'{value}' is not a valid {axis}")
+
+    hemisphere = (match["prefix"] or match["suffix"] or "").upper()
+
+    if (match["prefix"] and match["suffix"]) or (hemisphere and match["sign"]):
+        raise ValueError(f"'{value}' is not a valid {axis}")
+    if hemisphere and hemisphere not in hemispheres:
+        raise ValueError(f"'{value}' is not a valid {axis}")
+
+    degrees = Decimal(match["degrees"])
+
+    for part, divisor in [("minutes", 60), ("seconds", 3600)]:
+        if match[part] is not None:
+            if "." in match["degrees"] or Decimal(match[part]) >= 60:
+                raise ValueError(f"'{value}' is not a valid {axis}")
+            degrees += Decimal(match[part]) / divisor
+
+    if match["sign"] == "-" or hemisphere in ("S", "W"):
+        degrees = -degrees
 
-    for key in serializer().fields:
-        fields.append(key)
+    if abs(degrees) > limit:
+        raise ValueError(f"'{value}' is outside the range of a {axis}")
 
-    return fields
+    return degrees.quantize(Decimal("0.000001"))
@@ -0,0 +1,241 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.db.models import F, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.response import Response
+from wagtail.api.v2.pagination import WagtailPagination
+from wagtail.api.v2.utils import BadRequestError
+
+
+def encode_cursor(position, reverse=False):
+    """Encodes a position in an ordered queryset as an opaque cursor token.
+
+    Args:
+        position (list): The values of the ordering fields for the row the cursor points at.
+        reverse (bool): Whether the cursor pages backwards (to the previous page).
+
+    Returns:
+        A URL-safe string.
+    """
+
+    data = json.dumps({"p": position, "r": reverse}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token, types):
+    """Decodes a cursor token created by encode_cursor().
+
+    Args:
+        token (str): The cursor token from the query string.
+        types (tuple): The Python type of each ordering field's value (see get_position_types()).
+
+    Raises:
+        BadRequestError: If the token is malformed, or its position doesn't have a value of the
+                         right type for each ordering field.
+
+    Returns:
+        A tuple of the position (list) and whether the cursor pages backwards (bool).
+    """
+
+    try:
+        padding = "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(token + padding))
+        position, reverse = data["p"], data["r"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise BadRequestError("cursor is not valid")
+
+    if not isinstance(position, list) or len(position) != len(types):
+        raise BadRequestError("cursor is not valid")
+
+    for value, value_type in zip(position, types):
+        # JSON booleans are ints in Python, but are never a valid position
+        if not isinstance(value, value_type) or isinstance(value, bool):
+            raise BadRequestError("cursor is not valid")
+
+    return position, bool(reverse)
+
+
+def get_position_types(model, fields):
+    """Works out the Python type of each ordering field's value, for checking cursors.
+
+    Args:
+        model (Model): The model being paged through.
+        fields (tuple): The ordering fields, which can follow relations (such as "locality__id").
+
+    Raises:
+        ImproperlyConfigured: If a field isn't an integer or text field.
+
+    Returns:
+        A tuple of types (int or str).
+    """
+
+    types = []
+
+    for field in fields:
+        *relations, name = field.split("__")
+        field_model = model
+
+        for relation in relations:
+            field_model = field_model._meta.get_field(relation).related_model
+
+        model_field = field_model._meta.get_field(name)
+
+        if isinstance(model_field, (models.IntegerField, models.AutoField)):
+            types.append(int)
+        elif isinstance(model_field, (models.CharField, models.TextField)):
+            types.append(str)
+        else:
+            raise ImproperlyConfigured(
+                f"Cursor ordering field {field!r} must be an integer or text field"
+            )
+
+    return tuple(types)
+
+
+def keyset_filter(fields, position, reverse=False):
+    """Builds a filter selecting the rows that come after (or before) a position.
+
+    For fields ("a", "b") and position (1, 2) this is the row comparison "(a, b) > (1, 2)", which
+    Postgres answers with an index condition on an index of the ordering fields, seeking straight
+    to the position instead of skipping rows with OFFSET. (The equivalent "a > 1 OR (a = 1 AND
+    b > 2)" can only be applied as a filter on the rows the index returns, so it slows down the
+    deeper the position is.)
+
+    Args:
+        fields (tuple): The ordering fields. The last one must be unique (usually "id").
+        position (list): The values of the ordering fields for the boundary row.
+        reverse (bool): Whether to select the rows before the position instead of after it.
+
+    Returns:
+        A lookup expression, for QuerySet.filter().
+    """
+
+    lookup = LessThan if reverse else GreaterThan
+
+    return lookup(
+        Func(
+            *[F(field) for field in fields], function="ROW", output_field=models.Field()
+        ),
+        Func(
+            *[Value(value) for value in position],
+            function="ROW",
+            output_field=models.Field(),
+        ),
+    )
+
+
+class KeysetPagination(WagtailPagination):
+    """A Wagtail API paginator that adds a cursor (keyset) pagination mode.
+
+    By default, it behaves exactly like WagtailPagination (using the limit and offset parameters).
+    When the `cursor` query parameter is present, it instead pages through the queryset ordered by
+    the view's `cursor_ordering` fields, seeking straight to the rows after the cursor. That way,
+    every page costs the same no matter how deep into the collection it is. An empty `cursor`
+    parameter returns the first page.
+
+    Cursor responses include opaque `next` and `previous` tokens in their meta data rather than a
+    total count, since counting the whole table on every page would defeat the purpose.
+    """
+
+    cursor_query_param = "cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.GET
+
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.view = view
+        self.fields = tuple(view.cursor_ordering)
+        limit = self.get_limit(request)
+        token = request.GET[self.cursor_query_param]
+
+        if token:
+            position, reverse = decode_cursor(
+                token, get_position_types(queryset.model, self.fields)
+            )
+            queryset = queryset.filter(keyset_filter(self.fields, position, reverse))
+        else:
+            position, reverse = None, False
+
+        if reverse:
+            queryset = queryset.order_by(*[f"-{field}" for field in self.fields])
+        else:
+            queryset = queryset.order_by(*self.fields)
+
+        page = list(queryset[: limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        if reverse:
+            page.reverse()
+
+        self.next_cursor = None
+        self.previous_cursor = None
+
+        if page:
+            if has_more or reverse:
+                self.next_cursor = encode_cursor(self.get_position(page[-1]))
+            if (has_more and reverse) or (position is not None and not reverse):
+                self.previous_cursor = encode_cursor(
+                    self.get_position(page[0]), reverse=True
+                )
+
+        return page
+
+    def get_limit(self, request):
+        """Reads the limit query parameter the same way WagtailPagination does."""
+
+        limit_max = getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20)
+
+        try:
+            limit_default = 20 if not limit_max else min(20, limit_max)
+            limit = int(request.GET.get("limit", limit_default))
+            if limit < 0:
+                raise ValueError()
+        except ValueError:
+            raise BadRequestError("limit must be a positive integer")
+
+        if limit_max and limit > limit_max:
+            raise BadRequestError("limit cannot be higher than %d" % limit_max)
+
+        return limit
+
+    def get_position(self, obj):
+        """Returns the values of the ordering fields for a model instance."""
+
+        position = []
+
+        for field in self.fields:
+            value = obj
+            for name in field.split("__"):
+                value = getattr(value, name)
+            position.append(value)
+
+        return position
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+
+        data = OrderedDict(
+            [
+                (
+                    "meta",
+                    OrderedDict(
+                        [
+                            ("next", self.next_cursor),
+                            ("previous", self.previous_cursor),
+                        ]
+                    ),
+                ),
+                ("items", data),
+            ]
+        )
+        return Response(data)
@@ -0,0 +1,180 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+def is_single_valued(model, lookup):
+    """Checks whether every step of a lookup follows a single-valued relation.
+
+    Single-valued relations (forward foreign keys and one-to-one fields) can be joined with
+    select_related(), while anything else (many-to-many fields and reverse foreign keys) has to be
+    loaded with prefetch_related().
+
+    Args:
+        model (Model): The Django model the lookup starts from.
+        lookup (str): A lookup path, such as "species__genus".
+
+    Returns:
+        True if the whole lookup can be passed to select_related(), else False.
+    """
+
+    for name in lookup.split("__"):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+
+        if not field.is_relation or field.many_to_many or field.one_to_many:
+            return False
+
+        model = field.related_model
+
+    return True
+
+
+def is_relation(model, lookup):
+    """Checks whether every step of a lookup is a relation, of any kind.
+
+    Args:
+        model (Model): The Django model the lookup starts from.
+        lookup (str): A lookup path, such as "species__subspecies".
+
+    Returns:
+        True if the lookup can be passed to select_related() or prefetch_related(), else False.
+    """
+
+    for name in lookup.split("__"):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+
+        if not field.is_relation:
+            return False
+
+        model = field.related_model
+
+    return True
+
+
+@lru_cache(maxsize=512)
+def get_related_lookups(serializer_class, fields=None):
+    """Works out which relations a serializer will touch when it serializes a model instance.
+
+    Nested serializers are followed recursively. Relations that are only reached through model
+    properties or SerializerMethodFields can't be discovered by looking at the serializer alone, so
+    a serializer can declare them in a `related_lookups` dict that maps a field name to the lookups
+    it depends on, for example:
+
+        related_lookups = {"binomial": ("genus",)}
+
+    Nested serializers whose source is a property rather than a relation are skipped, along with
+    everything nested inside them, so their lookups have to be declared the same way.
+
+    Working this out means building the serializer's whole field tree, so the result is cached for
+    each serializer class (view sets reuse their serializer classes between requests).
+
+    Args:
+        serializer_class (ModelSerializer): The serializer class that will be used for the response.
+        fields (tuple): The field names to plan for. Defaults to all of the serializer's fields.
+
+    Returns:
+        A tuple of two sorted tuples: the lookups for select_related() and the lookups for
+        prefetch_related().
+    """
+
+    model = serializer_class.Meta.model
+    select = set()
+    prefetch = set()
+
+    def add(lookup, many):
+        if not many and is_single_valued(model, lookup):
+            select.add(lookup)
+        else:
+            prefetch.add(lookup)
+
+    def walk(serializer, prefix, many, only=None):
+        hints = getattr(serializer, "related_lookups", {})
+
+        for name, field in serializer.fields.items():
+            if only is not None and name not in only:
+                continue
+
+            for hint in hints.get(name, ()):
+                add(prefix + hint, many)
+
+            if field.source == "*":
+                continue
+
+            lookup = prefix + field.source.replace(".", "__")
+
+            if not is_relation(model, lookup):
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                prefetch.add(lookup)
+                walk(field.child, lookup + "__", True)
+            elif isinstance(field, serializers.BaseSerializer):
+                add(lookup, many)
+                walk(field, lookup + "__", many)
+            elif isinstance(field, serializers.ManyRelatedField):
+                prefetch.add(lookup)
+
+    walk(serializer_class(), "", False, fields)
+
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+def plan_queryset(queryset, serializer_class, fields=None):
+    """Adds the select_related() and prefetch_related() calls a serializer needs to a queryset.
+
+    Args:
+        queryset (QuerySet): The queryset to optimize.
+        serializer_class (ModelSerializer): The serializer class that will be used for the response.
+        fields (list): The field names to plan for. Defaults to all of the serializer's fields.
+
+    Returns:
+        The queryset with the related objects loaded eagerly.
+    """
+
+    if fields is not None:
+        fields = tuple(fields)
+
+    select, prefetch = get_related_lookups(serializer_class, fields)
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    return queryset
+
+
+def get_related_models(serializer_class):
+    """Finds every model a serializer reads from, including the ones reached through relations.
+
+    Args:
+        serializer_class (ModelSerializer): A model serializer class.
+
+    Returns:
+        A set of model classes, including the serializer's own model.
+    """
+
+    model = serializer_class.Meta.model
+    select, prefetch = get_related_lookups(serializer_class)
+    models = {model}
+
+    for lookup in select + prefetch:
+        related_model = model
+
+        for name in lookup.split("__"):
+            try:
+                related_model = related_model._meta.get_field(name).related_model
+            except FieldDoesNotExist:
+                break
+            if related_model is None:
+                break
+            models.add(related_model)
+
+    return models
@@ -0,0 +1,277 @@
+import hashlib
+import time
+from functools import lru_cache, wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from wagtail.api.v2.router import WagtailAPIRouter
+
+from utils.query_planner import get_related_models
+
+# The cache (from the CACHES setting) that holds API responses and their generation counters
+CACHE_ALIAS = "api"
+
+# The apps whose models are served by the API (including Wagtail's pages and documents). Saving or
+# deleting any of their objects invalidates the cached responses that depend on that model.
+CACHED_APPS = frozenset(
+    [
+        "geography",
+        "images",
+        "pages",
+        "specimens",
+        "taxonomy",
+        "wagtailcore",
+        "wagtaildocs",
+    ]
+)
+
+# Query parameters that don't change the response, so they're left out of cache keys
+IGNORED_QUERY_PARAMETERS = frozenset(["_"])
+
+HITS_KEY = "stats:hits"
+MISSES_KEY = "stats:misses"
+
+
+def get_cache():
+    """Returns the cache that holds API responses."""
+
+    return caches[CACHE_ALIAS]
+
+
+def generation_key(model):
+    """Returns the cache key of a model's generation counter."""
+
+    return f"generation:{model._meta.label_lower}"
+
+
+def new_generation():
+    """Returns a starting value for a generation counter.
+
+    Counters start from the current time rather than zero, so a counter that was evicted from the
+    cache can never come back with a value that an older cached response was stored under.
+    """
+
+    return time.time_ns()
+
+
+def get_generations(models):
+    """Reads the generation counters of some models, starting any that don't exist yet.
+
+    Args:
+        models (iterable): The model classes.
+
+    Returns:
+        A list of the counters' values, in the order of the models' labels.
+    """
+
+    cache = get_cache()
+    keys = sorted(generation_key(model) for model in models)
+    generations = cache.get_many(keys)
+
+    for key in keys:
+        if key not in generations:
+            generation = new_generation()
+            # Another process may have started the counter in the meantime
+            if not cache.add(key, generation, timeout=None):
+                generation = cache.get(key, generation)
+            generations[key] = generation
+
+    return [generations[key] for key in keys]
+
+
+def bump_generations(*models):
+    """Invalidates every cached response that depends on any of the given models.
+
+    Each model's generation counter is part of the cache key of every response built from it, so
+    incrementing the counter means those responses are never looked up again (and eventually
+    expire). Multi-table inheritance parents are bumped along with their children, since saving a
+    child also changes the parent's table.
+
+    Args:
+        *models: The model classes that changed.
+    """
+
+    cache = get_cache()
+    keys = {
+        generation_key(parent)
+        for model in models
+        for parent in [model, *model._meta.get_parent_list()]
+    }
+
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, new_generation(), timeout=None)
+
+
+def is_cached_model(model):
+    """Checks whether a model belongs to an app whose API responses are cached."""
+
+    return model._meta.app_label in CACHED_APPS
+
+
+@lru_cache
+def get_view_models(view_class):
+    """Finds the models whose data an API view set's responses are built from.
+
+    These are the view set's model, every model its serializer reaches through relations, and any
+    models listed in the view set's `cache_dependencies` attribute (for data that is read in some
+    other way, such as from the taxonomy closure table in a filter).
+
+    Args:
+        view_class (BaseAPIViewSet): The view set class.
+
+    Returns:
+        A frozenset of model classes.
+    """
+
+    models = {view_class.model, *getattr(view_class, "cache_dependencies", [])}
+    serializer_class = view_class.base_serializer_class
+    meta = getattr(serializer_class, "Meta", None)
+
+    if getattr(meta, "model", None) is not None:
+        models |= get_related_models(serializer_class)
+
+    return frozenset(models)
+
+
+def get_cache_key(request, view_class):
+    """Builds the cache key of an API response.
+
+    The key covers the endpoint, the query parameters (sorted, so their order doesn't matter), the
+    Accept header (which picks the response format), and the generation counters of every model
+    the response is built from.
+
+    Args:
+        request (HttpRequest): The request being answered.
+        view_class (BaseAPIViewSet): The view set answering it.
+
+    Returns:
+        A string.
+    """
+
+    params = sorted(
+        (name, values)
+        for name, values in request.GET.lists()
+        if name not in IGNORED_QUERY_PARAMETERS
+    )
+    generations = get_generations(get_view_models(view_class))
+    digest = hashlib.sha1(
+        repr(
+            (request.path, params, request.headers.get("Accept", ""), generations)
+        ).encode()
+    ).hexdigest()
+
+    return f"response:{request.resolver_match.view_name}:{digest}"
+
+
+def record_lookup(hit):
+    """Counts a response cache hit or miss."""
+
+    cache = get_cache()
+    key = HITS_KEY if hit else MISSES_KEY
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def get_stats():
+    """Returns the number of response cache hits and misses, as a dict."""
+
+    values = get_cache().get_many([HITS_KEY, MISSES_KEY])
+
+    return {"hits": values.get(HITS_KEY, 0), "misses": values.get(MISSES_KEY, 0)}
+
+
+def reset_stats():
+    """Resets the response cache hit and miss counters."""
+
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
+
+
+def cache_response(view, view_class):
+    """Wraps an API view so its successful JSON responses are cached.
+
+    The rendered response (content and headers) is stored, so a cache hit costs no database
+    queries at all. If a cached response has an ETag or Last-Modified header and the request's
+    conditional headers match it, a 304 response is returned instead. Every response is marked with
+    an X-Cache header of HIT or MISS.
+
+    Args:
+        view (callable): The view function.
+        view_class (BaseAPIViewSet): The view set the view function belongs to.
+
+    Returns:
+        The wrapped view function.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = get_cache_key(request, view_class)
+        cached = cache.get(key)
+
+        if cached is None:
+            record_lookup(hit=False)
+            response = view(request, *args, **kwargs)
+
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+
+            if response.status_code == 200 and response.get(
+                "Content-Type", ""
+            ).startswith("application/json"):
+                cache.set(
+                    key,
+                    {
+                        "content": response.content,
+                        "headers": [
+                            (header, value)
+                            for header, value in response.items()
+                            if header.lower() != "set-cookie"
+                        ],
+                    },
+                )
+
+            response["X-Cache"] = "MISS"
+            return response
+
+        record_lookup(hit=True)
+        headers = dict(cached["headers"])
+        response = get_conditional_response(
+            request,
+            etag=headers.get("ETag"),
+            last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+        )
+
+        if response is None:
+            response = HttpResponse(cached["content"])
+
+        for header, value in cached["headers"]:
+            response[header] = value
+        response["X-Cache"] = "HIT"
+
+        return response
+
+    return wrapper
+
+
+class CachedAPIRouter(WagtailAPIRouter):
+    """A Wagtail API router that caches the responses of every endpoint registered with it.
+
+    Cached responses are keyed by generation counters of the models they're built from, which are
+    bumped by signal receivers whenever an object is saved or deleted (see mixins/signals.py).
+    Changes that don't send signals, such as QuerySet.update() and bulk_create(), have to call
+    bump_generations() themselves.
+    """
+
+    def wrap_view(self, func):
+        return super().wrap_view(cache_response(func, func.cls))